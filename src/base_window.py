@@ -1,5 +1,7 @@
+from functools import partial
+
 from physical_layer import BipolarModulator, ManchesterModulator, NRZModulator, ASKCarrierModulator, FSKCarrierModulator, PSKCarrierModulator, QAMCarrierModulator
-from data_link_layer import ByteFlagFramer, BitsFlagFramer, CharCountingFramer, ParityErrorDetector, CRCErrorDetector, HummingErrorCorrector
+from data_link_layer import ByteFlagFramer, BitsFlagFramer, CharCountingFramer, ParityErrorDetector, CRCErrorDetector, HummingErrorCorrector, HammingBlockCorrector
 from communication import CommunicationChannel
 
 class BaseWindow:
@@ -16,7 +18,7 @@ class BaseWindow:
         # Inicializar configurações
         self._init_configurations()
 
-        self.communication = CommunicationChannel(snr=self.snr)
+        self.communication = CommunicationChannel(snr=self.snr, seed=self.seed)
 
         # Criar funções de configuração
         self._create_set_functions()
@@ -29,6 +31,8 @@ class BaseWindow:
         """Inicializa todas as configurações padrão"""
         
         self.snr = 10
+        # Semente do ruído do canal (None: não reprodutível)
+        self.seed = None
 
         # Configurações de enquadramento
         self.coding_index = 0
@@ -43,8 +47,11 @@ class BaseWindow:
         
         # Configurações de correção de erro
         self.error_correction_index = 0
-        self.error_correction_options = [None, HummingErrorCorrector]
-        self.error_correction_options_names = ["Nenhum", "Hamming"]
+        # Códigos de bloco: uma correção por palavra-código
+        self.error_correction_options = [None, HummingErrorCorrector] + [
+            partial(HammingBlockCorrector.from_name, name) for name in HammingBlockCorrector.CODES]
+        self.error_correction_options_names = ["Nenhum", "Hamming"] + [
+            f"Hamming {name}" for name in HammingBlockCorrector.CODES]
         
         # Configurações de modulação
         self.modulation_index = 0
@@ -59,6 +66,13 @@ class BaseWindow:
         self.analog_modulation_options_names = ["ASK", "FSK", "PSK", "8-QAM"]
         self.analog_frequency = 1000
         self.analog_sample_rate = 1000000
+        # Simulação em banda base complexa: o sinal passa-banda só é sintetizado para os gráficos
+        self.complex_baseband = False
+        # Amostras complexas por símbolo, definidas pelo modulador de portadora
+        self.baseband_oversampling = 1
+
+        # Ganchos chamados em volta de cada etapa do pipeline (ex.: StageProfiler)
+        self.pipeline_hooks = []
 
     def _create_set_functions(self):
         """Cria as funções set para atualizar configurações"""
@@ -95,7 +109,7 @@ class BaseWindow:
 
         def set_snr(x: str):
             self.snr = float(x.replace(',', '.'))
-            self.communication = CommunicationChannel(snr=self.snr)
+            self.communication = CommunicationChannel(snr=self.snr, seed=self.seed)
 
         def set_use_carrier_modulation(x: bool):
             self.use_carrier_modulation = x
@@ -112,6 +126,10 @@ class BaseWindow:
         def set_analog_sample_rate(x: str):
             self.analog_sample_rate = float(x.replace(',', '.'))
             self._update_carrier_modulator()
+
+        def set_complex_baseband(x: bool):
+            self.complex_baseband = x
+            self._update_carrier_modulator()
         
         # Atribuir as funções como métodos da classe
         self.set_max_frame_size = set_max_frame_size
@@ -127,6 +145,7 @@ class BaseWindow:
         self.set_analog_modulation = set_analog_modulation
         self.set_analog_frequency = set_analog_frequency
         self.set_analog_sample_rate = set_analog_sample_rate
+        self.set_complex_baseband = set_complex_baseband
 
     def _create_update_functions(self):
         """Cria as funções update para recriar objetos baseados nas configurações"""
@@ -178,6 +197,12 @@ class BaseWindow:
             else:
                 self.carrier_modulator = None
 
+            # O detector de energia do ASK soma o ruído de samples_per_bit amostras reais:
+            # com samples_per_bit // 2 amostras complexas a banda base tem o mesmo BER
+            if isinstance(self.carrier_modulator, ASKCarrierModulator):
+                self.baseband_oversampling = max(self.carrier_modulator.samples_per_bit // 2, 1)
+            else:
+                self.baseband_oversampling = 1
         
         # Atribuir as funções como métodos da classe
         self._update_coding = update_coding
@@ -0,0 +1,31 @@
+import time
+import tracemalloc
+from typing import Callable
+
+
+def best_time(function: Callable, *args, repeat: int = 3) -> float:
+    """Return the best wall time of `repeat` calls of function(*args), in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(function: Callable, *args) -> int:
+    """
+    Return the peak traced memory of one call of function(*args), in bytes.
+    tracemalloc slows calls down, so it is never active while timing.
+    """
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def time_and_peak(function: Callable, *args, repeat: int = 3) -> tuple[float, int]:
+    """Return the best wall time of `repeat` calls, in seconds, and the peak traced memory of one more, in bytes."""
+    return best_time(function, *args, repeat=repeat), peak_memory(function, *args)
@@ -0,0 +1,42 @@
+import time
+import numpy as np
+
+from communication import CommunicationChannel
+from physical_layer import ASKCarrierModulator, FSKCarrierModulator, PSKCarrierModulator, QAMCarrierModulator
+
+
+def bit_error_rate(modulate, demodulate, bits: np.ndarray, channel: CommunicationChannel) -> tuple[float, int, float]:
+    """Send the bits through the channel; return the BER, samples sent and wall time."""
+    start = time.perf_counter()
+    signal = modulate(bits)
+    channel.send(signal)
+    received = demodulate(channel.receive())[:bits.size]
+    return np.mean(received != bits), signal.size, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    bits = rng.integers(0, 2, 3 * 10**4)
+
+    # Passband configurations of BaseWindow (FSK runs at the digital sample rate)
+    modulators = [
+        ("ASK", ASKCarrierModulator(1000, 1000, 10**6), [0.3, 0.5]),
+        ("PSK", PSKCarrierModulator(1000, 1000, 10**6), [0.02, 0.05]),
+        ("8-QAM", QAMCarrierModulator(1000, 1000, 10**6), [0.04, 0.08]),
+        ("FSK", FSKCarrierModulator(1000, 1000, 10000, delta_frequency=1000), [0.1, 0.3]),
+    ]
+
+    print(f"{'modulation':>10} {'snr':>6} {'passband BER':>13} {'baseband BER':>13} "
+          f"{'samples ratio':>14} {'speedup':>9}")
+    for name, modulator, snrs in modulators:
+        # ASK's energy detector integrates the noise of samples_per_bit real samples
+        oversampling = modulator.samples_per_bit // 2 if name == "ASK" else 1
+        for snr in snrs:
+            channel = CommunicationChannel(snr=snr)
+            passband, passband_samples, passband_time = bit_error_rate(
+                modulator.modulate, modulator.demodulate, bits, channel)
+            baseband, baseband_samples, baseband_time = bit_error_rate(
+                lambda b: modulator.modulate_baseband(b, oversampling),
+                lambda s: modulator.demodulate_baseband(s, oversampling), bits, channel)
+            print(f"{name:>10} {snr:>6} {passband:>13.4f} {baseband:>13.4f} "
+                  f"{passband_samples / baseband_samples:>13.0f}x {passband_time / baseband_time:>8.0f}x")
@@ -0,0 +1,46 @@
+import time
+import numpy as np
+
+from communication import CommunicationChannel
+from channel_models import BinarySymmetricChannel, GilbertElliottChannel
+from physical_layer import NRZModulator, ManchesterModulator, PSKCarrierModulator, QAMCarrierModulator
+
+
+def waveform_transmit(modulator, channel: CommunicationChannel, bits: np.ndarray) -> np.ndarray:
+    """Reference path: modulate, add noise and demodulate."""
+    channel.send(modulator.modulate(bits))
+    return modulator.demodulate(channel.receive(copy=False))[:bits.size]
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    bits = rng.integers(0, 2, 10**6).astype(np.uint8)
+
+    # Same bit error rate, without the waveform
+    print(f"{'modulation':>22} {'snr':>5} {'waveform BER':>13} {'BSC BER':>9} {'waveform (Mbit/s)':>18} "
+          f"{'BSC (Mbit/s)':>13}")
+    for modulator, snr in [(NRZModulator(1000, 10000), 1.2), (ManchesterModulator(1000, 10000), 1.5),
+                           (PSKCarrierModulator(1000, 1000, 100000), 0.2),
+                           (QAMCarrierModulator(1000, 1000, 100000), 0.3)]:
+        channel = CommunicationChannel(snr, seed=0)
+        start = time.perf_counter()
+        received = waveform_transmit(modulator, channel, bits)
+        waveform_time = time.perf_counter() - start
+
+        bsc = BinarySymmetricChannel.from_modulation(modulator, snr, seed=0)
+        start = time.perf_counter()
+        flipped = bsc.apply(bits)
+        bsc_time = time.perf_counter() - start
+        print(f"{type(modulator).__name__:>22} {snr:>5} {np.mean(received != bits):>13.5f} "
+              f"{np.mean(flipped != bits):>9.5f} {bits.size / waveform_time / 1e6:>18.2f} "
+              f"{bits.size / bsc_time / 1e6:>13.1f}")
+
+    # Throughput on 10^8 bits, in Gbit per minute
+    bits = np.zeros(10**8, dtype=np.uint8)
+    print(f"{'channel':>22} {'Gbit/min':>9}")
+    for name, channel in [("BSC p=1e-4", BinarySymmetricChannel(1e-4, seed=0)),
+                          ("BSC p=1e-2", BinarySymmetricChannel(1e-2, seed=0)),
+                          ("Gilbert-Elliott", GilbertElliottChannel(1e-3, 0.05, 1e-5, 0.3, seed=0))]:
+        start = time.perf_counter()
+        channel.apply(bits)
+        print(f"{name:>22} {bits.size / (time.perf_counter() - start) * 60 / 1e9:>9.1f}")
@@ -0,0 +1,65 @@
+import time
+import numpy as np
+
+from benchmarks import time_and_peak
+from communication import CommunicationChannel
+from channel_models import (AWGNChannel, ChannelPipeline, GilbertElliottChannel, MultipathChannel,
+                            RayleighFadingChannel)
+
+
+def legacy_transmit(signal: np.ndarray, snr: float) -> np.ndarray:
+    """Reference copy + global float64 noise + copy, as implemented before the noise engine."""
+    data = signal.copy()
+    data += np.random.normal(0, 1, size=signal.shape) * 1/snr
+    return data.copy()
+
+
+def engine_transmit(channel: CommunicationChannel, signal: np.ndarray) -> np.ndarray:
+    channel.send(signal)
+    return channel.receive(copy=False)
+
+
+if __name__ == "__main__":
+    snr = 10
+    print(f"{'samples':>10} {'dtype':>8} {'legacy (ns/sample)':>19} {'engine (ns/sample)':>19} "
+          f"{'legacy peak/size':>17} {'engine peak/size':>17}")
+    for num_samples in [10**5, 10**6, 10**7]:
+        for dtype in [np.float32, np.float64]:
+            signal = np.sin(np.arange(num_samples) * 0.01).astype(dtype)
+            channel = CommunicationChannel(snr, seed=0)
+            engine_transmit(channel, signal)  # Allocate the reusable buffer before measuring
+
+            legacy, legacy_peak = time_and_peak(lambda s: legacy_transmit(s, snr), signal)
+            engine, engine_peak = time_and_peak(lambda s: engine_transmit(channel, s), signal)
+            print(f"{num_samples:>10} {np.dtype(dtype).name:>8} {legacy / num_samples * 1e9:>19.2f} "
+                  f"{engine / num_samples * 1e9:>19.2f} {legacy_peak / signal.nbytes:>17.2f} "
+                  f"{engine_peak / signal.nbytes:>17.2f}")
+
+    # Same seed, same received samples
+    signal = np.zeros(10**6, dtype=np.float32)
+    first = CommunicationChannel(snr, seed=42)
+    second = CommunicationChannel(snr, seed=42)
+    first.send(signal)
+    second.send(signal)
+    assert np.array_equal(first.receive(), second.receive())
+
+    # Channel models on 10^7 samples (bits for Gilbert-Elliott), streamed in 2^20-sample chunks
+    num_samples = 10**7
+    chunk = 1 << 20
+    signal = np.sin(np.arange(num_samples) * 0.01).astype(np.float32)
+    bits = np.random.default_rng(0).integers(0, 2, num_samples, dtype=np.uint8)
+    models = [
+        ("AWGN Eb/N0 6 dB", AWGNChannel(ebn0_db=6, samples_per_bit=10, seed=0), signal),
+        ("Rayleigh block fading", RayleighFadingChannel(coherence_samples=1000, seed=0), signal),
+        ("Multipath 3 paths", MultipathChannel.from_profile([0, 7, 40], [0, -3, -9]), signal),
+        ("Gilbert-Elliott", GilbertElliottChannel(0.001, 0.05, 1e-5, 0.3, seed=0), bits),
+        ("Multipath+fading+AWGN", ChannelPipeline(MultipathChannel([1, 0.5, 0.2]),
+                                                  RayleighFadingChannel(1000, seed=0),
+                                                  AWGNChannel(snr_db=10, seed=0)), signal),
+    ]
+    print(f"{'model':>22} {'Msample/s':>10}")
+    for name, model, data in models:
+        start = time.perf_counter()
+        for _ in model.apply_stream(data[i:i + chunk] for i in range(0, data.size, chunk)):
+            pass
+        print(f"{name:>22} {num_samples / (time.perf_counter() - start) / 1e6:>10.1f}")
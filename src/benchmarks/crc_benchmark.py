@@ -0,0 +1,39 @@
+import numpy as np
+
+from benchmarks import best_time
+from data_link_layer import CRCErrorDetector
+
+
+def bit_serial_crc(detector: CRCErrorDetector, data: np.ndarray) -> np.int64:
+    """Reference bit-serial CRC, as implemented before the table-driven engine."""
+    crc = np.int64(
+        data[:detector.trailer_size]
+        .dot(2**np.arange(detector.trailer_size, dtype=np.uint64)[::-1])
+        )
+    for b in data[detector.trailer_size:]:
+        if crc & (1 << (detector.trailer_size-1)):
+            crc ^= detector.poly
+        crc <<= 1
+        crc |= b
+    if crc & (1 << (detector.trailer_size-1)):
+        crc ^= detector.poly
+    return crc
+
+
+if __name__ == "__main__":
+    detector = CRCErrorDetector()
+    rng = np.random.default_rng(0)
+
+    print(f"{'size (B)':>10} {'bit-serial (B/s)':>18} {'table (B/s)':>14} {'speedup':>9}")
+    for size in [64, 1024, 16 * 1024, 256 * 1024]:
+        bits = rng.integers(0, 2, size * 8, dtype=np.uint8)
+        assert bit_serial_crc(detector, bits) == detector.crc(bits)
+
+        serial = best_time(lambda d: bit_serial_crc(detector, d), bits, repeat=1)
+        table = best_time(detector.crc, bits)
+        print(f"{size:>10} {size / serial:>18.3e} {size / table:>14.3e} {serial / table:>8.1f}x")
+
+    for size in [1024 * 1024, 16 * 1024 * 1024]:
+        bits = rng.integers(0, 2, size * 8, dtype=np.uint8)
+        table = best_time(detector.crc, bits)
+        print(f"{size:>10} {'-':>18} {size / table:>14.3e} {'-':>9}")
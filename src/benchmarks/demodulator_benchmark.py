@@ -0,0 +1,46 @@
+import numpy as np
+
+from benchmarks import best_time
+from physical_layer import NRZModulator, BipolarModulator, ManchesterModulator
+
+
+def loop_demodulate(modulator, signal: np.ndarray) -> np.ndarray:
+    """Reference per-bit Python loop, as implemented before integrate_and_dump."""
+    spb = modulator.samples_per_bit
+    num_bits = len(signal) // spb
+    bits = np.zeros(num_bits, dtype=int)
+    for i in range(num_bits):
+        bit_period = signal[i * spb:(i + 1) * spb]
+        if isinstance(modulator, NRZModulator):
+            bits[i] = 1 if np.mean(bit_period) > 0 else 0
+        elif isinstance(modulator, BipolarModulator):
+            bits[i] = 1 if np.sum(bit_period ** 2) > 0.5 * spb else 0
+        else:
+            half = spb // 2
+            bits[i] = 1 if np.sum(bit_period[:half] ** 2) > np.sum(bit_period[half:] ** 2) else 0
+    return bits
+
+
+if __name__ == "__main__":
+    num_bits = 10**6
+    rng = np.random.default_rng(0)
+    bits = rng.integers(0, 2, num_bits)
+
+    print(f"{'modulator':>20} {'loop (bit/s)':>14} {'vectorized (bit/s)':>20} {'speedup':>9}")
+    for cls in [NRZModulator, BipolarModulator, ManchesterModulator]:
+        modulator = cls(bit_rate=1000, sample_rate=10000)
+        check = modulator.modulate(bits[:10**4])
+        check = check + rng.normal(0, 0.3, check.size).astype(np.float32)
+        assert np.array_equal(loop_demodulate(modulator, check), modulator.demodulate(check))
+
+        # Demodulation cost does not depend on the content of the samples
+        signal = rng.normal(0, 1, num_bits * modulator.samples_per_bit).astype(np.float32)
+
+        loop = best_time(lambda s: loop_demodulate(modulator, s), signal, repeat=1)
+        vectorized = best_time(modulator.demodulate, signal)
+        print(f"{cls.__name__:>20} {num_bits / loop:>14.3e} {num_bits / vectorized:>20.3e} {loop / vectorized:>8.1f}x")
+
+    modulator = NRZModulator(bit_rate=1000, sample_rate=10000)
+    batch = rng.normal(0, 1, (10, 10**5 * modulator.samples_per_bit)).astype(np.float32)
+    batched = best_time(modulator.demodulate, batch)
+    print(f"{'NRZ batch 10x1e5':>20} {'-':>14} {batch.size / modulator.samples_per_bit / batched:>20.3e} {'-':>9}")
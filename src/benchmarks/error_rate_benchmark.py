@@ -0,0 +1,35 @@
+import os
+import sys
+import time
+
+from channel_models import crossover_probability
+from error_rate import ErrorRateSimulator
+from physical_layer import NRZModulator
+from pipeline import Pipeline
+
+SNRS = [1.0, 1.5, 2.0, 2.5]
+
+
+if __name__ == "__main__":
+    # Usage: python -m benchmarks.error_rate_benchmark [workers ...]
+    modulator = NRZModulator(bit_rate=1000, sample_rate=4000)
+    pipeline = Pipeline(modulator=modulator)
+    workers = [int(arg) for arg in sys.argv[1:]] or sorted({1, os.cpu_count() or 1})
+
+    results = {}
+    for count in workers:
+        simulator = ErrorRateSimulator(pipeline, frame_bits=1024, frames_per_batch=64, precision=0.1,
+                                       max_bits=5 * 10**7, workers=count, seed=0)
+        start = time.perf_counter()
+        results[count] = simulator.run(SNRS)
+        elapsed = time.perf_counter() - start
+        bits = sum(point.bits for point in results[count])
+        print(f"\n{count} worker(s): {elapsed:.2f} s, {bits / elapsed / 1e6:.2f} Mbit/s")
+        print(f"{'snr':>5} {'bits':>10} {'ber':>10} {'interval':>22} {'theory':>10} {'fer':>7} {'converged':>9}")
+        for point in results[count]:
+            low, high = point.ber_interval
+            print(f"{point.snr:>5} {point.bits:>10} {point.ber:>10.3e} {f'[{low:.2e}, {high:.2e}]':>22} "
+                  f"{crossover_probability(modulator, point.snr):>10.3e} {point.fer:>7.3f} {str(point.converged):>9}")
+
+    # The batches are counted in order, so the worker count does not change the results
+    print(f"\nSame results for every worker count: {all(result == results[workers[0]] for result in results.values())}")
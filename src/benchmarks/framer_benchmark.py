@@ -0,0 +1,50 @@
+import time
+import numpy as np
+
+from benchmarks import time_and_peak
+from data_link_layer import BitsFlagFramer, BitStuffer, ByteFlagFramer, PackedBits
+
+
+def legacy_stuff(bits: np.ndarray, flag_bits: np.ndarray) -> np.ndarray:
+    """Reference sliding-window stuffing, as implemented before the run-length engine."""
+    windows = np.lib.stride_tricks.sliding_window_view(bits, window_shape=len(flag_bits) - 1)
+    matches = np.all(windows == flag_bits[:-1], axis=1)
+    return np.insert(bits, np.nonzero(matches)[0] + len(flag_bits) - 1, not flag_bits[-1])
+
+
+def stream_of_frames(framer, num_frames: int, frame_bytes: int, rng: np.random.Generator) -> tuple[np.ndarray, list]:
+    """Frame random payloads back to back; return the bit stream and the payloads."""
+    payloads = [rng.integers(0, 2, 8 * frame_bytes).astype(np.uint8) for _ in range(num_frames)]
+    return np.concatenate([framer.frame_data(payload) for payload in payloads]), payloads
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    framers = [("byte flag", ByteFlagFramer()), ("bits flag", BitsFlagFramer())]
+
+    print(f"{'framer':>10} {'frames':>7} {'stream (MB)':>12} {'chunk (kB)':>11} {'deframe (MB/s)':>15} {'correct':>8}")
+    for name, framer in framers:
+        for num_frames, frame_bytes in [(1000, 100), (1000, 1000)]:
+            stream, payloads = stream_of_frames(framer, num_frames, frame_bytes, rng)
+            for chunk_bytes in [1500, 64 * 1024]:
+                chunks = [PackedBits.from_bits(chunk) for chunk in np.array_split(stream, max(1, stream.size // (8 * chunk_bytes)))]
+                start = time.perf_counter()
+                frames = [frame for _, _, frame in framer.deframe_stream(chunks)]
+                elapsed = time.perf_counter() - start
+
+                correct = len(frames) == len(payloads) and all(
+                    np.array_equal(frame.to_bits(), payload) for frame, payload in zip(frames, payloads))
+                print(f"{name:>10} {num_frames:>7} {stream.size / 8e6:>12.2f} {chunk_bytes / 1024:>11.1f} "
+                      f"{stream.size / 8e6 / elapsed:>15.1f} {str(correct):>8}")
+
+    print(f"\n{'flag':>9} {'bits':>9} {'legacy (Mbit/s)':>16} {'engine (Mbit/s)':>16} "
+          f"{'legacy peak/bit':>16} {'engine peak/bit':>16}")
+    for flag in [np.array([0, 1, 1, 1, 1, 1, 1, 0]), np.array([0, 0, 1, 0, 1, 1, 1, 1])]:
+        stuffer = BitStuffer(flag)
+        for num_bits in [10**5, 10**6, 10**7]:
+            bits = rng.integers(0, 2, num_bits).astype(np.uint8)
+            legacy_time, legacy_peak = time_and_peak(legacy_stuff, bits, flag, repeat=1)
+            engine_time, engine_peak = time_and_peak(lambda b: (stuffer.reset(), stuffer.stuff(b)), bits, repeat=1)
+            print(f"{''.join(map(str, flag)):>9} {num_bits:>9} {num_bits / legacy_time / 1e6:>16.1f} "
+                  f"{num_bits / engine_time / 1e6:>16.1f} {legacy_peak / num_bits:>16.1f} "
+                  f"{engine_peak / num_bits:>16.1f}")
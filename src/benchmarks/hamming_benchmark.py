@@ -0,0 +1,39 @@
+import numpy as np
+
+from benchmarks import best_time
+from data_link_layer import HammingBlockCorrector, HummingErrorCorrector
+
+
+def flip_one_bit_per_block(codewords: np.ndarray, n: int, rng: np.random.Generator) -> np.ndarray:
+    """Flip one random bit in every codeword of n bits."""
+    received = codewords.copy().reshape(-1, n)
+    received[np.arange(received.shape[0]), rng.integers(0, n, received.shape[0])] ^= 1
+    return received.reshape(-1)
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+
+    print(f"{'code':>15} {'data bits':>10} {'encode (Mbit/s)':>16} {'decode (Mbit/s)':>16} {'corrected':>10}")
+    legacy = HummingErrorCorrector()
+    for num_bits in [10**3, 10**4, 10**6]:
+        bits = rng.integers(0, 2, num_bits)
+        codeword = legacy.add_error_detection(bits)
+        encode_time = best_time(legacy.add_error_detection, bits)
+        decode_time = best_time(lambda c: legacy.remove_error_detection(legacy.correct_errors(c.copy())), codeword)
+        print(f"{'whole message':>15} {num_bits:>10} {num_bits / encode_time / 1e6:>16.3f} "
+              f"{num_bits / decode_time / 1e6:>16.3f} {1:>10}")
+
+    for name in HammingBlockCorrector.CODES:
+        code = HammingBlockCorrector.from_name(name)
+        for num_bits in [10**4, 10**6, 10**7]:
+            bits = rng.integers(0, 2, num_bits).astype(np.uint8)
+            codewords = code.encode(bits)
+            received = flip_one_bit_per_block(codewords, code.n, rng)
+            data, corrected, _ = code.decode(received)
+            assert np.array_equal(data[:num_bits], bits)
+
+            encode_time = best_time(code.encode, bits)
+            decode_time = best_time(code.decode, received)
+            print(f"{name:>15} {num_bits:>10} {num_bits / encode_time / 1e6:>16.1f} "
+                  f"{num_bits / decode_time / 1e6:>16.1f} {corrected:>10}")
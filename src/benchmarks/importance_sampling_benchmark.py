@@ -0,0 +1,33 @@
+import time
+
+from channel_models import q_function
+from importance_sampling import ImportanceSampler
+from physical_layer import (BipolarModulator, ManchesterModulator, NRZModulator, PSKCarrierModulator,
+                            QAMCarrierModulator)
+
+# (modulator, closed form of the BER at a noise standard deviation, SNRs reaching about 1e-9)
+CASES = [
+    (NRZModulator(bit_rate=1000, sample_rate=10000), lambda m, sigma: q_function(m.samples_per_bit**0.5 / sigma),
+     [1.0, 1.5, 1.9]),
+    (BipolarModulator(bit_rate=1000, sample_rate=10000), None, [3.0, 4.5, 6.0]),
+    (ManchesterModulator(bit_rate=1000, sample_rate=10000), None, [3.0, 4.0, 4.4]),
+    (PSKCarrierModulator(1000, 1000, 20000), lambda m, sigma: q_function((m.samples_per_symbol / 2)**0.5 / sigma),
+     [1.0, 1.5, 1.9]),
+    (QAMCarrierModulator(1000, 1000, 20000), None, [1.5, 2.3, 2.8]),
+]
+
+
+if __name__ == "__main__":
+    print(f"{'modulator':>20} {'snr':>5} {'ber':>10} {'relative':>9} {'closed form':>12} {'bits':>9} "
+          f"{'seconds':>8} {'Monte Carlo bits':>17}")
+    for modulator, closed_form, snrs in CASES:
+        sampler = ImportanceSampler(modulator, precision=0.05, seed=0)
+        for snr in snrs:
+            start = time.perf_counter()
+            point = sampler.estimate(snr)
+            elapsed = time.perf_counter() - start
+            reference = f"{closed_form(modulator, 1 / snr):.3e}" if closed_form is not None else "-"
+            # Bits a plain simulation needs for the same precision: about (z / precision)^2 errors
+            plain_bits = (1.96 / point.relative_error)**2 / point.ber
+            print(f"{type(modulator).__name__:>20} {snr:>5} {point.ber:>10.3e} {point.relative_error:>9.3f} "
+                  f"{reference:>12} {point.bits:>9} {elapsed:>8.3f} {plain_bits:>17.2e}")
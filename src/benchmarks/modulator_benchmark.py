@@ -0,0 +1,71 @@
+import numpy as np
+
+from benchmarks import best_time
+from physical_layer import (BipolarModulator, ManchesterModulator, CarrierModulator, ASKCarrierModulator,
+                            FSKCarrierModulator, PSKCarrierModulator, QAMCarrierModulator)
+
+
+def append_modulate(modulator, bits: np.ndarray) -> np.ndarray:
+    """Reference np.append loop, as implemented before the vectorized encoders."""
+    signal = np.array([])
+    if isinstance(modulator, BipolarModulator):
+        inverted = False
+        for bit in bits:
+            if bit == 1:
+                signal = np.append(signal, 1 if not inverted else -1)
+                inverted = not inverted
+            else:
+                signal = np.append(signal, 0)
+        return np.repeat(signal, modulator.samples_per_bit).astype(np.float32)
+
+    for bit in bits:
+        signal = np.append(signal, [0, 1] if bit == 0 else [1, 0])
+    return np.repeat(signal, modulator.samples_per_bit // 2).astype(np.float32)
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+
+    # Time per bit stays flat for a linear encoder and grows with n for the old one
+    print(f"{'modulator':>20} {'bits':>10} {'np.append (ns/bit)':>20} {'vectorized (ns/bit)':>21}")
+    for cls in [BipolarModulator, ManchesterModulator]:
+        modulator = cls(bit_rate=1000, sample_rate=10000)
+        for num_bits in [10**3, 10**4, 4 * 10**4, 10**5, 10**6, 10**7]:
+            bits = rng.integers(0, 2, num_bits)
+            vectorized = best_time(modulator.modulate, bits)
+            if num_bits <= 4 * 10**4:
+                assert np.array_equal(append_modulate(modulator, bits), modulator.modulate(bits))
+                loop = f"{best_time(lambda b: append_modulate(modulator, b), bits, repeat=1) / num_bits * 1e9:.1f}"
+            else:
+                loop = "-"
+            print(f"{cls.__name__:>20} {num_bits:>10} {loop:>20} {vectorized / num_bits * 1e9:>21.1f}")
+
+    # 8-QAM symbols are table lookups: compare against copying an output of the same size
+    print(f"{'modulator':>20} {'bits':>10} {'memcpy (ns/bit)':>20} {'modulate (ns/bit)':>21}")
+    modulator = QAMCarrierModulator(carrier_frequency=1000, bit_rate=1000, sample_rate=10000)
+    for num_bits in [3 * 10**3, 3 * 10**5, 3 * 10**6]:
+        bits = rng.integers(0, 2, num_bits)
+        signal = modulator.modulate(bits)
+        copy = best_time(lambda _: np.copyto(np.empty_like(signal), signal), bits)
+        vectorized = best_time(modulator.modulate, bits)
+        print(f"{'QAMCarrierModulator':>20} {num_bits:>10} {copy / num_bits * 1e9:>20.1f} {vectorized / num_bits * 1e9:>21.1f}")
+
+    # Thousands of short frames with the same configuration: trig is only evaluated on cache misses
+    print(f"{'modulator':>20} {'frames':>10} {'cold (us/frame)':>20} {'cached (us/frame)':>21} {'hit rate':>9}")
+    cache = CarrierModulator.carrier_cache
+    frames = rng.integers(0, 2, (2000, 96))
+    for cls in [ASKCarrierModulator, FSKCarrierModulator, PSKCarrierModulator, QAMCarrierModulator]:
+        modulator = cls(1000, 1000, 10000)
+
+        def run(cold: bool) -> None:
+            for frame in frames:
+                if cold:
+                    cache.clear()
+                modulator.demodulate(modulator.modulate(frame))
+
+        cold = best_time(lambda _: run(True), frames, repeat=1)
+        cache.clear()
+        cached = best_time(lambda _: run(False), frames, repeat=1)
+        hit_rate = cache.stats()["hit_rate"]
+        print(f"{cls.__name__:>20} {len(frames):>10} {cold / len(frames) * 1e6:>20.1f} "
+              f"{cached / len(frames) * 1e6:>21.1f} {hit_rate:>9.3f}")
@@ -0,0 +1,39 @@
+import numpy as np
+
+from benchmarks import time_and_peak
+from data_link_layer import ByteFlagFramer, CharCountingFramer, CRCErrorDetector, PackedBits
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    framers = [
+        ("char counting + CRC", CharCountingFramer(error_detector=CRCErrorDetector())),
+        ("byte flag + CRC", ByteFlagFramer(error_detector=CRCErrorDetector())),
+    ]
+
+    print(f"{'framer':>20} {'payload':>9} {'bits (MB/s)':>12} {'packed (MB/s)':>14} "
+          f"{'bits peak/size':>15} {'packed peak/size':>17}")
+    for name, framer in framers:
+        # The char counting frame stores its size in one byte
+        sizes = [255] if isinstance(framer, CharCountingFramer) else [10**3, 10**5, 10**6]
+        for num_bytes in sizes:
+            payload = rng.integers(0, 256, num_bytes, dtype=np.uint8)
+            bits, packed = np.unpackbits(payload), PackedBits(payload)
+            assert np.array_equal(framer.frame_data(packed).to_bits(), framer.frame_data(bits))
+
+            bits_time, bits_peak = time_and_peak(framer.frame_data, bits)
+            packed_time, packed_peak = time_and_peak(framer.frame_data, packed)
+            print(f"{name:>20} {num_bytes:>9} {num_bytes / bits_time / 1e6:>12.1f} "
+                  f"{num_bytes / packed_time / 1e6:>14.1f} {bits_peak / num_bytes:>15.1f} "
+                  f"{packed_peak / num_bytes:>17.1f}")
+
+    print(f"\n{'deframe payload':>16} {'escapes':>8} {'bits (ms)':>10} {'packed (ms)':>12}")
+    framer = ByteFlagFramer()
+    for num_bytes in [10**5, 10**6, 10**7]:
+        for name, alphabet in [("random", None), ("dense", np.array([0x7D, 0x7E, 0x00], dtype=np.uint8))]:
+            payload = (rng.integers(0, 256, num_bytes, dtype=np.uint8) if alphabet is None
+                       else rng.choice(alphabet, num_bytes))
+            framed = framer.frame_data(PackedBits(payload))
+            bits_time, _ = time_and_peak(framer.deframe_data, framed.to_bits())
+            packed_time, _ = time_and_peak(framer.deframe_data, framed)
+            print(f"{num_bytes:>16} {name:>8} {bits_time * 1e3:>10.1f} {packed_time * 1e3:>12.1f}")
@@ -0,0 +1,48 @@
+import sys
+import numpy as np
+
+from base_window import BaseWindow
+from pipeline import Pipeline
+from pipeline_profiler import StageProfiler
+
+# (label, framer, error detection, error correction, carrier modulation) indices of BaseWindow
+CONFIGURATIONS = [
+    ("NRZ", 0, 0, 0, None),
+    ("byte flag+CRC", 2, 2, 0, None),
+    ("bits flag+CRC", 3, 2, 0, None),
+    ("Hamming (7,4)", 2, 2, 2, None),
+    ("PSK+CRC", 2, 2, 0, 2),
+    ("8-QAM+CRC", 2, 2, 0, 3),
+]
+
+
+if __name__ == "__main__":
+    # Usage: python -m benchmarks.pipeline_benchmark [records.jsonl]
+    rng = np.random.default_rng(0)
+    window = BaseWindow()
+    window.seed = 0
+    window.set_snr("10")
+    window.set_max_frame_size("100000")
+    # 20 samples per bit on the carrier
+    window.set_analog_sample_rate("20000")
+    bits = rng.integers(0, 2, 8 * 10**4).astype(np.uint8)
+
+    for trace_memory in (False, True):
+        profiler = StageProfiler(trace_memory=trace_memory)
+        with profiler:
+            for label, framer, detection, correction, carrier in CONFIGURATIONS:
+                window.set_coding(framer)
+                window.set_error_detection(detection)
+                window.set_error_correction(correction)
+                window.set_use_carrier_modulation(carrier is not None)
+                if carrier is not None:
+                    window.set_analog_modulation(carrier)
+                profiler.label = label
+                pipeline = Pipeline.from_window(window, hooks=[profiler])
+                for _ in range(5):
+                    pipeline.run(bits)
+
+        print(f"\n{'memory traced' if trace_memory else 'timing only'} ({bits.size} bits, 5 runs each)")
+        print(profiler.summary_table())
+        if len(sys.argv) > 1:
+            profiler.write_jsonl(sys.argv[1])
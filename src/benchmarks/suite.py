@@ -0,0 +1,272 @@
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, NamedTuple
+import numpy as np
+
+from benchmarks import peak_memory
+from data_link_layer import (BitsFlagFramer, ByteFlagFramer, CharCountingFramer, CRCErrorDetector,
+                             HammingBlockCorrector, HummingErrorCorrector, PackedBits, ParityErrorDetector)
+from physical_layer import (ASKCarrierModulator, BipolarModulator, FSKCarrierModulator, ManchesterModulator,
+                            NRZModulator, PSKCarrierModulator, QAMCarrierModulator)
+
+# Message sizes swept, in bytes: 1 B to 100 MB
+SIZES = [10**exponent for exponent in range(9)]
+# Differences below these are noise, never regressions; slowdowns must also
+# exceed the spread of the latencies (p90 - min) of either run
+TIME_FLOOR = 5e-6
+MEMORY_FLOOR = 4096
+
+
+class Target(NamedTuple):
+    """
+    An operation to benchmark. prepare builds the arguments of function for
+    a message of the given size in bytes; it is not timed. Sizes above
+    max_bytes are skipped, as they would not fit in memory or time, and
+    so are sizes below min_bytes, that the operation rejects.
+    """
+    name: str
+    prepare: Callable[[int, np.random.Generator], tuple]
+    function: Callable
+    max_bytes: int
+    min_bytes: int = 1
+
+
+def random_bits(num_bytes: int, rng: np.random.Generator) -> np.ndarray:
+    """Random message as one bit per element (uint8)."""
+    return rng.integers(0, 2, 8 * num_bytes, dtype=np.uint8)
+
+
+def random_packed(num_bytes: int, rng: np.random.Generator) -> PackedBits:
+    """Random message as packed bits."""
+    return PackedBits(rng.integers(0, 256, num_bytes, dtype=np.uint8))
+
+
+def flip_bit(bits: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Copy of bits with one random bit flipped."""
+    bits = bits.copy()
+    bits[rng.integers(bits.size)] ^= 1
+    return bits
+
+
+def build_targets() -> list[Target]:
+    """The operations of every modulator, framer, error detector and corrector."""
+    targets = []
+
+    # Physical layer: 8 samples per bit, 16 on the carriers
+    modulators = [NRZModulator(bit_rate=1e6, sample_rate=8e6), BipolarModulator(bit_rate=1e6, sample_rate=8e6),
+                  ManchesterModulator(bit_rate=1e6, sample_rate=8e6)]
+    carrier_modulators = [ASKCarrierModulator(2e6, 1e6, 16e6), FSKCarrierModulator(2e6, 1e6, 16e6, delta_frequency=1e6),
+                          PSKCarrierModulator(2e6, 1e6, 16e6), QAMCarrierModulator(2e6, 1e6, 16e6)]
+    for modulator, max_bytes in [(m, 10**6) for m in modulators] + [(m, 10**5) for m in carrier_modulators]:
+        name = type(modulator).__name__
+        targets.append(Target(f"{name}.modulate", lambda n, rng: (random_bits(n, rng),),
+                              modulator.modulate, max_bytes))
+        targets.append(Target(f"{name}.demodulate", lambda n, rng, m=modulator: (m.modulate(random_bits(n, rng)),),
+                              modulator.demodulate, max_bytes))
+
+    # Data link layer, on packed bits
+    for framer, max_bytes in [(CharCountingFramer(), 255), (ByteFlagFramer(), 10**8), (BitsFlagFramer(), 10**7)]:
+        name = type(framer).__name__
+        targets.append(Target(f"{name}.frame_data", lambda n, rng: (random_packed(n, rng),),
+                              framer.frame_data, max_bytes))
+        targets.append(Target(f"{name}.deframe_data", lambda n, rng, f=framer: (f.frame_data(random_packed(n, rng)),),
+                              framer.deframe_data, max_bytes))
+
+    for detector in [ParityErrorDetector(), CRCErrorDetector()]:
+        name = type(detector).__name__
+        # The CRC is computed over at least trailer_size bits
+        min_bytes = -(-detector.trailer_size // 8)
+        targets.append(Target(f"{name}.add_trailer", lambda n, rng: (random_packed(n, rng),),
+                              detector.add_trailer, 10**8, min_bytes))
+        targets.append(Target(f"{name}.check", lambda n, rng, d=detector: (d.add_trailer(random_packed(n, rng)),),
+                              detector.check, 10**8, min_bytes))
+
+    hamming = HummingErrorCorrector()
+    targets.append(Target("HummingErrorCorrector.add_error_detection", lambda n, rng: (random_bits(n, rng),),
+                          hamming.add_error_detection, 10**6))
+    # correct_errors works in place, so each call gets its own copy
+    targets.append(Target("HummingErrorCorrector.correct_errors",
+                          lambda n, rng: (flip_bit(hamming.add_error_detection(random_bits(n, rng)), rng),),
+                          lambda bits: hamming.correct_errors(bits.copy()), 10**6))
+
+    block = HammingBlockCorrector.from_name("(7,4)")
+    targets.append(Target("HammingBlockCorrector(7,4).encode", lambda n, rng: (random_bits(n, rng),),
+                          block.encode, 10**7))
+    targets.append(Target("HammingBlockCorrector(7,4).decode",
+                          lambda n, rng: (flip_bit(block.encode(random_bits(n, rng)), rng),),
+                          block.decode, 10**7))
+    return targets
+
+
+def measure(function: Callable, args: tuple, min_time: float, max_repeats: int) -> dict:
+    """
+    Time repeated calls until min_time has passed (at least 3 calls unless
+    one takes longer than min_time, at most max_repeats), then trace the
+    peak memory of one more call. tracemalloc slows calls down, so it is
+    never active while timing.
+
+    Returns:
+    dict: Number of calls, minimum, percentiles and mean of the latencies in seconds, peak bytes.
+    """
+    latencies = []
+    total = 0.0
+    while len(latencies) < max_repeats and (total < min_time or len(latencies) < 3):
+        start = time.perf_counter()
+        function(*args)
+        latencies.append(time.perf_counter() - start)
+        total += latencies[-1]
+        if latencies[0] > min_time:
+            break
+
+    peak = peak_memory(function, *args)
+
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    return {"repeats": len(latencies), "min": min(latencies), "p50": float(p50), "p90": float(p90),
+            "p99": float(p99), "mean": float(np.mean(latencies)), "peak_bytes": int(peak)}
+
+
+def run(targets: list[Target], sizes: list[int], min_time: float = 0.2, max_repeats: int = 100,
+        seed: int = 0, progress=None) -> list[dict]:
+    """
+    Benchmark every target at every size it supports.
+
+    Parameters:
+    targets (list[Target]): Operations to measure.
+    sizes (list[int]): Message sizes in bytes.
+    min_time (float): Minimum time spent timing each point, in seconds.
+    max_repeats (int): Maximum number of timed calls per point.
+    seed (int): Seed of the random messages.
+    progress (Callable[[dict], None] | None): Called with each result as it is measured.
+
+    Returns:
+    list[dict]: One result per (target, size), with the throughput in MB/s at the median latency.
+    """
+    results = []
+    for target in targets:
+        for size in sizes:
+            if not target.min_bytes <= size <= target.max_bytes:
+                continue
+            rng = np.random.default_rng(seed)
+            args = target.prepare(size, rng)
+            result = {"target": target.name, "size": size, **measure(target.function, args, min_time, max_repeats)}
+            result["throughput_mb_s"] = size / result["p50"] / 1e6 if result["p50"] > 0 else None
+            del args
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    return results
+
+
+def environment() -> dict:
+    """Description of the machine and libraries, stored with the baselines."""
+    return {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float) -> list[dict]:
+    """
+    Compare results with a baseline.
+
+    Parameters:
+    results (list[dict]): Current results.
+    baseline (list[dict]): Results of the baseline run.
+    tolerance (float): Relative slowdown or memory growth allowed, e.g. 0.1 for 10%.
+
+    Returns:
+    list[dict]: For each point present in both: the time and memory ratios
+    (current / baseline) and the regressions found ("time", "memory").
+
+    Times are compared on the minimum latency, which scheduling and cache
+    noise only ever raise; a single slow call moves the median of a
+    microsecond point by more than any tolerance. Baselines saved without
+    a minimum fall back to their median.
+    """
+    reference = {(result["target"], result["size"]): result for result in baseline}
+    comparisons = []
+    for result in results:
+        base = reference.get((result["target"], result["size"]))
+        if base is None:
+            continue
+        regressions = []
+        current, previous = result["min"], base.get("min", base["p50"])
+        spread = max(result["p90"] - current, base["p90"] - previous, 0.0)
+        if current > previous * (1 + tolerance) and current - previous > TIME_FLOOR + spread:
+            regressions.append("time")
+        if (result["peak_bytes"] > base["peak_bytes"] * (1 + tolerance)
+                and result["peak_bytes"] - base["peak_bytes"] > MEMORY_FLOOR):
+            regressions.append("memory")
+        comparisons.append({
+            "target": result["target"],
+            "size": result["size"],
+            "time_ratio": current / previous if previous > 0 else None,
+            "memory_ratio": result["peak_bytes"] / base["peak_bytes"] if base["peak_bytes"] > 0 else None,
+            "regressions": regressions,
+        })
+    return comparisons
+
+
+def format_result(result: dict) -> str:
+    """One line of the results table."""
+    throughput = f"{result['throughput_mb_s']:.2f}" if result["throughput_mb_s"] is not None else "-"
+    return (f"{result['target']:>42} {result['size']:>10} {result['repeats']:>7} {result['min'] * 1e3:>10.3f} "
+            f"{result['p50'] * 1e3:>10.3f} {result['p90'] * 1e3:>10.3f} {result['p99'] * 1e3:>10.3f} {throughput:>10} "
+            f"{result['peak_bytes'] / result['size']:>10.1f}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.suite",
+        description="Benchmark the modulators, framers, error detectors and correctors over message sizes.")
+    parser.add_argument("--targets", nargs="*", default=[],
+                        help="only run the targets whose name contains one of these strings")
+    parser.add_argument("--max-size", type=float, default=SIZES[-1], help="largest message size in bytes")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum timing per point, in seconds")
+    parser.add_argument("--max-repeats", type=int, default=100, help="maximum timed calls per point")
+    parser.add_argument("--save", metavar="FILE", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare with a JSON baseline and flag regressions")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="relative slowdown or memory growth allowed by --compare (default 0.1)")
+    args = parser.parse_args(argv)
+
+    targets = [target for target in build_targets()
+               if not args.targets or any(part in target.name for part in args.targets)]
+    sizes = [size for size in SIZES if size <= args.max_size]
+
+    print(f"{'target':>42} {'bytes':>10} {'repeats':>7} {'min (ms)':>10} {'p50 (ms)':>10} {'p90 (ms)':>10} "
+          f"{'p99 (ms)':>10} {'MB/s':>10} {'peak/byte':>10}")
+    results = run(targets, sizes, args.min_time, args.max_repeats,
+                  progress=lambda result: print(format_result(result), flush=True))
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({"environment": environment(), "results": results}, file, indent=1)
+        print(f"\nBaseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        comparisons = compare(results, baseline["results"], args.tolerance)
+        regressions = [comparison for comparison in comparisons if comparison["regressions"]]
+        print(f"\nCompared with {args.compare} ({baseline['environment']['date']}), tolerance {args.tolerance:.0%}")
+        print(f"{'target':>42} {'bytes':>10} {'time ratio':>11} {'memory ratio':>13} {'regression':>11}")
+        for comparison in comparisons:
+            time_ratio = f"{comparison['time_ratio']:.2f}" if comparison["time_ratio"] is not None else "-"
+            memory_ratio = f"{comparison['memory_ratio']:.2f}" if comparison["memory_ratio"] is not None else "-"
+            print(f"{comparison['target']:>42} {comparison['size']:>10} {time_ratio:>11} {memory_ratio:>13} "
+                  f"{','.join(comparison['regressions']) or '-':>11}")
+        print(f"\n{len(regressions)} regression(s) in {len(comparisons)} points")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,514 @@
+import warnings
+from abc import abstractmethod
+from math import erfc, sqrt
+from typing import Iterable, Iterator
+import numpy as np
+
+from communication import CommunicationChannel
+from importance_sampling import ImportanceSampler
+from physical_layer import (DigitalModulator, NRZModulator, BipolarModulator, ManchesterModulator, CarrierModulator,
+                            ASKCarrierModulator, FSKCarrierModulator, PSKCarrierModulator, QAMCarrierModulator)
+
+
+class ChannelModel:
+    """Base class for channel impairments.
+    A model transforms a signal with apply(). It keeps its state (random
+    generator, running measurements, filter memory...) between calls, so
+    consecutive chunks of a stream continue the same impairment. The chunks
+    give the same result as the whole signal unless the model adapts to a
+    measurement of the signal, as AWGNChannel without signal_power does.
+    """
+    def __init__(self, seed: int | np.random.Generator | None = None):
+        """
+        Parameters:
+        seed (int | np.random.Generator | None): Seed or generator for the model's randomness.
+                                                 A generator is drawn on once, for a child seed.
+        """
+        if isinstance(seed, np.random.Generator):
+            # A generator cannot be restarted: keep a seed spawned from it, that reset() can
+            seed = seed.bit_generator.seed_seq.spawn(1)[0]
+        self.seed = seed
+        self.reset()
+
+    def reset(self) -> None:
+        """Restart the model: reseed its generator and clear the stream state."""
+        seed = self.seed
+        if isinstance(seed, np.random.SeedSequence):
+            # A copy, as spawning from the generator would advance the stored sequence
+            seed = np.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key, pool_size=seed.pool_size)
+        self.rng = np.random.default_rng(seed)
+
+    @abstractmethod
+    def apply(self, signal: np.ndarray) -> np.ndarray:
+        """
+        Apply the impairment to the next chunk of the signal.
+
+        Parameters:
+        signal (np.ndarray): 1-D signal (real or complex baseband) or bit array.
+
+        Returns:
+        np.ndarray: Impaired signal with the same length.
+        """
+        pass
+
+    def apply_stream(self, chunks: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+        """Apply the impairment to consecutive chunks of a signal."""
+        for chunk in chunks:
+            yield self.apply(chunk)
+
+
+class AWGNChannel(ChannelModel):
+    """Additive white Gaussian noise calibrated in dB.
+    The noise level follows from the signal power, measured over all the
+    samples seen so far, or given explicitly. Complex signals get half of
+    the noise power on each of I and Q.
+
+    A measured power is a running estimate: each chunk of a stream is
+    scaled by the power of the samples up to its end, so chunks of a
+    signal whose power changes get other noise levels than the whole
+    signal. Give signal_power to stream with the same result as the whole.
+    """
+    def __init__(self, snr_db: float | None = None, ebn0_db: float | None = None, samples_per_bit: float = 1,
+                 signal_power: float | None = None, seed: int | np.random.Generator | None = None):
+        """
+        Parameters:
+        snr_db (float | None): Signal-to-noise ratio per sample, in dB.
+        ebn0_db (float | None): Energy per bit over noise density Eb/N0, in dB.
+                                Exactly one of snr_db and ebn0_db must be given.
+        samples_per_bit (float): Samples per information bit, used by ebn0_db.
+        signal_power (float | None): Mean power |s|^2 per sample. Measured
+                                     from the signal when None.
+        seed (int | np.random.Generator | None): Seed or generator of the noise.
+        """
+        if (snr_db is None) == (ebn0_db is None):
+            raise ValueError("Give exactly one of snr_db and ebn0_db.")
+        self.snr_db = snr_db
+        self.ebn0_db = ebn0_db
+        self.samples_per_bit = samples_per_bit
+        self.signal_power = signal_power
+        super().__init__(seed)
+
+    def reset(self) -> None:
+        super().reset()
+        self._energy = 0.0
+        self._samples = 0
+
+    def noise_std(self, signal_power: float, complex_signal: bool = False) -> float:
+        """
+        Standard deviation of the noise on each real component.
+
+        With N0/2 the noise variance per real component, Eb = P * samples_per_bit
+        and SNR = P / (noise power per sample), which for complex signals is
+        twice the variance per component.
+        """
+        if self.ebn0_db is not None:
+            variance = signal_power * self.samples_per_bit / (2 * 10 ** (self.ebn0_db / 10))
+        else:
+            variance = signal_power / 10 ** (self.snr_db / 10)
+            if complex_signal:
+                variance /= 2
+        return float(np.sqrt(variance))
+
+    def apply(self, signal: np.ndarray) -> np.ndarray:
+        signal = np.asarray(signal)
+        power = self.signal_power
+        if power is None:
+            self._energy += float(np.vdot(signal, signal).real)
+            self._samples += signal.size
+            power = self._energy / self._samples if self._samples else 0.0
+
+        complex_signal = np.iscomplexobj(signal)
+        std = self.noise_std(power, complex_signal)
+        dtype = np.float32 if signal.dtype in (np.float32, np.complex64) else np.float64
+        noise = self.rng.standard_normal(signal.size * (2 if complex_signal else 1), dtype=dtype)
+        noise *= std
+        if complex_signal:
+            noise = noise.view(np.complex64 if dtype == np.float32 else np.complex128)
+        return signal + noise.reshape(signal.shape)
+
+
+class GilbertElliottChannel(ChannelModel):
+    """Gilbert-Elliott burst-error channel on bit arrays.
+    A two-state Markov chain switches between a good and a bad state; each
+    bit is flipped with the error probability of its state. State runs are
+    drawn as geometric run lengths, so the cost does not depend on the
+    number of bits per run.
+    """
+    def __init__(self, p_good_to_bad: float, p_bad_to_good: float, error_good: float = 0.0,
+                 error_bad: float = 0.5, seed: int | np.random.Generator | None = None):
+        """
+        Parameters:
+        p_good_to_bad (float): Probability of leaving the good state after a bit.
+        p_bad_to_good (float): Probability of leaving the bad state after a bit.
+        error_good (float): Bit error probability in the good state.
+        error_bad (float): Bit error probability in the bad state.
+        seed (int | np.random.Generator | None): Seed or generator of the channel.
+        """
+        for p in (p_good_to_bad, p_bad_to_good):
+            if not 0 < p <= 1:
+                raise ValueError("Transition probabilities must be in (0, 1].")
+        self.p_good_to_bad = p_good_to_bad
+        self.p_bad_to_good = p_bad_to_good
+        self.error_good = error_good
+        self.error_bad = error_bad
+        super().__init__(seed)
+
+    def reset(self) -> None:
+        super().reset()
+        # Separate streams for the states and the errors, so chunking does not change either
+        self._state_rng, self._error_rng = self.rng.spawn(2)
+        # Start in the stationary distribution, at the beginning of a run
+        self._run_bad = bool(self._state_rng.random() < self.bad_fraction())
+        self._runs = self._run_lengths(np.array([self._run_bad]))
+
+    def bad_fraction(self) -> float:
+        """Long-run fraction of bits sent in the bad state."""
+        return self.p_good_to_bad / (self.p_good_to_bad + self.p_bad_to_good)
+
+    def error_rate(self) -> float:
+        """Long-run bit error rate."""
+        bad = self.bad_fraction()
+        return (1 - bad) * self.error_good + bad * self.error_bad
+
+    def states(self, size: int) -> np.ndarray:
+        """
+        Continue the state sequence for the next size bits.
+
+        Returns:
+        np.ndarray: Boolean array, True where the bit is sent in the bad state.
+        """
+        if not size:
+            return np.zeros(0, dtype=bool)
+
+        # Queue enough alternating runs; the ones not used now are kept for the next chunk
+        mean_pair = 1 / self.p_good_to_bad + 1 / self.p_bad_to_good
+        while self._runs.sum() < size:
+            count = 2 * int((size - self._runs.sum()) / mean_pair) + 2
+            last_bad = self._run_bad ^ (self._runs.size % 2 == 0)
+            run_states = (np.arange(count) % 2 == 0) ^ last_bad
+            self._runs = np.concatenate((self._runs, self._run_lengths(run_states)))
+
+        end = np.cumsum(self._runs)
+        last = int(np.searchsorted(end, size))
+        used = self._runs[:last + 1].copy()
+        used[-1] -= end[last] - size
+        run_states = (np.arange(used.size) % 2 == 1) ^ self._run_bad
+        states = np.repeat(run_states, used)
+
+        if end[last] > size:
+            # The last run goes on in the next chunk
+            self._runs = np.concatenate(([end[last] - size], self._runs[last + 1:]))
+            self._run_bad = bool(run_states[-1])
+        else:
+            self._runs = self._runs[last + 1:]
+            self._run_bad = not run_states[-1]
+        return states
+
+    def _run_lengths(self, run_states: np.ndarray) -> np.ndarray:
+        """Geometric length of a run in each given state."""
+        leave = np.where(run_states, self.p_bad_to_good, self.p_good_to_bad)
+        return self._state_rng.geometric(leave)
+
+    def apply(self, signal: np.ndarray) -> np.ndarray:
+        bits = np.asarray(signal)
+        if not (np.issubdtype(bits.dtype, np.integer) or bits.dtype == bool):
+            raise ValueError("The Gilbert-Elliott channel acts on bit arrays.")
+        error_probability = np.where(self.states(bits.size), self.error_bad, self.error_good)
+        errors = self._error_rng.random(bits.size) < error_probability
+        return bits ^ errors.astype(bits.dtype).reshape(bits.shape)
+
+
+class BinarySymmetricChannel(ChannelModel):
+    """Binary symmetric channel on bit arrays: each bit is flipped with probability p.
+    It replaces modulation, a noisy waveform channel and demodulation when only
+    the link layer is under test. For small p the gaps between errors are drawn
+    instead of one random number per bit.
+    """
+    # Above this crossover probability one uniform number per bit is cheaper
+    GAP_SAMPLING_LIMIT = 0.05
+
+    def __init__(self, p: float, seed: int | np.random.Generator | None = None):
+        """
+        Parameters:
+        p (float): Crossover (bit error) probability.
+        seed (int | np.random.Generator | None): Seed or generator of the errors.
+        """
+        if not 0 <= p <= 1:
+            raise ValueError("Crossover probability must be in [0, 1].")
+        self.p = p
+        super().__init__(seed)
+
+    @classmethod
+    def from_modulation(cls, modulator: DigitalModulator | CarrierModulator, snr: float, std_dev: float = 1,
+                        seed: int | np.random.Generator | None = None) -> "BinarySymmetricChannel":
+        """Channel with the bit error rate of the modulator over CommunicationChannel(snr, std_dev)."""
+        return cls(crossover_probability(modulator, snr, std_dev), seed)
+
+    def reset(self) -> None:
+        super().reset()
+        self._position = 0
+        # Absolute positions of the next errors, drawn ahead
+        self._errors = np.zeros(0, dtype=np.int64)
+
+    def error_positions(self, size: int) -> np.ndarray:
+        """Continue the error process for the next size bits; return the flipped positions."""
+        start = self._position
+        self._position += size
+        if self.p == 0 or not size:
+            return np.zeros(0, dtype=np.int64)
+        if self.p >= self.GAP_SAMPLING_LIMIT:
+            return np.flatnonzero(self.rng.random(size) < self.p)
+
+        end = self._position
+        while not self._errors.size or self._errors[-1] < end:
+            last = self._errors[-1] if self._errors.size else start - 1
+            count = int((end - last) * self.p * 1.1) + 16
+            gaps = self.rng.geometric(self.p, count)
+            self._errors = np.concatenate((self._errors, last + np.cumsum(gaps)))
+
+        split = int(np.searchsorted(self._errors, end))
+        positions = self._errors[:split] - start
+        self._errors = self._errors[split:]
+        return positions
+
+    def apply(self, signal: np.ndarray) -> np.ndarray:
+        bits = np.array(signal)
+        if not (np.issubdtype(bits.dtype, np.integer) or bits.dtype == bool):
+            raise ValueError("The binary symmetric channel acts on bit arrays.")
+        flat = bits.reshape(-1)
+        positions = self.error_positions(flat.size)
+        # True flips bools and integer bits alike
+        flat[positions] ^= True
+        return bits
+
+
+# Samples simulated at once by the measured crossover probabilities, to bound their memory
+MEASUREMENT_CHUNK = 1 << 20
+
+
+def q_function(x: float) -> float:
+    """Tail probability of the standard normal distribution."""
+    return 0.5 * erfc(x / sqrt(2))
+
+
+def crossover_probability(modulator: DigitalModulator | CarrierModulator, snr: float, std_dev: float = 1,
+                          num_bits: int = 1 << 20, seed: int = 0) -> float:
+    """
+    Bit error probability of a modulator over CommunicationChannel(snr, std_dev),
+    i.e. Gaussian noise with standard deviation std_dev / snr per sample.
+
+    Closed forms are used for the coherent detectors (NRZ, PSK and coherent
+    binary FSK, with orthogonal tones). Bipolar, Manchester and 8-QAM are
+    estimated by importance sampling, which resolves error rates far below
+    1 / num_bits. ASK's energy detector is simulated on its bit energies,
+    drawn from their chi-square distributions, and the other FSK detectors
+    by sending num_bits random bits over the complex baseband, in chunks of
+    MEASUREMENT_CHUNK samples. A measurement without any error warns, as
+    the probability is then only known to be below about 3 / num_bits.
+
+    Parameters:
+    modulator (DigitalModulator | CarrierModulator): Configured modulator.
+    snr (float): Channel SNR factor, as in CommunicationChannel.
+    std_dev (float): Noise standard deviation before scaling.
+    num_bits (int): Bits sent by the measurement (at most, for importance sampling).
+    seed (int): Seed of the measurement.
+
+    Returns:
+    float: Crossover probability.
+    """
+    sigma = std_dev / snr
+    if isinstance(modulator, NRZModulator):
+        # Integrate-and-dump of +-1 over samples_per_bit samples
+        return q_function(sqrt(modulator.samples_per_bit) / sigma)
+    if isinstance(modulator, PSKCarrierModulator):
+        # Antipodal points at distance 2*sqrt(N/2) in the normalised matched-filter output
+        return q_function(sqrt(modulator.samples_per_symbol / 2) / sigma)
+    if (isinstance(modulator, FSKCarrierModulator) and modulator.detector == "coherent"
+            and modulator.bits_per_symbol == 1):
+        # Orthogonal tones: the difference of the two correlations has twice the noise
+        return q_function(sqrt(modulator.samples_per_symbol / 4) / sigma)
+
+    rng = np.random.default_rng(seed)
+    if isinstance(modulator, (BipolarModulator, ManchesterModulator, QAMCarrierModulator)):
+        point = ImportanceSampler(modulator, std_dev, max_bits=num_bits, seed=seed).estimate(snr)
+        # With errors under the biased noise, a zero estimate is below the smallest float
+        if point.error_samples:
+            return point.ber
+        errors = 0
+    elif isinstance(modulator, ASKCarrierModulator):
+        # The energy detector integrates samples_per_bit real noise dimensions; a mark
+        # adds the bit energy samples_per_bit / 2 of the normalised envelope
+        bits = rng.integers(0, 2, num_bits)
+        dimensions = 2 * max(modulator.samples_per_bit // 2, 1)
+        energy = sigma**2 * rng.noncentral_chisquare(dimensions, bits * modulator.samples_per_bit / 2 / sigma**2)
+        # Threshold at the mean energy, as in the detector
+        errors = int(np.count_nonzero((energy > energy.mean()) != bits))
+    else:
+        if isinstance(modulator, CarrierModulator):
+            modulate, demodulate, bits_per_symbol = (modulator.modulate_baseband, modulator.demodulate_baseband,
+                                                     modulator.bits_per_symbol)
+        else:
+            modulate, demodulate, bits_per_symbol = modulator.modulate, modulator.demodulate, 1
+        # Whole symbols in every chunk
+        symbol_samples = modulate(np.zeros(bits_per_symbol, dtype=int)).size
+        chunk = max(MEASUREMENT_CHUNK // symbol_samples, 1) * bits_per_symbol
+        channel = CommunicationChannel(snr, std_dev, seed=rng)
+        errors = 0
+        for start in range(0, num_bits, chunk):
+            bits = rng.integers(0, 2, min(chunk, num_bits - start))
+            channel.send(modulate(bits))
+            received = demodulate(channel.receive(copy=False))
+            errors += int(np.count_nonzero(received[:bits.size] != bits))
+
+    if not errors:
+        warnings.warn(f"No errors in {num_bits} bits: the crossover probability of {type(modulator).__name__} "
+                      f"at snr {snr} is below about {3 / num_bits:.1e}, not 0.", RuntimeWarning, stacklevel=2)
+    return errors / num_bits
+
+
+class RayleighFadingChannel(ChannelModel):
+    """Flat Rayleigh block fading.
+    The signal is multiplied by a complex gain h ~ CN(0, 1), constant over
+    blocks of coherence_samples samples and independent between blocks.
+    Real signals are scaled by the envelope |h|, complex baseband signals by h.
+    """
+    def __init__(self, coherence_samples: int, seed: int | np.random.Generator | None = None):
+        """
+        Parameters:
+        coherence_samples (int): Number of samples with the same gain.
+        seed (int | np.random.Generator | None): Seed or generator of the gains.
+        """
+        if coherence_samples < 1:
+            raise ValueError("Coherence length must be at least one sample.")
+        self.coherence_samples = coherence_samples
+        super().__init__(seed)
+
+    def reset(self) -> None:
+        super().reset()
+        self._position = 0
+        self._gain = 0j
+
+    def gains(self, size: int) -> np.ndarray:
+        """Continue the sequence of per-sample complex gains for the next size samples."""
+        start = self._position % self.coherence_samples
+        blocks = (start + size + self.coherence_samples - 1) // self.coherence_samples
+        # A block already started keeps its gain
+        new_blocks = blocks - 1 if start else blocks
+        block_gains = self.rng.standard_normal(2 * new_blocks).view(complex) / np.sqrt(2)
+        if start:
+            block_gains = np.concatenate(([self._gain], block_gains))
+
+        self._position += size
+        if block_gains.size:
+            self._gain = block_gains[-1]
+        return block_gains[(start + np.arange(size)) // self.coherence_samples]
+
+    def apply(self, signal: np.ndarray) -> np.ndarray:
+        signal = np.asarray(signal)
+        if not signal.size:
+            return signal.copy()
+        gains = self.gains(signal.size).reshape(signal.shape)
+        if np.iscomplexobj(signal):
+            return signal * gains.astype(signal.dtype)
+        return signal * np.abs(gains).astype(signal.dtype)
+
+
+class MultipathChannel(ChannelModel):
+    """Static multipath channel, a linear convolution computed with FFTs.
+    The signal is cut into blocks that are transformed together (overlap-add),
+    and the tail of the last block is kept for the next chunk, so a stream
+    gives the same samples as the whole signal.
+    """
+    def __init__(self, taps: np.ndarray):
+        """
+        Parameters:
+        taps (np.ndarray): Impulse response of the channel, one tap per sample delay.
+        """
+        self.taps = np.asarray(taps)
+        if not self.taps.size:
+            raise ValueError("The impulse response needs at least one tap.")
+        # FFT size of each block, a few times the impulse response
+        self.fft_size = max(4096, 1 << (8 * self.taps.size - 1).bit_length())
+        self.block_size = self.fft_size - self.taps.size + 1
+        self._complex = np.iscomplexobj(self.taps)
+        self._spectrum = np.fft.fft(self.taps, self.fft_size) if self._complex else np.fft.rfft(self.taps, self.fft_size)
+        super().__init__()
+
+    @classmethod
+    def from_profile(cls, delays: Iterable[int], gains_db: Iterable[float]) -> "MultipathChannel":
+        """
+        Build the channel from a power delay profile.
+
+        Parameters:
+        delays (Iterable[int]): Delay of each path, in samples.
+        gains_db (Iterable[float]): Power gain of each path, in dB.
+        """
+        delays = np.asarray(list(delays), dtype=int)
+        taps = np.zeros(delays.max() + 1)
+        np.add.at(taps, delays, 10 ** (np.asarray(list(gains_db), dtype=float) / 20))
+        return cls(taps)
+
+    def reset(self) -> None:
+        super().reset()
+        self._tail = np.zeros(self.taps.size - 1)
+
+    def apply(self, signal: np.ndarray) -> np.ndarray:
+        signal = np.asarray(signal)
+        size = signal.size
+        step = self.block_size
+        overlap = self.taps.size - 1
+        blocks = -(-size // step)
+
+        padded = np.zeros((blocks, step), dtype=signal.dtype)
+        padded.reshape(-1)[:size] = signal.reshape(-1)
+        if self._complex or np.iscomplexobj(signal):
+            spectrum = self._spectrum if self._complex else np.fft.fft(self.taps, self.fft_size)
+            convolved = np.fft.ifft(np.fft.fft(padded, self.fft_size, axis=1) * spectrum, axis=1)
+        else:
+            convolved = np.fft.irfft(np.fft.rfft(padded, self.fft_size, axis=1) * self._spectrum, self.fft_size, axis=1)
+
+        # Each block adds its tail to the start of the next one (overlap < step)
+        output = np.zeros((blocks + 1) * step, dtype=convolved.dtype)
+        output[:blocks * step] = convolved[:, :step].reshape(-1)
+        output[step:].reshape(blocks, step)[:, :overlap] += convolved[:, step:]
+        output[:overlap] += self._tail
+
+        # Samples past the end of this chunk go to the next one
+        self._tail = output[size:size + overlap].copy()
+        return output[:size].astype(np.result_type(signal.dtype, self.taps.dtype, np.float32), copy=False)
+
+
+class ChannelPipeline(ChannelModel):
+    """Chain of channel models applied in order, e.g. multipath, fading, then noise.
+    It can replace CommunicationChannel through send() and receive().
+    """
+    def __init__(self, *models: ChannelModel):
+        self.models = list(models)
+        self.data = np.array([], dtype=np.float32)
+        super().__init__()
+
+    def reset(self) -> None:
+        for model in self.models:
+            model.reset()
+
+    def apply(self, signal: np.ndarray) -> np.ndarray:
+        for model in self.models:
+            signal = model.apply(signal)
+        return signal
+
+    def send(self, data: np.ndarray) -> None:
+        """
+        Send a signal through the channel. Consecutive sends continue the
+        same stream: fading, burst state and multipath memory carry over.
+        """
+        if not isinstance(data, np.ndarray):
+            raise ValueError("Data must be a numpy array.")
+        self.data = self.apply(data)
+
+    def receive(self, copy: bool = True) -> np.ndarray:
+        """Receive the impaired signal, or a read-only view of it if copy is False."""
+        if copy:
+            return self.data.copy()
+        view = self.data.view()
+        view.flags.writeable = False
+        return view
@@ -1,19 +1,81 @@
 import numpy as np
 
 class CommunicationChannel:
-    def __init__(self, snr: float, std_dev: float = 1):
+    # Noise is drawn in blocks of this many values, so its buffer stays small
+    NOISE_BLOCK = 1 << 16
+
+    def __init__(self, snr: float, std_dev: float = 1,
+                 seed: int | np.random.SeedSequence | np.random.Generator | None = None):
+        """
+        Initialize the channel.
+
+        Parameters:
+        snr (float): Signal-to-noise factor; the noise standard deviation is std_dev / snr.
+        std_dev (float): Standard deviation of the noise before scaling.
+        seed (int | np.random.SeedSequence | np.random.Generator | None): Seed of the channel's
+            random generator, for reproducible runs, or the generator itself, which is then shared.
+        """
         self.snr = snr
         self.data = np.array([], dtype=np.float32)
         self.std_dev = std_dev
+        self.rng = np.random.default_rng(seed)
+        self._buffer = self.data
+        self._noise = np.empty(self.NOISE_BLOCK, dtype=np.float32)
+
+    def send(self, data: np.ndarray, in_place: bool = False) -> None:
+        """
+        Send data with a specified SNR.
+
+        Gaussian noise is drawn as float32 straight into a reusable block
+        buffer and added in place, so no full-size noise array is allocated.
+        Complex (baseband) data gets independent noise on I and Q.
 
-    def send(self, data: np.ndarray) -> None:
-        """Send data with a specified SNR."""
+        Parameters:
+        data (np.ndarray): Signal to send.
+        in_place (bool): Add the noise to data itself instead of to the
+                         channel's buffer, which is reused between sends of
+                         the same shape and type.
+        """
         if not isinstance(data, np.ndarray):
             raise ValueError("Data must be a numpy array.")
-        self.data = data.copy()
-        noise = np.random.normal(0, self.std_dev, size=data.shape) * 1/self.snr
-        self.data += noise
 
-    def receive(self) -> np.ndarray:
-        """Receive data with noise added."""
-        return self.data.copy()
\ No newline at end of file
+        if in_place:
+            if not np.issubdtype(data.dtype, np.inexact) or not data.flags.c_contiguous:
+                raise ValueError("Data sent in place must be a contiguous floating point array.")
+            self.data = data
+        else:
+            dtype = data.dtype if np.issubdtype(data.dtype, np.inexact) else np.dtype(np.float32)
+            if self._buffer.shape != data.shape or self._buffer.dtype != dtype:
+                self._buffer = np.empty(data.shape, dtype=dtype)
+            np.copyto(self._buffer, data)
+            self.data = self._buffer
+        self._add_noise(self.data)
+
+    def receive(self, copy: bool = True) -> np.ndarray:
+        """
+        Receive data with noise added.
+
+        Parameters:
+        copy (bool): If False, return a read-only view of the channel's
+                     buffer, valid until the next send.
+        """
+        if copy:
+            return self.data.copy()
+        view = self.data.view()
+        view.flags.writeable = False
+        return view
+
+    def _add_noise(self, data: np.ndarray) -> None:
+        """Add the scaled float32 noise to a contiguous array, block by block."""
+        samples = data.reshape(-1)
+        if np.iscomplexobj(samples):
+            # Interleaved I and Q values
+            samples = samples.view(samples.real.dtype)
+
+        scale = self.std_dev / self.snr
+        for start in range(0, samples.size, self.NOISE_BLOCK):
+            block = samples[start:start + self.NOISE_BLOCK]
+            noise = self._noise[:block.size]
+            self.rng.standard_normal(out=noise, dtype=np.float32)
+            noise *= scale
+            block += noise
@@ -1,9 +1,13 @@
 from .byte_flag_framer import ByteFlagFramer
 from .bits_flag_framer import BitsFlagFramer
 from .char_counting_framer import CharCountingFramer
+from .bit_stuffer import BitStuffer
 
 from .parity_error_detector import ParityErrorDetector
 from .crc_error_detector import CRCErrorDetector
+from .crc_stream import CRCStream, CRCModel, CRC_CATALOG
 from .humming_error_corrector import HummingErrorCorrector
+from .hamming_block_corrector import HammingBlockCorrector
+from .packed_bits import PackedBits
 
-__other__ = ['ByteFlagFramer', 'BitsFlagFramer', 'CharCountingFramer', 'ParityErrorDetector', 'CRCErrorDetector', 'HummingErrorCorrector']
+__other__ = ['ByteFlagFramer', 'BitsFlagFramer', 'CharCountingFramer', 'BitStuffer', 'ParityErrorDetector', 'CRCErrorDetector', 'CRCStream', 'CRCModel', 'CRC_CATALOG', 'HummingErrorCorrector', 'HammingBlockCorrector', 'PackedBits']
@@ -0,0 +1,165 @@
+import numpy as np
+
+class BitStuffer:
+    """
+    Bit stuffing for a flag of m bits. Whenever the last m-1 bits sent are
+    the flag prefix flag[:-1], the complement of flag[-1] is sent next, so
+    the flag can never appear between the opening and the closing flags.
+    The receiver applies the same rule to the raw bits: the bit after each
+    occurrence of the prefix either ends a flag or was stuffed.
+
+    The rule is applied to the bits actually sent, so stuffed bits and the
+    opening flag are part of the windows. Flags made of one bit followed by
+    a run of the other (like the default 01111110) are handled with run
+    lengths, as the prefix can only match at the start of a run. Other
+    flags are stuffed from the prefix matches of the unstuffed data, and
+    only the few windows that contain a stuffed bit are checked one bit
+    at a time.
+    """
+    def __init__(self, flag_bits: np.ndarray):
+        """
+        Initialize the stuffer.
+
+        Parameters:
+        flag_bits (np.ndarray): Flag that delimits the frames.
+        """
+        flag = np.asarray(flag_bits).astype(np.uint8)
+        if flag.size < 2:
+            raise ValueError("Flag must have at least 2 bits.")
+
+        prefix = flag[:-1]
+        stuffed_bit = 1 - int(flag[-1])
+        # A prefix that ends with the start of the flag would match before
+        # the end of the closing flag, for some data
+        for size in range(1, prefix.size):
+            if np.array_equal(prefix[-size:], flag[:size]):
+                raise ValueError("Flag bits overlap with themselves and cannot delimit frames unambiguously.")
+        if np.array_equal(np.append(prefix[1:], stuffed_bit), prefix):
+            raise ValueError("Flag bits would be stuffed forever.")
+
+        self.flag_bits = flag
+        self.prefix = prefix
+        self.stuffed_bit = stuffed_bit
+        # Length of the run after the first prefix bit, for run-shaped flags
+        self.run_length = prefix.size - 1 if prefix.size > 1 and np.all(prefix[1:] != prefix[0]) else None
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new frame: the next bits follow an opening flag."""
+        self._tail = self.flag_bits[1:].copy()
+        self._fresh = True
+
+    def stuff(self, bits: np.ndarray) -> np.ndarray:
+        """
+        Stuff the next chunk of frame data. The last bits sent are kept, so
+        a frame can be stuffed in consecutive chunks.
+
+        Parameters:
+        bits (np.ndarray): Data bits.
+
+        Returns:
+        np.ndarray: Stuffed bits (uint8).
+        """
+        bits = np.asarray(bits).astype(np.uint8)
+        buffer = np.concatenate((self._tail, bits))
+        offset = self._tail.size
+        # The check after the opening flag is only made once
+        first = offset if self._fresh else offset + 1
+
+        if self.run_length is not None:
+            points = self._run_points(buffer)
+            points = points[points >= first]
+        else:
+            points = self._scan_points(buffer, first)
+
+        stuffed = np.insert(bits, points - offset, self.stuffed_bit)
+        self._tail = np.concatenate((self._tail, stuffed))[-self.prefix.size:]
+        self._fresh = False
+        return stuffed
+
+    def decisions(self, raw: np.ndarray) -> np.ndarray:
+        """
+        Find the bits that follow the flag prefix in raw (stuffed) bits.
+        Each one either ends a flag, if it equals the last flag bit, or
+        was stuffed and must be removed.
+
+        Parameters:
+        raw (np.ndarray): Bits as received.
+
+        Returns:
+        np.ndarray: Sorted indices of the decision bits.
+        """
+        raw = np.asarray(raw)
+        if self.run_length is not None:
+            starts, lengths = self._runs(raw)
+            points = starts[lengths >= self.run_length] + self.run_length
+        else:
+            points = self._matches(raw)
+        return points[points < raw.size]
+
+    def _runs(self, bits: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Start and length of every run of the complement of prefix[0] that follows a prefix[0] bit."""
+        in_run = bits != self.prefix[0]
+        starts = np.flatnonzero(in_run[1:] > in_run[:-1]) + 1
+        ends = np.flatnonzero(in_run[1:] < in_run[:-1]) + 1
+        if in_run[-1:].any():
+            ends = np.append(ends, bits.size)
+        if in_run[:1].any():
+            # A run at the first bit has no preceding bit
+            ends = ends[1:]
+        return starts, ends - starts
+
+    def _run_points(self, buffer: np.ndarray) -> np.ndarray:
+        """Stuffing points of a run-shaped flag, as indices of the bits they precede."""
+        starts, lengths = self._runs(buffer)
+        length = self.run_length
+        if self.stuffed_bit != self.prefix[0]:
+            # The stuffed bit extends the run, so each run is stuffed once
+            return starts[lengths >= length] + length
+
+        # The stuffed bit starts a new window: stuff after every `length` bits of the run
+        counts = lengths // length
+        first = np.repeat(np.cumsum(counts) - counts, counts)
+        return np.repeat(starts, counts) + length * (np.arange(counts.sum()) - first + 1)
+
+    def _matches(self, bits: np.ndarray) -> np.ndarray:
+        """Indices of the bits that follow each occurrence of the prefix."""
+        count = bits.size - self.prefix.size + 1
+        if count <= 0:
+            return np.zeros(0, dtype=np.int64)
+        match = np.ones(count, dtype=bool)
+        for index, bit in enumerate(self.prefix):
+            match &= bits[index:index + count] == bit
+        return np.flatnonzero(match) + self.prefix.size
+
+    def _scan_points(self, buffer: np.ndarray, first: int) -> np.ndarray:
+        """
+        Stuffing points of any flag. Matches of the unstuffed data are valid
+        until a stuffed bit enters the window; the next prefix-size windows
+        are then checked one bit at a time.
+        """
+        size = self.prefix.size
+        mask = (1 << size) - 1
+        target = int("".join(map(str, self.prefix)), 2)
+        matches = self._matches(buffer)
+
+        points = []
+        valid_from = first
+        while True:
+            index = np.searchsorted(matches, valid_from)
+            if index == matches.size:
+                break
+            position = int(matches[index])
+            state = target
+            region_end = position + size
+            while True:
+                while state == target:
+                    points.append(position)
+                    state = ((state << 1) | self.stuffed_bit) & mask
+                    region_end = position + size
+                if position + 1 >= region_end or position >= buffer.size:
+                    break
+                state = ((state << 1) | int(buffer[position])) & mask
+                position += 1
+            valid_from = region_end
+        return np.array(points, dtype=np.int64)
@@ -1,5 +1,7 @@
+from typing import Iterable, Iterator
 import numpy as np
-from .framer import Framer, ErrorDetector
+from .framer import Framer, ErrorDetector, PackedBits
+from .bit_stuffer import BitStuffer
 
 class BitsFlagFramer(Framer):
     """Bits Flag Framer for encapsulating data into frames with bits flag."""
@@ -19,17 +21,22 @@ class BitsFlagFramer(Framer):
             raise ValueError("Flag bits must be a np.ndarray.")
         
         self.flag_bits = flag_bits.copy()
+        self.stuffer = BitStuffer(self.flag_bits)
 
-    def frame_data(self, data: np.ndarray) -> np.ndarray:
+    def frame_data(self, data: np.ndarray | PackedBits) -> np.ndarray | PackedBits:
         """
         Frame the input data into frames with bits flags.
+        Bit stuffing works on single bits, so PackedBits are unpacked and
+        the frame is packed again.
         
         Parameters:
-        data (np.ndarray): Input bits to be framed.
+        data (np.ndarray | PackedBits): Input bits to be framed.
         
         Returns:
-        np.ndarray: Framed data.
+        np.ndarray | PackedBits: Framed data.
         """
+        if isinstance(data, PackedBits):
+            return PackedBits.from_bits(self.frame_data(data.to_bits()))
         if not isinstance(data, np.ndarray):
             raise ValueError("Data must be a numpy array.")
         
@@ -38,27 +45,26 @@ class BitsFlagFramer(Framer):
         if self.error_detector is not None:
             bits = self.error_detector.add_trailer(bits)
 
-        if bits.size > len(self.flag_bits) - 1:
-            # Add the inverse of the last flag bit where data matches the flag bits
-            windows = np.lib.stride_tricks.sliding_window_view(bits, window_shape=len(self.flag_bits)-1)
-            matches = np.all(windows == self.flag_bits[:-1], axis=1)
-            indices = np.nonzero(matches)[0] + len(self.flag_bits) - 1
-            bits = np.insert(bits, indices, (not self.flag_bits[-1]))    
+        # Add the inverse of the last flag bit wherever the bits sent match the flag prefix
+        self.stuffer.reset()
+        bits = self.stuffer.stuff(bits)
 
         framed_data = np.concatenate((self.flag_bits, bits, self.flag_bits))
         
         return framed_data
 
-    def deframe_data(self, framed_data: np.ndarray) -> np.ndarray:
+    def deframe_data(self, framed_data: np.ndarray | PackedBits) -> np.ndarray | PackedBits:
         """
         Deframe the input framed data back into a single array.
         
         Parameters:
-        framed_data (np.ndarray): Framed data to be deframed.
+        framed_data (np.ndarray | PackedBits): Framed data to be deframed.
         
         Returns:
-        np.ndarray: Deframed data.
+        np.ndarray | PackedBits: Deframed data.
         """
+        if isinstance(framed_data, PackedBits):
+            return PackedBits.from_bits(self.deframe_data(framed_data.to_bits()))
         if not isinstance(framed_data, np.ndarray):
             raise ValueError("Framed data must be a numpy array.")
         
@@ -68,19 +74,74 @@ class BitsFlagFramer(Framer):
         
         deframed_data = framed_data[:]
 
-        # Add the inverse of the last flag bit where data matches the flag bits
-        windows = np.lib.stride_tricks.sliding_window_view(deframed_data, window_shape=len(self.flag_bits)-1)
-        matches = np.all(windows == self.flag_bits[:-1], axis=1)
-        indices = np.nonzero(matches)[0] + len(self.flag_bits)-1
+        # Bits that follow the flag prefix end a flag or were stuffed
+        indices = self.stuffer.decisions(deframed_data)
         # Check if an error made the flag apear in the bits sequence
-        after_indice_bits = np.take_along_axis(deframed_data, indices, axis=0) 
+        after_indice_bits = deframed_data[indices]
         after_indice = np.nonzero( after_indice_bits == self.flag_bits[-1])[0]
         if after_indice.size >= 2:
-            deframed_data = deframed_data[indices[after_indice[0]]+1 : indices[after_indice[1]] - 7]
+            deframed_data = deframed_data[indices[after_indice[0]]+1 : indices[after_indice[1]] - len(self.flag_bits) + 1]
             indices = indices[after_indice[0]+1:after_indice[1]] - indices[after_indice[0]]-1
         else:
             raise ValueError("Framed data does not include flag bits.")
         if indices.size != 0:
             deframed_data = np.delete(deframed_data, indices)
 
-        return deframed_data
\ No newline at end of file
+        return deframed_data
+
+    def deframe_stream(self, chunks: Iterable[np.ndarray | PackedBits]) -> Iterator[tuple[int, int, np.ndarray | PackedBits]]:
+        """
+        Deframe every frame of a long bit stream given in consecutive chunks.
+        Every flag closes the current frame and opens the next one, so frames
+        may share flags and idle flags between frames are skipped. Bits
+        before the first flag and an unfinished last frame are dropped.
+        
+        Parameters:
+        chunks (Iterable[np.ndarray | PackedBits]): Consecutive pieces of the stream.
+        
+        Returns:
+        Iterator[tuple[int, int, np.ndarray | PackedBits]]: For every frame, the
+            bit offset of its opening flag, the bit offset just after its closing
+            flag and the deframed data, in the form of the chunk that closed it.
+        """
+        prefix = len(self.flag_bits) - 1
+        # Last raw bits of the previous chunks: they may start a flag
+        held = np.zeros(0, dtype=np.uint8)
+        held_stuffed = np.zeros(0, dtype=bool)
+        held_begin = 0
+        in_frame = False
+        parts = []
+        frame_start = 0
+        offset = 0
+        for chunk in chunks:
+            bits = chunk.to_bits() if isinstance(chunk, PackedBits) else np.asarray(chunk).astype(np.uint8)
+            raw = np.concatenate((held, bits))
+            stuffed = np.concatenate((held_stuffed, np.zeros(bits.size, dtype=bool)))
+            base = offset - held.size
+            offset += bits.size
+
+            # Bits that follow the flag prefix are either a stuffed bit or the end of a flag
+            decisions = self.stuffer.decisions(raw)
+            decisions = decisions[decisions >= held.size]
+            is_flag = raw[decisions] == self.flag_bits[-1]
+            stuffed[decisions[~is_flag]] = True
+
+            begin = held_begin
+            for end in decisions[is_flag]:
+                if in_frame:
+                    flag_begin = end - prefix
+                    parts.append(raw[begin:flag_begin][~stuffed[begin:flag_begin]])
+                    frame = np.concatenate(parts)
+                    if frame.size:
+                        yield frame_start, base + end + 1, self.like_input(PackedBits.from_bits(frame), chunk)
+                in_frame = True
+                parts = []
+                frame_start = base + end - prefix
+                begin = end + 1
+
+            # Commit the bits that can no longer belong to a flag
+            keep = max(raw.size - prefix, 0)
+            if in_frame and begin < keep:
+                parts.append(raw[begin:keep][~stuffed[begin:keep]])
+            held, held_stuffed = raw[keep:], stuffed[keep:]
+            held_begin = max(begin - keep, 0)
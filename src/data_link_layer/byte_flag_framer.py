@@ -1,5 +1,6 @@
+from typing import Iterable, Iterator
 import numpy as np
-from .framer import Framer, ErrorDetector
+from .framer import Framer, ErrorDetector, PackedBits
 
 class ByteFlagFramer(Framer):
     """Byte Flag Framer for encapsulating data into frames with byte flagging."""
@@ -29,83 +30,168 @@ class ByteFlagFramer(Framer):
         self.flag_bits = self.uint8_to_bits(np.array([flag_byte]))
         self.escape_byte = escape_byte
 
-    def frame_data(self, data: np.ndarray) -> np.ndarray:
+    def frame_data(self, data: np.ndarray | PackedBits) -> np.ndarray | PackedBits:
         """
         Frame the input data into frames with byte flags.
+        The frame is built on the packed bytes; PackedBits are never unpacked.
         
         Parameters:
-        data (np.ndarray): Input bits to be framed.
+        data (np.ndarray | PackedBits): Input bits to be framed.
         
         Returns:
-        np.ndarray: Framed data.
+        np.ndarray | PackedBits: Framed data.
         """
-        if not isinstance(data, np.ndarray):
-            raise ValueError("Data must be a numpy array.")
-        
-        bytes_data = self.bits_to_uint8(data)
+        packed = self.as_packed(data)
+        if packed.size % 8 != 0:
+            raise ValueError("Bit sequence length must be a multiple of 8.")
 
         if self.error_detector is not None:
-            bits_data = self.uint8_to_bits(bytes_data)
-            bits_data = self.error_detector.add_trailer(bits_data)
-            bytes_data = self.bits_to_uint8(bits_data)
-
-        bytes_data = np.insert(bytes_data, np.nonzero(bytes_data == self.escape_byte)[0], self.escape_byte)
-        bytes_data = np.insert(bytes_data, np.nonzero(bytes_data == self.flag_byte)[0], self.escape_byte)
+            packed = self.error_detector.add_trailer(packed)
+        bytes_data = packed.data
 
+        # Insert an escape byte before every escape or flag byte of the data
+        special = np.nonzero((bytes_data == self.escape_byte) | (bytes_data == self.flag_byte))[0]
+        bytes_data = np.insert(bytes_data, special, self.escape_byte)
 
-        # Add flag bytes at the start and end
-        framed_data = np.concatenate(([self.flag_byte], bytes_data, [self.flag_byte]))
+        # Add flag bytes at the start and end, without leaving uint8
+        framed_data = np.empty(bytes_data.size + 2, dtype=np.uint8)
+        framed_data[0] = framed_data[-1] = self.flag_byte
+        framed_data[1:-1] = bytes_data
 
-        return self.uint8_to_bits(framed_data)
+        return self.like_input(PackedBits(framed_data), data)
 
-    def deframe_data(self, framed_data: np.ndarray) -> np.ndarray:
+    def deframe_data(self, framed_data: np.ndarray | PackedBits) -> np.ndarray | PackedBits:
         """
         Deframe the input framed data back into a single array.
         
         Parameters:
-        framed_data (np.ndarray): Framed data to be deframed.
+        framed_data (np.ndarray | PackedBits): Framed data to be deframed.
         
         Returns:
-        np.ndarray: Deframed data.
+        np.ndarray | PackedBits: Deframed data.
         """
-        if not isinstance(framed_data, np.ndarray):
-            raise ValueError("Framed data must be a numpy array.")
+        packed = self.as_packed(framed_data)
+        if packed.size % 8 != 0:
+            raise ValueError("Bit sequence length must be a multiple of 8.")
         
-        bytes_data = self.bits_to_uint8(framed_data)
+        bytes_data = packed.data
         
         # Remove flag bytes
         if bytes_data.size < 2:
             raise ValueError("Invalid frame: too small.")
+
+        starts = np.flatnonzero(bytes_data == self.flag_byte)
+        if starts.size == 0:
+            raise ValueError("Framed data does not include flags.")
+        body = bytes_data[starts[0] + 1:]
+
+        # Mask of the escape bytes; the byte after each one is escaped.
+        # The spare last entry is read for a flag right after the opening one
+        escapes = np.zeros(body.size + 1, dtype=bool)
+        escapes[self.escape_positions(body)] = True
+
+        # The frame ends at the first flag that is neither an escape nor escaped
+        ends = np.flatnonzero(body == self.flag_byte)
+        ends = ends[~escapes[ends] & ~escapes[ends - 1]]
+        if ends.size == 0:
+            raise ValueError("Framed data does not include flags.")
+
+        # Drop the escape bytes of the payload
+        deframed = body[:ends[0]][~escapes[:ends[0]]]
         
-        #bytes_data = bytes_data[1:-1]  # Exclude the flag bytes
-
-        # Remove escape bytes that follow escape or flag bytes
-        deframed = np.zeros(bytes_data.size - 2)
-
-        initialized = False
-        finished = False
-        was_escape = False
-        counter = 0
-        for i, byte in enumerate(bytes_data):
-            if not initialized:
-                if byte == self.flag_byte:
-                    initialized = True
-                continue
-            if not was_escape:
-                if byte == self.escape_byte:
-                    was_escape = True
-                    continue
-                if byte == self.flag_byte:
-                    finished = True
-                    deframed = deframed[:counter]
-                    break
-            deframed[counter] = byte
-            counter += 1
-            was_escape = False
+        return self.like_input(PackedBits(deframed), framed_data)
+
+    def deframe_stream(self, chunks: Iterable[np.ndarray | PackedBits]) -> Iterator[tuple[int, int, np.ndarray | PackedBits]]:
+        """
+        Deframe every frame of a long bit stream given in consecutive chunks.
+        Every unescaped flag closes the current frame and opens the next one,
+        so frames may share flags and idle flags between frames are skipped.
+        Bytes before the first flag and an unfinished last frame are dropped.
         
-        if not finished or not initialized:
-            raise ValueError("Framed data does not include flags.")
+        Parameters:
+        chunks (Iterable[np.ndarray | PackedBits]): Consecutive pieces of the
+                                                    stream, of any bit length.
         
-        deframed_bits = self.uint8_to_bits(deframed)
+        Returns:
+        Iterator[tuple[int, int, np.ndarray | PackedBits]]: For every frame, the
+            bit offset of its opening flag, the bit offset just after its closing
+            flag and the deframed data, in the form of the chunk that closed it.
+        """
+        in_frame = False
+        escaped_next = False
+        parts = []
+        frame_start = 0
+        offset = 0
+        for data, chunk in self._byte_chunks(chunks):
+            base = offset
+            offset += data.size
+            if not in_frame:
+                starts = np.flatnonzero(data == self.flag_byte)
+                if starts.size == 0:
+                    continue
+                in_frame = True
+                frame_start = base + starts[0]
+                data = data[starts[0] + 1:]
+                base += starts[0] + 1
+
+            if escaped_next and data.size:
+                # The first byte was escaped at the end of the previous chunk
+                parts.append(data[:1])
+                data = data[1:]
+                base += 1
+                escaped_next = False
+
+            escapes = np.zeros(data.size + 1, dtype=bool)
+            escapes[self.escape_positions(data)] = True
+            ends = np.flatnonzero(data == self.flag_byte)
+            ends = ends[~escapes[ends] & ~escapes[ends - 1]]
+
+            begin = 0
+            for end in ends:
+                parts.append(data[begin:end][~escapes[begin:end]])
+                frame = np.concatenate(parts)
+                if frame.size:
+                    yield 8 * frame_start, 8 * (base + end + 1), self.like_input(PackedBits(frame), chunk)
+                parts = []
+                frame_start = base + end
+                begin = end + 1
+
+            parts.append(data[begin:][~escapes[begin:data.size]])
+            if data.size:
+                escaped_next = data.size > begin and bool(escapes[data.size - 1])
+
+    @staticmethod
+    def _byte_chunks(chunks: Iterable[np.ndarray | PackedBits]) -> Iterator[tuple[np.ndarray, np.ndarray | PackedBits]]:
+        """Regroup bit chunks into whole bytes, keeping a trailing partial byte for the next chunk."""
+        pending = np.zeros(0, dtype=np.uint8)
+        for chunk in chunks:
+            if isinstance(chunk, PackedBits) and chunk.size % 8 == 0 and pending.size == 0:
+                yield chunk.data, chunk
+                continue
+            bits = np.concatenate((pending, Framer.as_packed(chunk).to_bits()))
+            whole = bits.size - bits.size % 8
+            pending = bits[whole:]
+            yield np.packbits(bits[:whole]), chunk
+
+    def escape_positions(self, data: np.ndarray) -> np.ndarray:
+        """
+        Find the escape bytes of byte-stuffed data. In a run of consecutive
+        escape bytes the first, third, ... escape the byte that follows them,
+        so the byte after the run is escaped when the run length is odd.
+        
+        Parameters:
+        data (np.ndarray): Stuffed bytes (uint8), starting after the opening flag.
         
-        return deframed_bits
\ No newline at end of file
+        Returns:
+        np.ndarray: Indices of the escape bytes.
+        """
+        positions = np.flatnonzero(data == self.escape_byte)
+        if positions.size == 0:
+            return positions
+
+        # Position of the first escape of the run each escape byte belongs to
+        run_start = np.ones(positions.size, dtype=bool)
+        run_start[1:] = np.diff(positions) != 1
+        first = np.maximum.accumulate(positions * run_start)
+
+        return positions[((positions - first) & 1) == 0]
@@ -1,4 +1,4 @@
-from .framer import Framer, ErrorDetector
+from .framer import Framer, ErrorDetector, PackedBits
 import numpy as np
 
 class CharCountingFramer(Framer):
@@ -23,53 +23,52 @@ class CharCountingFramer(Framer):
             raise ValueError("Counter size must be a positive integer.")
         self.counter_size = counter_size
 
-    def frame_data(self, data: np.ndarray) -> np.ndarray:
+    def frame_data(self, data: np.ndarray | PackedBits) -> np.ndarray | PackedBits:
         """
         Frame the input data into frames with character count.
+        The frame is built on the packed bytes; PackedBits are never unpacked.
         
         Parameters:
-        data (np.ndarray): Input bits to be framed.
+        data (np.ndarray | PackedBits): Input bits to be framed.
         
         Returns:
-        np.ndarray: Framed data.
+        np.ndarray | PackedBits: Framed data.
         """
-        if not isinstance(data, np.ndarray):
-            raise ValueError("Data must be a numpy array.")
-        
-        # Convert data to bits
-        bytes = self.bits_to_uint8(data)
+        packed = self.as_packed(data)
+        if packed.size % 8 != 0:
+            raise ValueError("Bit sequence length must be a multiple of 8.")
         
         if self.error_detector is not None:
-            bits = self.uint8_to_bits(bytes)
-            bits = self.error_detector.add_trailer(bits)
-            bytes = self.bits_to_uint8(bits)
+            packed = self.error_detector.add_trailer(packed)
+        bytes = packed.data
 
         # Create frame with character count
-        frame = np.concatenate(([bytes.size], bytes))
-        
+        frame = np.empty(bytes.size + 1, dtype=np.uint8)
+        frame[0] = bytes.size % 256
+        frame[1:] = bytes
         
-        return self.uint8_to_bits(frame)
+        return self.like_input(PackedBits(frame), data)
 
-    def deframe_data(self, framed_data: np.ndarray) -> np.ndarray:
+    def deframe_data(self, framed_data: np.ndarray | PackedBits) -> np.ndarray | PackedBits:
         """
         Deframe the input framed data back into a single array.
         
         Parameters:
-        framed_data (np.ndarray): Framed data to be deframed.
+        framed_data (np.ndarray | PackedBits): Framed data to be deframed.
         
         Returns:
-        np.ndarray: Deframed data.
+        np.ndarray | PackedBits: Deframed data.
         """
-        if not isinstance(framed_data, np.ndarray):
-            raise ValueError("Framed data must be a numpy array.")
+        packed = self.as_packed(framed_data)
+        if packed.size % 8 != 0:
+            raise ValueError("Bit sequence length must be a multiple of 8.")
         
-        bytes = self.bits_to_uint8(framed_data)
+        bytes = packed.data
         # Extract character count and bits
         char_count = bytes[0]
-        if char_count > bytes.size - 1:
-            bytes.resize(char_count+1)
         deframed = bytes[1:1 + char_count]
+        if char_count > deframed.size:
+            # Missing bytes are read as zeros
+            deframed = np.concatenate((deframed, np.zeros(char_count - deframed.size, dtype=np.uint8)))
 
-        deframed_bits = self.uint8_to_bits(deframed)
-
-        return deframed_bits
\ No newline at end of file
+        return self.like_input(PackedBits(deframed), framed_data)
\ No newline at end of file
@@ -1,5 +1,8 @@
+from typing import Iterable
 import numpy as np
 from .error_detector import ErrorDetector
+from .crc_stream import CRCModel, CRCStream, CRC_CATALOG
+from .packed_bits import PackedBits
 
 class CRCErrorDetector(ErrorDetector):
     """
@@ -7,108 +10,174 @@ class CRCErrorDetector(ErrorDetector):
     This class extends the ErrorDetector abstract base class and uses
     a specified generator polynomial to compute and verify CRC trailers.
     """
-    def __init__(self, poly:int=0x82608EDB, trailer_size=32) -> None:
+    def __init__(self, poly:int=0x82608EDB, trailer_size=32, model:str|None=None) -> None:
         """
         Initialize the CRC detector.
-        
+
         Parameters:
-        poly (int):     The generator polynomial, represented as an integer.
+        poly (int):     The generator polynomial, represented as an integer
+                        with the most significant (x^(trailer_size-1)) bit set.
                         Default is 0x82608EDB.
         trailer_size (int): The number of bits in the CRC trailer.
                         Default is 32 bits.
+        model (str | None): Name of a standard CRC from CRC_CATALOG
+                        (e.g. "CRC-32/ISO-HDLC"). When given, poly and
+                        trailer_size are taken from the catalog and the
+                        trailer is the standard CRC of the message.
         """
         super().__init__()
+        if model is not None:
+            if model not in CRC_CATALOG:
+                raise ValueError(f"Unknown CRC model: {model}.")
+            self.model = CRC_CATALOG[model]
+            self.trailer_size = self.model.width
+            self.poly = self.model.poly
+            return
+
+        if not poly & (1 << (trailer_size - 1)):
+            raise ValueError(f"Generator polynomial must have bit {trailer_size - 1} set.")
         self.trailer_size = trailer_size
         self.poly = poly
+        self.model = None
+        # The bitwise division reduces by poly * x, whose x^trailer_size term is implicit
+        self._division = CRCModel("poly", trailer_size, (poly << 1) & ((1 << trailer_size) - 1))
+
+    def new(self) -> CRCStream:
+        """
+        Create an incremental CRC stream configured like this detector.
+        For the raw polynomial mode the digest is the division remainder
+        of the message, before the final reduction step.
+        """
+        return CRCStream(self.model if self.model is not None else self._division)
 
-    def crc(self, data: np.ndarray) -> np.int64:
+    def crc(self, data: np.ndarray | PackedBits) -> np.int64:
         """
         Compute the CRC value over the input bitstream.
-        
-        The algorithm performs a bitwise division by the generator polynomial.
-        
+
+        The algorithm performs a table-driven, byte-wise division by the
+        generator polynomial. The message bits are packed into bytes and
+        the last trailer_size bits are added to the remainder at the end.
+        In catalog mode it is the standard CRC of the whole input.
+
         Parameters:
-        data (np.ndarray): Bit array (uint8) containing both message and trailer bits.
-        
+        data (np.ndarray | PackedBits): Bits containing both message and trailer bits.
+
         Returns:
         np.int64: The computed CRC value as a signed 64-bit integer.
         """
-        # Initialize CRC from the first trailer_size bits as integer
-        crc =  np.int64(
-            data[:self.trailer_size]
-            .dot(2**np.arange(self.trailer_size, dtype=np.uint64)[::-1])
-            )
-        # Process the rest of the bits
-        for b in data[self.trailer_size:]:
-            if crc & (1 << (self.trailer_size-1)):
-                crc ^= self.poly
-            crc <<= 1
-            crc |= b
-        # Final reduction step
-        if crc & (1 << (self.trailer_size-1)):
-            crc ^= self.poly
-        return crc
-
-    def add_trailer(self, data: np.ndarray) -> np.ndarray:
+        stream = self.new()
+        if self.model is not None:
+            stream.update(data)
+            return np.int64(np.uint64(stream.digest()).view(np.int64))
+
+        stream.update(data[:data.size - self.trailer_size])
+        return self._reduce(stream.digest() ^ CRCStream.from_bits(data[data.size - self.trailer_size:]))
+
+    def _reduce(self, remainder: int) -> np.int64:
+        """Final reduction step of the raw polynomial mode."""
+        if remainder & (1 << (self.trailer_size-1)):
+            remainder ^= self.poly
+        return np.int64(remainder)
+
+    def add_trailer(self, data: np.ndarray | PackedBits) -> np.ndarray | PackedBits:
         """
         Append a CRC trailer to the input data.
-        
+
         Computes the CRC over the message bits and appends the trailer bits
         (derived from the CRC value) to the end of the message.
-        
+
         Parameters:
-        data (np.ndarray): Input data as a binary array. Must be at least
-                           trailer_size bits long.
-        
+        data (np.ndarray | PackedBits): Input data as a binary array. Must be
+                           at least trailer_size bits long.
+
         Returns:
-        np.ndarray: New array containing the original data followed by the
-                    CRC trailer bits.
-        
+        np.ndarray | PackedBits: New bits of the same kind containing the
+                    original data followed by the CRC trailer bits.
+
         Raises:
         ValueError: If the input data has fewer bits than trailer_size.
         """
         if data.size < self.trailer_size:
             raise ValueError(f"Data must be at least {self.trailer_size} bits long")
-        
-        bits = np.concatenate((data, np.zeros(self.trailer_size))).astype(np.uint8)
-        crc = self.crc(bits)
-        bits[-self.trailer_size:] += np.unpackbits(np.array([ b for b in crc.tobytes()[::-1] ], dtype=np.uint8))[-self.trailer_size:]
-        return bits
-    
-    def check(self, data: np.ndarray) -> str:
+
+        stream = self.new()
+        stream.update(data)
+        crc = stream.digest() if self.model is not None else int(self._reduce(stream.digest()))
+        if isinstance(data, PackedBits):
+            return data.append(CRCStream.to_bits(crc, self.trailer_size))
+        return np.concatenate((data, CRCStream.to_bits(crc, self.trailer_size))).astype(np.uint8)
+
+    def check(self, data: np.ndarray | PackedBits) -> str:
         """
         Verify the CRC of a received data block.
-        
+
         Recomputes the CRC over the entire block (message + trailer). If the
-        result is non-zero, an error is detected.
-        
+        result is non-zero, an error is detected. In catalog mode the CRC of
+        the message is compared with the trailer instead.
+
         Parameters:
-        data (np.ndarray): Data array with CRC trailer bits at the end.
-        
+        data (np.ndarray | PackedBits): Data with CRC trailer bits at the end.
+
         Returns:
         str: Empty string if no error detected; otherwise, an error message
              containing the computed CRC in binary.
         """
-        if data.size < self.trailer_size:
+        if isinstance(data, PackedBits):
+            split = max(data.size - self.trailer_size, 0)
+            stream = self.new()
+            stream.update(data[:split])
+            return self._verify(stream, data[split:])
+        return self.check_stream([data])
+
+    def check_stream(self, chunks: Iterable[np.ndarray]) -> str:
+        """
+        Verify the CRC of a data block received in chunks, without
+        concatenating them. The last trailer_size bits are held back as
+        the trailer while the rest is fed to an incremental CRC stream.
+
+        Parameters:
+        chunks (Iterable[np.ndarray]): Consecutive pieces of the data block,
+                                       with the CRC trailer bits at the end.
+
+        Returns:
+        str: Empty string if no error detected; otherwise, an error message
+             containing the computed CRC in binary.
+        """
+        stream = self.new()
+        tail = np.zeros(0, dtype=np.uint8)
+        for chunk in chunks:
+            buffer = np.concatenate((tail, chunk)) if tail.size else np.asarray(chunk)
+            split = max(buffer.size - self.trailer_size, 0)
+            stream.update(buffer[:split])
+            tail = buffer[split:]
+        return self._verify(stream, tail)
+
+    def _verify(self, stream: CRCStream, tail: np.ndarray | PackedBits) -> str:
+        """Compare the CRC of the message fed to stream with the trailer bits."""
+        if tail.size < self.trailer_size:
             return f"Data must be at least {self.trailer_size} bits long"
-        
-        if (crc := self.crc(data)) != 0:
+
+        trailer = CRCStream.from_bits(tail)
+        if self.model is not None:
+            if (crc := stream.digest()) != trailer:
+                return f"CRC does not match the trailer. CRC: {crc:b}b"
+        elif (crc := self._reduce(stream.digest() ^ trailer)) != 0:
             return f"CRC is not equal zero. CRC: {crc:b}b"
         return ""
-    
-    def remove_trailer(self, data: np.ndarray) -> np.ndarray:
+
+    def remove_trailer(self, data: np.ndarray | PackedBits) -> np.ndarray | PackedBits:
         """
         Remove the CRC trailer bits from the data.
-        
+
         Parameters:
         data (np.ndarray): Data array with CRC trailer bits at the end.
-        
+
         Returns:
         np.ndarray: Original message data without the CRC trailer.
-        
+
         Raises:
         ValueError: If the input data has fewer bits than trailer_size.
         """
         if data.size < self.trailer_size:
             raise ValueError("No data given.")
-        return data[:-self.trailer_size]
\ No newline at end of file
+        return data[:-self.trailer_size]
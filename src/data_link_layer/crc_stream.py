@@ -0,0 +1,160 @@
+from typing import NamedTuple
+import numpy as np
+from .crc_table import CRCTable
+from .packed_bits import PackedBits
+
+class CRCModel(NamedTuple):
+    """
+    Parameters of a CRC in the Rocksoft/Williams model.
+
+    poly is given in normal notation, without the implicit x^width term.
+    check is the CRC of the ASCII string "123456789".
+    """
+    name: str
+    width: int
+    poly: int
+    init: int = 0
+    refin: bool = False
+    refout: bool = False
+    xorout: int = 0
+    check: int | None = None
+
+
+CRC_CATALOG = {
+    "CRC-8": CRCModel("CRC-8/SMBUS", 8, 0x07, check=0xF4),
+    "CRC-8/MAXIM-DOW": CRCModel("CRC-8/MAXIM-DOW", 8, 0x31, refin=True, refout=True, check=0xA1),
+    "CRC-16/CCITT": CRCModel("CRC-16/KERMIT", 16, 0x1021, refin=True, refout=True, check=0x2189),
+    "CRC-16/CCITT-FALSE": CRCModel("CRC-16/IBM-3740", 16, 0x1021, init=0xFFFF, check=0x29B1),
+    "CRC-16/XMODEM": CRCModel("CRC-16/XMODEM", 16, 0x1021, check=0x31C3),
+    "CRC-16/ARC": CRCModel("CRC-16/ARC", 16, 0x8005, refin=True, refout=True, check=0xBB3D),
+    "CRC-32/ISO-HDLC": CRCModel("CRC-32/ISO-HDLC", 32, 0x04C11DB7, init=0xFFFFFFFF, refin=True, refout=True,
+                                xorout=0xFFFFFFFF, check=0xCBF43926),
+    "CRC-32/BZIP2": CRCModel("CRC-32/BZIP2", 32, 0x04C11DB7, init=0xFFFFFFFF, xorout=0xFFFFFFFF, check=0xFC891918),
+    "CRC-32C": CRCModel("CRC-32/ISCSI", 32, 0x1EDC6F41, init=0xFFFFFFFF, refin=True, refout=True,
+                        xorout=0xFFFFFFFF, check=0xE3069283),
+    "CRC-64/XZ": CRCModel("CRC-64/XZ", 64, 0x42F0E1EBA9EA3693, init=0xFFFFFFFFFFFFFFFF, refin=True, refout=True,
+                          xorout=0xFFFFFFFFFFFFFFFF, check=0x995DC9BBDF1939FA),
+}
+# Aliases under their catalogue names
+CRC_CATALOG.update({model.name: model for model in list(CRC_CATALOG.values())})
+CRC_CATALOG["CRC-32"] = CRC_CATALOG["CRC-32/ISO-HDLC"]
+
+# Bit-reversed value of every byte, used for reflected input
+_REFLECTED_BYTES = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1)[:, ::-1]
+_REFLECTED_BYTES = np.packbits(_REFLECTED_BYTES, axis=1).ravel()
+
+
+class CRCStream:
+    """
+    Incremental CRC computation over a bit stream.
+
+    Bits can be fed in chunks of any size with update(); digest() returns
+    the CRC of everything fed so far without ending the stream. Lookup
+    tables are shared by every stream with the same (poly, width).
+    """
+    def __init__(self, model: CRCModel | str) -> None:
+        """
+        Initialize the stream.
+
+        Parameters:
+        model (CRCModel | str): CRC parameters or a name from CRC_CATALOG.
+        """
+        if isinstance(model, str):
+            if model not in CRC_CATALOG:
+                raise ValueError(f"Unknown CRC model: {model}.")
+            model = CRC_CATALOG[model]
+
+        self.model = model
+        self.table = CRCTable.get(model.poly, model.width)
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all the data fed so far."""
+        self.register = self.model.init
+        self.pending = np.zeros(0, dtype=np.uint8)
+        self.size = 0
+
+    def copy(self) -> "CRCStream":
+        """Return an independent stream with the same state."""
+        other = CRCStream(self.model)
+        other.register = self.register
+        other.pending = self.pending.copy()
+        other.size = self.size
+        return other
+
+    def update(self, bits: np.ndarray | PackedBits) -> None:
+        """
+        Feed the next chunk of bits. Whole bytes are processed immediately,
+        a trailing partial byte is kept until the next chunk. Packed bits
+        on a byte boundary are processed without unpacking.
+
+        Parameters:
+        bits (np.ndarray | PackedBits): Bit array, most significant bit of each byte first.
+        """
+        if isinstance(bits, PackedBits):
+            if self.pending.size:
+                bits = bits.to_bits()
+            else:
+                whole = bits.size // 8
+                self.size += 8 * whole
+                self._update_bytes(bits.data[:whole])
+                bits = bits[8 * whole:].to_bits()
+
+        bits = np.asarray(bits).astype(np.uint8)
+        self.size += bits.size
+        if self.pending.size:
+            bits = np.concatenate((self.pending, bits))
+
+        whole = bits.size - bits.size % 8
+        self.pending = bits[whole:].copy()
+        if whole:
+            self._update_bytes(np.packbits(bits[:whole]))
+
+    def _update_bytes(self, data: np.ndarray) -> None:
+        """Feed whole bytes to the register."""
+        if data.size:
+            if self.model.refin:
+                data = _REFLECTED_BYTES[data]
+            self.register = self.table.remainder(data, self.register)
+
+    def digest(self) -> int:
+        """
+        Return the CRC of all the bits fed so far.
+
+        Raises:
+        ValueError: If a reflected CRC was fed a partial byte.
+        """
+        register = self.register
+        if self.pending.size:
+            if self.model.refin:
+                raise ValueError("Reflected CRCs require whole bytes.")
+            top = 1 << (self.model.width - 1)
+            mask = (1 << self.model.width) - 1
+            for b in self.pending.tolist():
+                feedback = bool(register & top) ^ bool(b)
+                register = (register << 1) & mask
+                if feedback:
+                    register ^= self.model.poly
+
+        if self.model.refout:
+            register = int(f"{register:0{self.model.width}b}"[::-1], 2)
+        return register ^ self.model.xorout
+
+    def digest_bits(self) -> np.ndarray:
+        """Return the CRC of all the bits fed so far as a bit array (MSB first)."""
+        return self.to_bits(self.digest(), self.model.width)
+
+    @staticmethod
+    def to_bits(value: int, width: int) -> np.ndarray:
+        """Convert an integer into width bits, most significant first."""
+        size = (width + 7) // 8
+        bits = np.unpackbits(np.frombuffer(value.to_bytes(size, "big"), dtype=np.uint8))
+        return bits[8 * size - width:]
+
+    @staticmethod
+    def from_bits(bits: np.ndarray | PackedBits) -> int:
+        """Convert a bit array, most significant first, into an integer."""
+        if isinstance(bits, PackedBits):
+            return int.from_bytes(bits.tobytes(), "big") >> (-bits.size % 8)
+        bits = np.asarray(bits).astype(np.uint8)
+        return int.from_bytes(np.packbits(bits).tobytes(), "big") >> (-bits.size % 8)
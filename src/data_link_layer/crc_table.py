@@ -0,0 +1,151 @@
+from functools import lru_cache
+import numpy as np
+
+class CRCTable:
+    """
+    Precomputed lookup tables for a table-driven (byte-wise) CRC engine.
+
+    The engine works on packed bytes, MSB first, and computes the
+    remainder of message * x^width modulo the generator polynomial.
+    Long messages are split into interleaved blocks that are reduced in
+    parallel with the 256-entry table and then merged with shift tables,
+    so the number of interpreter steps grows with the square root of the
+    message size instead of its number of bits.
+
+    Instances are immutable and shared: use CRCTable.get(poly, width).
+    """
+    SERIAL_LIMIT = 1024
+    MAX_BLOCK_SIZE = 4096
+
+    def __init__(self, poly: int, width: int) -> None:
+        """
+        Build the tables for a generator polynomial.
+
+        Parameters:
+        poly (int):  Generator polynomial in normal notation, without the
+                     implicit x^width term.
+        width (int): Degree of the generator polynomial (CRC size in bits).
+        """
+        if not (1 <= width <= 64):
+            raise ValueError("CRC width must be between 1 and 64 bits.")
+
+        self.poly = poly & ((1 << width) - 1)
+        self.width = width
+        # Widths below 8 bits are processed left aligned in an 8-bit register
+        self.register_width = max(width, 8)
+        self.align = self.register_width - width
+        self.mask = (1 << self.register_width) - 1
+        self.lanes = (self.register_width + 7) // 8
+
+        reg_poly = self.poly << self.align
+        top = 1 << (self.register_width - 1)
+        table = []
+        for byte in range(256):
+            reg = byte << (self.register_width - 8)
+            for _ in range(8):
+                reg = ((reg << 1) ^ reg_poly) if reg & top else (reg << 1)
+            table.append(reg & self.mask)
+
+        self.table_list = table
+        self.table = np.array(table, dtype=np.uint64)
+        self.table.flags.writeable = False
+        self._shift_tables = {}
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def get(cls, poly: int, width: int) -> "CRCTable":
+        """Return the shared table set for (poly, width), building it once."""
+        return cls(poly, width)
+
+    def remainder(self, data: np.ndarray, init: int = 0) -> int:
+        """
+        Run the table-driven CRC register over packed bytes.
+
+        Parameters:
+        data (np.ndarray): Message bytes (uint8), most significant bit first.
+        init (int):        Register value before the first byte.
+
+        Returns:
+        int: (init * x^(8*len(data)) + data * x^width) mod poly.
+        """
+        data = np.asarray(data, dtype=np.uint8)
+        reg = (init << self.align) & self.mask
+
+        if data.size < self.SERIAL_LIMIT:
+            return self._remainder_serial(data, reg) >> self.align
+
+        # Fold the initial register into the first message bytes
+        if reg:
+            data = data.copy()
+            head = reg << (8 * self.lanes - self.register_width)
+            data[:self.lanes] ^= np.frombuffer(head.to_bytes(self.lanes, "big"), dtype=np.uint8)
+
+        # Balance the column loop against the number of blocks (powers of two)
+        block_size = min(1 << (data.size.bit_length() // 2), self.MAX_BLOCK_SIZE)
+
+        # Leading zero bytes do not change the remainder when init is zero
+        padding = -data.size % block_size
+        if padding:
+            data = np.concatenate((np.zeros(padding, dtype=np.uint8), data))
+        blocks = data.reshape(-1, block_size)
+
+        regs = np.zeros(blocks.shape[0], dtype=np.uint64)
+        mask = np.uint64(self.mask)
+        eight = np.uint64(8)
+        top_shift = np.uint64(self.register_width - 8)
+        for column in blocks.T:
+            index = ((regs >> top_shift) ^ column) & np.uint64(0xFF)
+            regs = ((regs << eight) & mask) ^ self.table[index]
+
+        # Merge neighbouring blocks: left * x^(8*length) + right
+        length = block_size
+        while regs.size > 1:
+            if regs.size % 2:
+                regs = np.concatenate((np.zeros(1, dtype=np.uint64), regs))
+            pairs = regs.reshape(-1, 2)
+            regs = self._shift(pairs[:, 0], length) ^ pairs[:, 1]
+            length *= 2
+
+        return int(regs[0]) >> self.align
+
+    def _remainder_serial(self, data: np.ndarray, reg: int) -> int:
+        """Byte-at-a-time table lookup for short messages."""
+        table = self.table_list
+        mask = self.mask
+        top_shift = self.register_width - 8
+        for byte in data.tolist():
+            reg = ((reg << 8) & mask) ^ table[((reg >> top_shift) ^ byte) & 0xFF]
+        return reg
+
+    def _shift(self, regs: np.ndarray, length: int) -> np.ndarray:
+        """Multiply registers by x^(8*length) modulo the polynomial."""
+        tables = self._shift_table(length)
+        result = np.zeros_like(regs)
+        for lane in range(self.lanes):
+            result ^= tables[lane][(regs >> np.uint64(8 * lane)) & np.uint64(0xFF)]
+        return result
+
+    def _shift_table(self, length: int) -> np.ndarray:
+        """
+        Per-byte-lane tables of the linear map reg -> reg * x^(8*length),
+        for power of two lengths. Each table is derived from the previous power.
+        """
+        if length in self._shift_tables:
+            return self._shift_tables[length]
+
+        basis = np.array([1 << bit for bit in range(self.register_width)], dtype=np.uint64)
+        if length == 1:
+            top_shift = np.uint64(self.register_width - 8)
+            images = ((basis << np.uint64(8)) & np.uint64(self.mask)) ^ self.table[basis >> top_shift]
+        else:
+            images = self._shift(self._shift(basis, length // 2), length // 2)
+
+        images = np.concatenate((images, np.zeros(8 * self.lanes - images.size, dtype=np.uint64)))
+        byte_bits = ((np.arange(256)[:, None] >> np.arange(8)) & 1).astype(bool)
+        tables = np.stack([
+            np.bitwise_xor.reduce(np.where(byte_bits, images[8 * lane:8 * lane + 8], np.uint64(0)), axis=1)
+            for lane in range(self.lanes)
+        ])
+        tables.flags.writeable = False
+        self._shift_tables[length] = tables
+        return tables
@@ -1,11 +1,14 @@
 from abc import ABC, abstractmethod
 import numpy as np
 from .error_detector import ErrorDetector
+from .packed_bits import PackedBits
 
 class Framer:
     """Abstract base class for data framers.
     This class defines the interface for framing tecniques.
-    It includes methods for framing and deframing bit sequences."""
+    It includes methods for framing and deframing bit sequences.
+    Bit sequences are either arrays with one bit per element or PackedBits;
+    results are returned in the same form as the input."""
     def __init__(self, error_detector:ErrorDetector|None = None):
         """
         Initialize the framer with an optional error detector.
@@ -17,7 +20,7 @@ class Framer:
         """
         self.error_detector = error_detector
 
-    def add_edc(self, data: np.ndarray) -> np.ndarray:
+    def add_edc(self, data: np.ndarray | PackedBits) -> np.ndarray | PackedBits:
         """
         Add error detection code to the data.
         """
@@ -25,7 +28,7 @@ class Framer:
             return self.error_detector.add_trailer(data)
         return data
 
-    def check_edc(self, data: np.ndarray) -> str:
+    def check_edc(self, data: np.ndarray | PackedBits) -> str:
         """
         Check if the data has an error detection code.
         """
@@ -33,7 +36,7 @@ class Framer:
             return self.error_detector.check(data)
         return ""
 
-    def remove_edc(self, data: np.ndarray) -> np.ndarray:
+    def remove_edc(self, data: np.ndarray | PackedBits) -> np.ndarray | PackedBits:
         """
         Remove error detection code from the data.
         """
@@ -42,28 +45,28 @@ class Framer:
         return data
 
     @abstractmethod
-    def frame_data(self, data: np.ndarray) -> np.ndarray:
+    def frame_data(self, data: np.ndarray | PackedBits) -> np.ndarray | PackedBits:
         """
         Frame the input data into frames.
         
         Parameters:
-        data (np.ndarray): Input data to be framed.
+        data (np.ndarray | PackedBits): Input data to be framed.
         
         Returns:
-        np.ndarray: Framed data.
+        np.ndarray | PackedBits: Framed data.
         """
         pass
 
     @abstractmethod
-    def deframe_data(self, framed_data: np.ndarray) -> np.ndarray:
+    def deframe_data(self, framed_data: np.ndarray | PackedBits) -> np.ndarray | PackedBits:
         """
         Deframe the input framed data back into a single array.
         
         Parameters:
-        framed_data (np.ndarray): Framed data to be deframed.
+        framed_data (np.ndarray | PackedBits): Framed data to be deframed.
         
         Returns:
-        np.ndarray: Deframed data.
+        np.ndarray | PackedBits: Deframed data.
         """
         pass
     
@@ -93,4 +96,29 @@ class Framer:
         """
         if len(bits) % 8 != 0:
             raise ValueError("Bit sequence length must be a multiple of 8.")
-        return np.packbits(bits.reshape(-1, 8)).astype(np.uint8)
\ No newline at end of file
+        return np.packbits(bits.reshape(-1, 8)).astype(np.uint8)
+
+    @staticmethod
+    def as_packed(data: np.ndarray | PackedBits) -> PackedBits:
+        """
+        Return the input bits as PackedBits, packing bit arrays.
+        
+        Parameters:
+        data (np.ndarray | PackedBits): Bit sequence.
+        
+        Returns:
+        PackedBits: The same bits, packed.
+        """
+        if isinstance(data, PackedBits):
+            return data
+        if not isinstance(data, np.ndarray):
+            raise ValueError("Data must be a numpy array or PackedBits.")
+        return PackedBits.from_bits(data)
+
+    @staticmethod
+    def like_input(result: PackedBits, data: np.ndarray | PackedBits) -> np.ndarray | PackedBits:
+        """
+        Return result in the form of the input data: PackedBits stay packed,
+        otherwise the bits are unpacked into a uint8 array.
+        """
+        return result if isinstance(data, PackedBits) else result.to_bits()
\ No newline at end of file
@@ -0,0 +1,213 @@
+import numpy as np
+from .packed_bits import PackedBits
+
+class HammingBlockCorrector:
+    """
+    Hamming code applied to consecutive blocks of k data bits. Each block is
+    encoded into a systematic codeword of n bits, the data followed by the
+    n - k parity bits, so a message corrects one error per block instead of
+    one error in total. The last block is padded with zero data bits.
+
+    Encoding and syndromes are matrix products mod 2 over the (blocks, k)
+    and (blocks, n) views of the message, and the error position of each
+    block is read from a syndrome lookup table. With secded=True every
+    parity-check column has odd weight (Hsiao code): single errors are
+    corrected and double errors, whose syndromes have even weight, are
+    detected and left uncorrected.
+    """
+    # Codes offered by name, as (n, k, secded)
+    CODES = {
+        "(7,4)": (7, 4, False),
+        "(15,11)": (15, 11, False),
+        "SECDED (72,64)": (72, 64, True),
+    }
+
+    # Syndrome table entries that are not bit positions
+    NO_ERROR = -1
+    UNCORRECTABLE = -2
+
+    def __init__(self, n: int = 7, k: int = 4, secded: bool = False):
+        """
+        Initialize the code.
+
+        Parameters:
+        n (int): Codeword size in bits.
+        k (int): Data bits per codeword.
+        secded (bool): Also detect double errors in each codeword.
+        """
+        r = n - k
+        if k < 1 or r < 2:
+            raise ValueError("Codeword must have at least 1 data bit and 2 parity bits.")
+        if r > 16:
+            raise ValueError("Codes with more than 16 parity bits are not supported.")
+
+        # Data columns of the parity-check matrix: non-zero values that are
+        # not unit vectors (the parity columns), lightest first
+        weights = np.array([bin(value).count("1") for value in range(2**r)])
+        candidates = np.flatnonzero(weights > 1)
+        if secded:
+            candidates = candidates[weights[candidates] % 2 == 1]
+        candidates = candidates[np.argsort(weights[candidates], kind="stable")]
+        if candidates.size < k:
+            raise ValueError(f"A ({n},{k}) code needs more parity bits.")
+        columns = np.concatenate((candidates[:k], 1 << np.arange(r)))
+
+        self.n = n
+        self.k = k
+        self.secded = secded
+        # (k, r): parity bit j of a block is the XOR of the data bits in column j
+        self.parity_matrix = ((columns[:k, None] >> np.arange(r)) & 1).astype(np.uint8)
+        # (k, n) generator matrix [I | P] and (r, n) parity-check matrix [P^T | I]
+        self.generator = np.concatenate((np.eye(k, dtype=np.uint8), self.parity_matrix), axis=1)
+        self.parity_check = np.concatenate((self.parity_matrix.T, np.eye(r, dtype=np.uint8)), axis=1)
+        self.syndrome_weights = 1 << np.arange(r)
+        # float32 copies for the products: BLAS is exact for sums below 2**24
+        self._parity_columns = self.parity_matrix.astype(np.float32)
+        self._check_columns = self.parity_check.T.astype(np.float32)
+        self._weights = self.syndrome_weights.astype(np.float32)
+
+        # Position of the flipped bit for each syndrome
+        self.syndrome_table = np.full(2**r, self.UNCORRECTABLE, dtype=np.int64)
+        self.syndrome_table[0] = self.NO_ERROR
+        self.syndrome_table[columns] = np.arange(n)
+
+    @classmethod
+    def from_name(cls, name: str) -> "HammingBlockCorrector":
+        """Create one of the codes in CODES."""
+        if name not in cls.CODES:
+            raise ValueError(f"Unknown Hamming code: {name}.")
+        return cls(*cls.CODES[name])
+
+    def encode(self, bits: np.ndarray) -> np.ndarray:
+        """
+        Encode the data, padding the last block with zeros.
+
+        Parameters:
+        bits (np.ndarray): Data bits.
+
+        Returns:
+        np.ndarray: Codewords, n bits per block of k data bits (uint8).
+        """
+        bits = np.asarray(bits).reshape(-1)
+        num_blocks = -(-bits.size // self.k)
+        data = np.zeros(num_blocks * self.k, dtype=np.uint8)
+        data[:bits.size] = bits
+        data = data.reshape(num_blocks, self.k)
+        parity = self._product_mod2(data, self._parity_columns)
+        return np.concatenate((data, parity), axis=1).reshape(-1)
+
+    def syndromes(self, bits: np.ndarray) -> np.ndarray:
+        """
+        Compute the syndrome of each whole codeword. Bits after the last
+        whole codeword are ignored.
+
+        Parameters:
+        bits (np.ndarray): Codeword bits.
+
+        Returns:
+        np.ndarray: One syndrome per codeword, as an integer.
+        """
+        return self._syndromes(self._codewords(np.asarray(bits)))
+
+    def decode(self, bits: np.ndarray, num_data_bits: int | None = None) -> tuple[np.ndarray, int, int]:
+        """
+        Correct the codewords and extract the data bits.
+
+        Parameters:
+        bits (np.ndarray): Codeword bits.
+        num_data_bits (int | None): Size of the encoded data, to drop the
+                                    padding of the last block; kept if None.
+
+        Returns:
+        tuple[np.ndarray, int, int]: Data bits (uint8), number of corrected
+        codewords and number of codewords with detected but uncorrectable errors.
+        """
+        codewords = self._codewords(np.array(bits, dtype=np.uint8))
+        positions = self._correct(codewords)
+        return (codewords[:, :self.k].reshape(-1)[:num_data_bits], int(np.count_nonzero(positions >= 0)),
+                int(np.count_nonzero(positions == self.UNCORRECTABLE)))
+
+    def add_error_detection(self, bits: np.ndarray | PackedBits) -> np.ndarray | PackedBits:
+        """
+        Encode the data (see encode).
+
+        Parameters:
+        bits (np.ndarray | PackedBits): Data bits.
+
+        Returns:
+        np.ndarray | PackedBits: Codeword bits, packed if the input was.
+        """
+        if isinstance(bits, PackedBits):
+            return PackedBits.from_bits(self.encode(bits.to_bits()))
+        return self.encode(bits)
+
+    def remove_error_detection(self, bits: np.ndarray | PackedBits,
+                               num_data_bits: int | None = None) -> np.ndarray | PackedBits:
+        """
+        Remove the parity bits of every whole codeword.
+
+        Parameters:
+        bits (np.ndarray | PackedBits): Codeword bits.
+        num_data_bits (int | None): Size of the encoded data, to drop the
+                                    padding of the last block; kept if None.
+
+        Returns:
+        np.ndarray | PackedBits: Data bits, packed if the input was.
+        """
+        if isinstance(bits, PackedBits):
+            return PackedBits.from_bits(self.remove_error_detection(bits.to_bits(), num_data_bits))
+        return self._codewords(np.asarray(bits))[:, :self.k].reshape(-1)[:num_data_bits]
+
+    def correct_errors(self, bits: np.ndarray | PackedBits) -> np.ndarray | PackedBits:
+        """
+        Correct one error in each codeword. Codewords with uncorrectable
+        errors and bits after the last whole codeword are left unchanged.
+
+        Parameters:
+        bits (np.ndarray | PackedBits): Codeword bits.
+
+        Returns:
+        np.ndarray | PackedBits: Corrected bits (a copy), packed if the input was.
+        """
+        if isinstance(bits, PackedBits):
+            return PackedBits.from_bits(self.correct_errors(bits.to_bits()))
+        bits = np.array(bits, dtype=np.uint8).reshape(-1)
+        self._correct(self._codewords(bits))
+        return bits
+
+    def check_errors(self, bits: np.ndarray | PackedBits) -> bool:
+        """
+        Check if any codeword has a non-zero syndrome.
+
+        Parameters:
+        bits (np.ndarray | PackedBits): Codeword bits.
+
+        Returns:
+        bool: True if errors were detected, False otherwise.
+        """
+        if isinstance(bits, PackedBits):
+            bits = bits.to_bits()
+        return bool(np.any(self.syndromes(bits)))
+
+    def _codewords(self, bits: np.ndarray) -> np.ndarray:
+        """View of the whole codewords in bits as a (blocks, n) array."""
+        bits = bits.reshape(-1)
+        num_blocks = bits.size // self.n
+        return bits[:num_blocks * self.n].reshape(num_blocks, self.n)
+
+    @staticmethod
+    def _product_mod2(bits: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+        """Matrix product mod 2 of a bit array and a float32 0/1 matrix (uint8)."""
+        return (bits.astype(np.float32) @ matrix).astype(np.uint8) & 1
+
+    def _syndromes(self, codewords: np.ndarray) -> np.ndarray:
+        """Syndrome of each row of a (blocks, n) array, as an integer."""
+        bits = self._product_mod2(codewords, self._check_columns)
+        return (bits @ self._weights).astype(np.int64)
+
+    def _correct(self, codewords: np.ndarray) -> np.ndarray:
+        """Flip the erroneous bit of each codeword in place; return the table entries."""
+        positions = self.syndrome_table[self._syndromes(codewords)]
+        rows = np.flatnonzero(positions >= 0)
+        codewords[rows, positions[rows]] ^= 1
+        return positions
@@ -0,0 +1,54 @@
+from functools import lru_cache
+import numpy as np
+
+class HammingLayout:
+    """
+    Positions of a Hamming codeword of a given size, with parity bits at the
+    power-of-two positions (counting from 1) and data bits everywhere else.
+
+    Parity bit i covers the positions whose number has bit i set, so the
+    syndrome of a codeword is the XOR of the numbers of its set positions:
+    a masked XOR-reduce over `numbers`. Layouts are immutable and shared
+    per codeword size.
+    """
+    def __init__(self, size: int):
+        """
+        Build the layout.
+
+        Parameters:
+        size (int): Codeword size in bits.
+        """
+        self.size = size
+        # Position numbers, counting from 1; the smallest type that holds them
+        self.numbers = np.arange(1, size + 1, dtype=np.min_scalar_type(size))
+        is_parity = (self.numbers & (self.numbers - 1)) == 0
+        self.parity_positions = np.flatnonzero(is_parity)
+        self.data_positions = np.flatnonzero(~is_parity)
+        for array in (self.numbers, self.parity_positions, self.data_positions):
+            array.flags.writeable = False
+
+    @classmethod
+    @lru_cache(maxsize=64)
+    def get(cls, size: int) -> "HammingLayout":
+        """Return the shared layout for a codeword size, building it once."""
+        return cls(size)
+
+    @staticmethod
+    def codeword_size(data_size: int) -> int:
+        """Size of the codeword for data_size data bits."""
+        r = 0
+        while 2**r < data_size + r + 1:
+            r += 1
+        return data_size + r
+
+    def syndrome(self, bits: np.ndarray) -> int:
+        """
+        Compute the syndrome of a codeword of this size.
+
+        Parameters:
+        bits (np.ndarray): Codeword bits.
+
+        Returns:
+        int: Position (counting from 1) of a single flipped bit, 0 if none.
+        """
+        return int(np.bitwise_xor.reduce(self.numbers[np.asarray(bits) != 0]))
@@ -1,69 +1,61 @@
 import numpy as np
+from .packed_bits import PackedBits
+from .hamming_layout import HammingLayout
 
 class HummingErrorCorrector:
+    """Hamming code over the whole bit sequence. PackedBits inputs are
+    unpacked for the parity computation and the result is packed again.
+    The positions of each codeword size come from a cached HammingLayout."""
 
-    def add_error_detection(self, bits: np.ndarray) -> np.ndarray:
+    def add_error_detection(self, bits: np.ndarray | PackedBits) -> np.ndarray | PackedBits:
         """
         Add Hamming error detection bits to the input data.
         
         Args:
-            bits: Input data bits as numpy array
+            bits: Input data bits as numpy array or PackedBits
             
         Returns:
             numpy array with original data + parity bits
         """
-        # Calculate number of parity bits needed
-        m = len(bits)
-        r = 0
-        while 2**r < m + r + 1:
-            r += 1
-        
-        # Create result array with space for parity bits
-        n = m + r
-        result = np.zeros(n, dtype=int)
-        
-        # Fill data bits (skip positions that are powers of 2)
-        data_idx = 0
-        for i in range(n):
-            if not self._is_power_of_2(i + 1) and data_idx < m:
-                result[i] = bits[data_idx]
-                data_idx += 1
-        
-        # Calculate and set parity bits
-        for i in range(r):
-            parity_pos = 2**i - 1
-            result[parity_pos] = self._calculate_parity(result, i)
-        
-        return result.astype(int)
+        if isinstance(bits, PackedBits):
+            return PackedBits.from_bits(self.add_error_detection(bits.to_bits()))
+        layout = HammingLayout.get(HammingLayout.codeword_size(len(bits)))
+
+        # Fill data bits, then set the parity bits to the syndrome bits so
+        # that the syndrome of the codeword is zero
+        result = np.zeros(layout.size, dtype=int)
+        result[layout.data_positions] = bits
+        syndrome = layout.syndrome(result)
+        result[layout.parity_positions] = (syndrome >> np.arange(layout.parity_positions.size)) & 1
+
+        return result
     
-    def remove_error_detection(self, bits: np.ndarray) -> np.ndarray:
+    def remove_error_detection(self, bits: np.ndarray | PackedBits) -> np.ndarray | PackedBits:
         """
         Remove Hamming parity bits and return original data.
         
         Args:
-            bits: Data with parity bits as numpy array
+            bits: Data with parity bits as numpy array or PackedBits
             
         Returns:
             numpy array with original data (parity bits removed)
         """
-        # Find positions that are not powers of 2 (data bits)
-        data_bits = []
-        for i in range(len(bits)):
-            if not self._is_power_of_2(i + 1):
-                data_bits.append(bits[i])
-        
-        return np.array(data_bits, dtype=int)
+        if isinstance(bits, PackedBits):
+            return PackedBits.from_bits(self.remove_error_detection(bits.to_bits()))
+        return np.asarray(bits)[HammingLayout.get(len(bits)).data_positions].astype(int)
     
-    def correct_errors(self, bits: np.ndarray) -> np.ndarray:
+    def correct_errors(self, bits: np.ndarray | PackedBits) -> np.ndarray | PackedBits:
         """
         Detect and correct single-bit errors using Hamming code.
         
         Args:
-            bits: Data with parity bits as numpy array
+            bits: Data with parity bits as numpy array or PackedBits
             
         Returns:
             numpy array with corrected data
         """
+        if isinstance(bits, PackedBits):
+            return PackedBits.from_bits(self.correct_errors(bits.to_bits()))
         # Calculate syndrome
         syndrome = self._calculate_syndrome(bits)
         
@@ -78,49 +70,21 @@ class HummingErrorCorrector:
         
         return bits
     
-    def check_errors(self, bits: np.ndarray) -> bool:
+    def check_errors(self, bits: np.ndarray | PackedBits) -> bool:
         """
         Check if there are errors in the data.
         
         Args:
-            bits: Data with parity bits as numpy array
+            bits: Data with parity bits as numpy array or PackedBits
             
         Returns:
             True if errors detected, False otherwise
         """
+        if isinstance(bits, PackedBits):
+            bits = bits.to_bits()
         syndrome = self._calculate_syndrome(bits)
         return syndrome != 0
     
-    def _is_power_of_2(self, n: int) -> bool:
-        """Check if n is a power of 2."""
-        return n > 0 and (n & (n - 1)) == 0
-    
-    def _calculate_parity(self, bits: np.ndarray, parity_index: int) -> int:
-        """Calculate parity bit for given position."""
-        parity_pos = 2**parity_index - 1
-        parity = 0
-        
-        for i in range(len(bits)):
-            if i != parity_pos and (i + 1) & (2**parity_index):
-                parity ^= bits[i]
-        
-        return parity
-    
     def _calculate_syndrome(self, bits: np.ndarray) -> int:
         """Calculate syndrome to detect errors."""
-        syndrome = 0
-        r = 0
-        
-        # Find number of parity bits
-        while 2**r < len(bits) + 1:
-            r += 1
-        
-        # Calculate syndrome
-        for i in range(r):
-            parity_pos = 2**i - 1
-            if parity_pos < len(bits):
-                expected_parity = self._calculate_parity(bits, i)
-                if bits[parity_pos] != expected_parity:
-                    syndrome += 2**i
-        
-        return syndrome
\ No newline at end of file
+        return HammingLayout.get(len(bits)).syndrome(bits)
@@ -0,0 +1,89 @@
+import numpy as np
+
+class PackedBits:
+    """
+    Bit sequence stored 8 bits per byte, most significant bit first, with
+    its length in bits. Unused bits of the last byte are always zero, so
+    the byte buffer can be compared, hashed or checked byte-wise.
+    """
+    __slots__ = ("data", "size")
+
+    def __init__(self, data: np.ndarray | bytes = b"", size: int | None = None) -> None:
+        """
+        Initialize the bit sequence.
+
+        Parameters:
+        data (np.ndarray | bytes): Packed bytes, most significant bit first.
+        size (int | None): Number of valid bits. Defaults to all the bits of data.
+        """
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = np.frombuffer(data, dtype=np.uint8)
+        data = np.asarray(data, dtype=np.uint8).reshape(-1)
+        if size is None:
+            size = 8 * data.size
+        if not (size == 0 if data.size == 0 else 8 * data.size - 8 < size <= 8 * data.size):
+            raise ValueError("Bit length does not match the number of bytes.")
+
+        if size % 8:
+            # Clear the unused bits of the last byte
+            data = data.copy()
+            data[-1] &= (0xFF << (8 - size % 8)) & 0xFF
+        self.data = data
+        self.size = size
+
+    @classmethod
+    def from_bits(cls, bits: np.ndarray) -> "PackedBits":
+        """Pack an array with one bit per element (any non-zero value is a 1)."""
+        bits = np.asarray(bits).reshape(-1)
+        return cls(np.packbits(bits != 0), bits.size)
+
+    @classmethod
+    def concatenate(cls, parts: list["PackedBits"]) -> "PackedBits":
+        """Join bit sequences. Byte-aligned parts are joined without unpacking."""
+        if all(part.size % 8 == 0 for part in parts[:-1]):
+            return cls(np.concatenate([part.data for part in parts] or [np.zeros(0, np.uint8)]),
+                       sum(part.size for part in parts))
+        return cls.from_bits(np.concatenate([part.to_bits() for part in parts]))
+
+    def to_bits(self) -> np.ndarray:
+        """Unpack into a uint8 array with one bit per element."""
+        return np.unpackbits(self.data, count=self.size)
+
+    def tobytes(self) -> bytes:
+        """Packed bytes, the last one padded with zero bits."""
+        return self.data.tobytes()
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.size
+
+    def append(self, bits: "PackedBits | np.ndarray") -> "PackedBits":
+        """Return a new sequence with bits (packed or one per element) added at the end."""
+        if not isinstance(bits, PackedBits):
+            bits = PackedBits.from_bits(bits)
+        return PackedBits.concatenate([self, bits])
+
+    def __getitem__(self, index: slice) -> "PackedBits":
+        """Slice of the bit sequence; slices starting on a byte boundary are not unpacked."""
+        if not isinstance(index, slice):
+            raise TypeError("PackedBits only supports slicing.")
+        start, stop, step = index.indices(self.size)
+        stop = max(stop, start)
+        if step == 1 and start % 8 == 0:
+            return PackedBits(self.data[start // 8:(stop + 7) // 8], stop - start)
+        return PackedBits.from_bits(self.to_bits()[index])
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        bits = self.to_bits()
+        return bits if dtype is None else bits.astype(dtype)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PackedBits):
+            return NotImplemented
+        return self.size == other.size and np.array_equal(self.data, other.data)
+
+    def __repr__(self) -> str:
+        return f"PackedBits(size={self.size}, data={self.data.tobytes().hex()})"
@@ -1,5 +1,6 @@
 import numpy as np
 from .error_detector import ErrorDetector
+from .packed_bits import PackedBits
 
 class ParityErrorDetector(ErrorDetector):
     """
@@ -19,17 +20,22 @@ class ParityErrorDetector(ErrorDetector):
         self.to_byte = to_byte
         self.trailer_size = 8 if to_byte else 1
 
-    def add_trailer(self, data: np.ndarray) -> np.ndarray:
+    def add_trailer(self, data: np.ndarray | PackedBits) -> np.ndarray | PackedBits:
         """
         Add a parity bit to the end of the data.
         The parity bit is the XOR of all bits in the data.
         
         Parameters:
-        data (np.ndarray): Input data as a binary array.
+        data (np.ndarray | PackedBits): Input data as a binary array.
         
         Returns:
-        np.ndarray: New array with the parity bit appended.
+        np.ndarray | PackedBits: New bits of the same kind with the parity bit appended.
         """
+        if isinstance(data, PackedBits):
+            trailer = np.zeros(self.trailer_size, dtype=np.uint8)
+            trailer[0] = self.parity(data)
+            return data.append(trailer)
+
         data_with_detection = data.copy()
         if self.to_byte:
             data_with_detection.resize(data.size + 8)
@@ -39,12 +45,12 @@ class ParityErrorDetector(ErrorDetector):
         data_with_detection[data.size] = np.logical_xor.reduce(data)
         return data_with_detection
 
-    def check(self, data: np.ndarray) -> str:
+    def check(self, data: np.ndarray | PackedBits) -> str:
         """
         Check if the parity of the data is correct.
         
         Parameters:
-        data (np.ndarray): Data array with a parity bit at the end.
+        data (np.ndarray | PackedBits): Data with a parity bit at the end.
         
         Returns:
         str: "" if no error detected, error message otherwise
@@ -52,20 +58,20 @@ class ParityErrorDetector(ErrorDetector):
         if data.size < 1:
             raise ValueError("No data given.")
         
-        calculated = np.logical_xor.reduce(data)
+        calculated = self.parity(data) if isinstance(data, PackedBits) else np.logical_xor.reduce(data)
         if calculated:
             return f"Calculated parity bit is incorrect: {calculated} != 0"
         return ""
 
-    def remove_trailer(self, data: np.ndarray) -> np.ndarray:
+    def remove_trailer(self, data: np.ndarray | PackedBits) -> np.ndarray | PackedBits:
         """
         Remove the parity bit from the data.
         
         Parameters:
-        data (np.ndarray): Data array with a parity bit at the end.
+        data (np.ndarray | PackedBits): Data with a parity bit at the end.
         
         Returns:
-        np.ndarray: Data array without the parity bit.
+        np.ndarray | PackedBits: Data without the parity bit.
         """
         if self.to_byte:
             if data.size < 8:
@@ -75,3 +81,8 @@ class ParityErrorDetector(ErrorDetector):
             if data.size < 1:
                 raise ValueError("No data given.")
             return data[:-1]
+
+    @staticmethod
+    def parity(data: PackedBits) -> bool:
+        """XOR of all the bits, computed on the packed bytes (padding bits are zero)."""
+        return bool(int(np.bitwise_xor.reduce(data.data, initial=0)).bit_count() & 1)
@@ -0,0 +1,279 @@
+import copy
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from math import sqrt
+from statistics import NormalDist
+from typing import Callable, Iterable, NamedTuple
+import numpy as np
+
+from communication import CommunicationChannel
+from pipeline import Pipeline, PipelineResult
+
+
+def wilson_interval(errors: int, trials: int, confidence: float = 0.95) -> tuple[float, float]:
+    """
+    Wilson score confidence interval of an error probability.
+
+    Parameters:
+    errors (int): Number of errors observed.
+    trials (int): Number of trials (bits or frames).
+    confidence (float): Confidence level of the interval.
+
+    Returns:
+    tuple[float, float]: Lower and upper bounds.
+    """
+    if trials == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = errors / trials
+    denominator = 1 + z**2 / trials
+    center = (p + z**2 / (2 * trials)) / denominator
+    half_width = z * sqrt(p * (1 - p) / trials + z**2 / (4 * trials**2)) / denominator
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+class ErrorCounts(NamedTuple):
+    """Errors counted over a batch of frames."""
+    bits: int = 0
+    bit_errors: int = 0
+    frames: int = 0
+    frame_errors: int = 0
+
+    def __add__(self, other: "ErrorCounts") -> "ErrorCounts":
+        return ErrorCounts(*(a + b for a, b in zip(self, other)))
+
+
+class ErrorRatePoint(NamedTuple):
+    """Bit and frame error rates measured at one SNR, with their confidence intervals."""
+    snr: float
+    bits: int
+    bit_errors: int
+    frames: int
+    frame_errors: int
+    ber: float
+    ber_interval: tuple[float, float]
+    fer: float
+    fer_interval: tuple[float, float]
+    converged: bool
+
+
+def count_errors(sent: np.ndarray, result: PipelineResult) -> int:
+    """
+    Count the payload bits of one frame received wrong. Bits missing from
+    the output are errors, and so are all the bits of a frame whose
+    deframing failed, as the frame is lost.
+    """
+    if result.failed == "deframing":
+        return sent.size
+    received = np.asarray(result.output).reshape(-1)[:sent.size]
+    return int(np.count_nonzero(received != sent[:received.size])) + sent.size - received.size
+
+
+# Pipeline of the worker process, sent once when the pool starts
+_worker_pipeline = None
+
+
+def _init_worker(pipeline: Pipeline) -> None:
+    """Store the pipeline of a worker process."""
+    global _worker_pipeline
+    _worker_pipeline = pipeline
+
+
+def simulate_frames(snr: float, std_dev: float, frame_bits: int, num_frames: int,
+                    seed: np.random.SeedSequence) -> ErrorCounts:
+    """
+    Send random frames through the worker's pipeline over a CommunicationChannel.
+
+    Parameters:
+    snr (float): Channel SNR factor, as in CommunicationChannel.
+    std_dev (float): Noise standard deviation before scaling.
+    frame_bits (int): Payload bits per frame.
+    num_frames (int): Number of frames.
+    seed (np.random.SeedSequence): Seed of the payloads and of the noise.
+
+    Returns:
+    ErrorCounts: Bits, bit errors, frames and frame errors.
+    """
+    payload_seed, noise_seed = seed.spawn(2)
+    rng = np.random.default_rng(payload_seed)
+    pipeline = _worker_pipeline
+    pipeline.channel = CommunicationChannel(snr, std_dev, seed=noise_seed)
+
+    bit_errors = frame_errors = 0
+    for _ in range(num_frames):
+        bits = rng.integers(0, 2, frame_bits)
+        result = pipeline.run(bits)
+        errors = count_errors(bits, result)
+        bit_errors += errors
+        frame_errors += errors > 0 or result.failed is not None
+    return ErrorCounts(num_frames * frame_bits, bit_errors, num_frames, frame_errors)
+
+
+class _InlineExecutor:
+    """Executor that runs each task when it is submitted, for a single worker."""
+    def submit(self, function, *args) -> Future:
+        future = Future()
+        future.set_result(function(*args))
+        return future
+
+    def __enter__(self) -> "_InlineExecutor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+class _SweepPoint:
+    """Progress of one SNR point: batches submitted, finished and counted."""
+    def __init__(self, snr: float, seed: np.random.SeedSequence):
+        self.snr = snr
+        self.seed = seed
+        self.submitted = 0
+        self.counted = 0
+        self.finished_batches = {}
+        self.counts = ErrorCounts()
+        self.finished = False
+
+
+class ErrorRateSimulator:
+    """
+    Monte Carlo bit and frame error rates of a pipeline versus the SNR of a
+    CommunicationChannel, on a pool of worker processes.
+
+    Each SNR point is simulated in batches of frames. Every batch draws its
+    payloads and noise from its own stream, spawned from the seed, and the
+    batches of a point are counted in the order they were submitted, so the
+    results do not depend on the number of workers or their timing. A point
+    stops when the confidence interval of its error rate is within the
+    requested relative precision, or after max_bits; the workers then move
+    on to the points that have not converged.
+    """
+    def __init__(self, pipeline: Pipeline, frame_bits: int = 1024, frames_per_batch: int = 32, std_dev: float = 1,
+                 precision: float = 0.1, confidence: float = 0.95, criterion: str = "ber", max_bits: int = 10**8,
+                 workers: int | None = None, seed: int | None = None):
+        """
+        Initialize the simulator.
+
+        Parameters:
+        pipeline (Pipeline): Chain to measure; its channel is replaced for each SNR.
+        frame_bits (int): Payload bits per frame.
+        frames_per_batch (int): Frames sent by each task of the pool.
+        std_dev (float): Noise standard deviation before scaling.
+        precision (float): Relative half-width of the confidence interval that stops a point.
+        confidence (float): Confidence level of the intervals.
+        criterion (str): Rate whose interval stops a point, "ber" or "fer".
+        max_bits (int): Maximum payload bits per point.
+        workers (int | None): Number of worker processes; defaults to the CPU count. With 1
+                              worker the frames are simulated in this process.
+        seed (int | None): Seed of the simulation.
+        """
+        if criterion not in ("ber", "fer"):
+            raise ValueError("Criterion must be 'ber' or 'fer'.")
+        if not 0 < precision < 1:
+            raise ValueError("Precision must be in (0, 1).")
+        self.pipeline = pipeline
+        self.frame_bits = frame_bits
+        self.frames_per_batch = frames_per_batch
+        self.std_dev = std_dev
+        self.precision = precision
+        self.confidence = confidence
+        self.criterion = criterion
+        self.max_bits = max_bits
+        self.workers = workers or os.cpu_count() or 1
+        self.seed = seed
+
+    def run(self, snrs: Iterable[float], progress: Callable[[ErrorRatePoint], None] | None = None,
+            seeds: list[np.random.SeedSequence] | None = None) -> list[ErrorRatePoint]:
+        """
+        Measure the error rates at each SNR.
+
+        Parameters:
+        snrs (Iterable[float]): Channel SNR factors, as in CommunicationChannel.
+        progress (Callable[[ErrorRatePoint], None] | None): Called with each point when it finishes.
+        seeds (list[np.random.SeedSequence] | None): Seed of each SNR, so that a point does not
+                                                     depend on the others; spawned from the
+                                                     simulator's seed by default.
+
+        Returns:
+        list[ErrorRatePoint]: One point per SNR, in the given order.
+        """
+        # Hooks and the window's channel stay in this process
+        pipeline = copy.copy(self.pipeline)
+        pipeline.channel = None
+        pipeline.hooks = []
+
+        snrs = list(snrs)
+        if seeds is None:
+            seeds = np.random.SeedSequence(self.seed).spawn(len(snrs))
+        elif len(seeds) != len(snrs):
+            raise ValueError("There must be one seed per SNR.")
+        points = [_SweepPoint(snr, seed) for snr, seed in zip(snrs, seeds)]
+        batch_bits = self.frames_per_batch * self.frame_bits
+        in_flight = {}
+
+        if self.workers > 1:
+            executor = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(pipeline,))
+        else:
+            _init_worker(pipeline)
+            executor = _InlineExecutor()
+        with executor:
+            def fill():
+                # Keep every worker busy, giving the next batch to the point with the fewest pending
+                while len(in_flight) < 2 * self.workers:
+                    active = [point for point in points
+                              if not point.finished and point.submitted * batch_bits < self.max_bits]
+                    if not active:
+                        return
+                    point = min(active, key=lambda point: point.submitted - point.counted)
+                    future = executor.submit(simulate_frames, point.snr, self.std_dev, self.frame_bits,
+                                             self.frames_per_batch, point.seed.spawn(1)[0])
+                    in_flight[future] = (point, point.submitted)
+                    point.submitted += 1
+
+            fill()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    point, index = in_flight.pop(future)
+                    if future.cancelled() or point.finished:
+                        continue
+                    point.finished_batches[index] = future.result()
+                    # Count in submission order, up to the batch that stops the point
+                    while not point.finished and point.counted in point.finished_batches:
+                        point.counts += point.finished_batches.pop(point.counted)
+                        point.counted += 1
+                        if self._converged(point.counts) or point.counted * batch_bits >= self.max_bits:
+                            self._finish(point, in_flight, progress)
+                fill()
+
+        return [self._point(point.snr, point.counts) for point in points]
+
+    def _finish(self, point: _SweepPoint, in_flight: dict, progress) -> None:
+        """Stop a point and cancel its batches that have not started."""
+        point.finished = True
+        point.finished_batches.clear()
+        for future, (owner, _) in list(in_flight.items()):
+            if owner is point and future.cancel():
+                del in_flight[future]
+        if progress is not None:
+            progress(self._point(point.snr, point.counts))
+
+    def _converged(self, counts: ErrorCounts) -> bool:
+        """Check if the interval of the criterion rate is within the precision."""
+        errors, trials = ((counts.bit_errors, counts.bits) if self.criterion == "ber"
+                          else (counts.frame_errors, counts.frames))
+        if errors == 0:
+            return False
+        low, high = wilson_interval(errors, trials, self.confidence)
+        return (high - low) / 2 <= self.precision * errors / trials
+
+    def _point(self, snr: float, counts: ErrorCounts) -> ErrorRatePoint:
+        """Rates and intervals of the counts of one SNR."""
+        return ErrorRatePoint(
+            snr=snr, bits=counts.bits, bit_errors=counts.bit_errors,
+            frames=counts.frames, frame_errors=counts.frame_errors,
+            ber=counts.bit_errors / counts.bits if counts.bits else 0.0,
+            ber_interval=wilson_interval(counts.bit_errors, counts.bits, self.confidence),
+            fer=counts.frame_errors / counts.frames if counts.frames else 0.0,
+            fer_interval=wilson_interval(counts.frame_errors, counts.frames, self.confidence),
+            converged=self._converged(counts))
@@ -242,6 +242,19 @@ class ConfigPage(Gtk.Box):
         self.analog_sample_rate_entry.connect('changed', self.check_numeric_entry, [id_set_v], True)
         self.analog_sample_rate_entry.set_hexpand(True)
         an_grid.attach(self.analog_sample_rate_entry, 1, 2, 1, 1)
+
+        # Complex baseband switch
+        baseband_switch_label = Gtk.Label(label="Simular em Banda Base Complexa:")
+        baseband_switch_label.set_hexpand(True)
+        baseband_switch_label.set_halign(Gtk.Align.START)
+        an_grid.attach(baseband_switch_label, 0, 3, 1, 1)
+
+        self.baseband_switch = Gtk.Switch()
+        self.baseband_switch.set_name("complex_baseband")
+        self.baseband_switch.set_active(False)
+        self.baseband_switch.connect('notify::active', lambda *_: self.set_variable(self.baseband_switch, self.baseband_switch.get_active))
+        self.baseband_switch.set_hexpand(True)
+        an_grid.attach(self.baseband_switch, 1, 3, 1, 1)
     
 
     def check_numeric_entry(self, entry:Gtk.Entry, block_ids:list[int] = [], allow_comma:bool = False):
@@ -0,0 +1,244 @@
+from math import sqrt
+from statistics import NormalDist
+from typing import Callable, Iterable, NamedTuple
+import numpy as np
+
+from physical_layer import (BipolarModulator, CarrierModulator, DigitalModulator, ManchesterModulator,
+                            NRZModulator, PSKCarrierModulator, QAMCarrierModulator)
+
+
+class ImportanceSamplingPoint(NamedTuple):
+    """Bit error rate estimated at one SNR, with its confidence interval."""
+    snr: float
+    bits: int
+    ber: float
+    ber_interval: tuple[float, float]
+    relative_error: float
+    error_samples: int
+    converged: bool
+
+
+class ImportanceSampler:
+    """
+    Importance-sampling estimate of the bit error rate of a modulator over
+    CommunicationChannel, i.e. Gaussian noise with standard deviation
+    std_dev / snr per sample, for error rates far too low to count errors.
+
+    The noise of every bit (or symbol) is drawn from a biased Gaussian that
+    makes errors frequent, and each error is weighted by the likelihood
+    ratio of the true noise density over the biased one, so the weighted
+    error count stays an unbiased estimate of the BER. The bits are decided
+    by the modulator's own demodulator; the bias follows its decision rule:
+
+    - NRZ, PSK and 8-QAM (correlation detectors): the noise mean is moved to
+      the decision boundary, halfway to the nearest constellation points,
+      with an equal mixture when there are several (two for 8-QAM).
+    - Bipolar (energy threshold): marks get their mean moved onto the energy
+      threshold; spaces get a larger variance, whose energy reaches it on average.
+    - Manchester (energy of the two halves): the high half gets its mean
+      moved halfway down and the low half a variance that matches it.
+
+    Carrier modulators are simulated on the complex baseband, one sample per
+    symbol, which gives their detectors the same statistics as the passband
+    signal. Only the link of one modulator is estimated: framing and error
+    correction are out of scope, as their errors are rare frame events.
+    """
+    # Error samples needed before the variance estimate is trusted
+    MIN_ERROR_SAMPLES = 100
+
+    def __init__(self, modulator: DigitalModulator | CarrierModulator, std_dev: float = 1,
+                 bits_per_batch: int = 1 << 14, precision: float = 0.05, confidence: float = 0.95,
+                 max_bits: int = 10**8, seed: int | None = None):
+        """
+        Initialize the sampler.
+
+        Parameters:
+        modulator (DigitalModulator | CarrierModulator): NRZ, Bipolar, Manchester, PSK or 8-QAM modulator.
+        std_dev (float): Noise standard deviation before scaling.
+        bits_per_batch (int): Bits sent in each batch.
+        precision (float): Relative half-width of the confidence interval that stops a point.
+        confidence (float): Confidence level of the intervals.
+        max_bits (int): Maximum bits per point.
+        seed (int | None): Seed of the simulation.
+        """
+        if not isinstance(modulator, (NRZModulator, BipolarModulator, ManchesterModulator,
+                                      PSKCarrierModulator, QAMCarrierModulator)):
+            raise ValueError(f"No importance sampling rule for {type(modulator).__name__}.")
+        if not 0 < precision < 1:
+            raise ValueError("Precision must be in (0, 1).")
+        self.modulator = modulator
+        self.std_dev = std_dev
+        self.bits_per_symbol = modulator.bits_per_symbol if isinstance(modulator, CarrierModulator) else 1
+        # Whole symbols in every batch
+        self.bits_per_batch = max(bits_per_batch // self.bits_per_symbol, 1) * self.bits_per_symbol
+        self.precision = precision
+        self.confidence = confidence
+        self.max_bits = max_bits
+        self.seed = seed
+        if isinstance(modulator, CarrierModulator):
+            self._neighbor_shifts = self._constellation_shifts()
+
+    def run(self, snrs: Iterable[float],
+            progress: Callable[[ImportanceSamplingPoint], None] | None = None) -> list[ImportanceSamplingPoint]:
+        """
+        Estimate the bit error rate at each SNR.
+
+        Parameters:
+        snrs (Iterable[float]): Channel SNR factors, as in CommunicationChannel.
+        progress (Callable[[ImportanceSamplingPoint], None] | None): Called with each point when it finishes.
+
+        Returns:
+        list[ImportanceSamplingPoint]: One point per SNR, in the given order.
+        """
+        snrs = list(snrs)
+        points = []
+        for snr, seed in zip(snrs, np.random.SeedSequence(self.seed).spawn(len(snrs))):
+            points.append(self.estimate(snr, np.random.default_rng(seed)))
+            if progress is not None:
+                progress(points[-1])
+        return points
+
+    def estimate(self, snr: float, rng: np.random.Generator | None = None) -> ImportanceSamplingPoint:
+        """
+        Estimate the bit error rate at one SNR, sending batches until the
+        confidence interval is within the precision or max_bits are sent.
+
+        Parameters:
+        snr (float): Channel SNR factor, as in CommunicationChannel.
+        rng (np.random.Generator | None): Generator of the bits and noise; seeded from seed by default.
+
+        Returns:
+        ImportanceSamplingPoint: Estimate and its confidence interval.
+        """
+        rng = np.random.default_rng(self.seed) if rng is None else rng
+        sigma = self.std_dev / snr
+        z = NormalDist().inv_cdf(0.5 + self.confidence / 2)
+        # Sums of the weighted bit errors of each symbol and of their squares
+        total = total_squares = 0.0
+        symbols = error_samples = 0
+        while True:
+            weighted_errors, errors = self._batch(rng, sigma)
+            total += float(weighted_errors.sum())
+            total_squares += float(np.dot(weighted_errors, weighted_errors))
+            symbols += weighted_errors.size
+            error_samples += errors
+            point = self._point(snr, symbols, total, total_squares, error_samples, z)
+            if point.converged or point.bits >= self.max_bits:
+                return point
+
+    def _point(self, snr: float, symbols: int, total: float, total_squares: float, error_samples: int,
+               z: float) -> ImportanceSamplingPoint:
+        """Estimate and normal confidence interval from the sums of the weighted errors."""
+        mean = total / symbols
+        variance = max(total_squares / symbols - mean**2, 0.0) / symbols
+        ber = mean / self.bits_per_symbol
+        half_width = z * sqrt(variance) / self.bits_per_symbol
+        relative_error = half_width / ber if ber > 0 else float("inf")
+        return ImportanceSamplingPoint(
+            snr=snr, bits=symbols * self.bits_per_symbol, ber=ber,
+            ber_interval=(max(0.0, ber - half_width), min(1.0, ber + half_width)),
+            relative_error=relative_error, error_samples=error_samples,
+            converged=error_samples >= self.MIN_ERROR_SAMPLES and relative_error <= self.precision)
+
+    def _batch(self, rng: np.random.Generator, sigma: float) -> tuple[np.ndarray, int]:
+        """
+        Send one batch with biased noise.
+
+        Returns:
+        tuple[np.ndarray, int]: Bit errors of each symbol times its likelihood
+        ratio, and the number of symbols received with errors.
+        """
+        bits = rng.integers(0, 2, self.bits_per_batch)
+        clean = self._transmit(bits)
+        means, stds = self._biases(clean, bits, sigma)
+
+        # Biased noise: a mixture of Gaussians with independent components
+        num_symbols, num_biases, _ = means.shape
+        chosen = rng.integers(num_biases, size=num_symbols)
+        rows = np.arange(num_symbols)
+        noise = means[rows, chosen] + stds[rows, chosen] * rng.standard_normal(clean.shape)
+
+        # Likelihood ratio of the true density over the mixture, in logs
+        log_true = -np.einsum("ij,ij->i", noise, noise) / (2 * sigma**2) - clean.shape[1] * np.log(sigma)
+        deviations = (noise[:, None, :] - means) / stds
+        log_biased = -0.5 * np.einsum("ikj,ikj->ik", deviations, deviations) - np.log(stds).sum(axis=-1)
+        log_mixture = np.logaddexp.reduce(log_biased, axis=1) - np.log(num_biases)
+        weights = np.exp(log_true - log_mixture)
+
+        received = self._receive(clean + noise)
+        errors = (received[:bits.size] != bits).reshape(num_symbols, self.bits_per_symbol).sum(axis=1)
+        return weights * errors, int(np.count_nonzero(errors))
+
+    def _transmit(self, bits: np.ndarray) -> np.ndarray:
+        """Noiseless samples of every symbol, shape (num_symbols, real samples per symbol)."""
+        if isinstance(self.modulator, CarrierModulator):
+            signal = self.modulator.modulate_baseband(bits, 1).astype(np.complex128)
+            return signal.view(np.float64).reshape(bits.size // self.bits_per_symbol, -1)
+        signal = self.modulator.modulate(bits).astype(np.float64)
+        return signal.reshape(bits.size, -1)
+
+    def _receive(self, received: np.ndarray) -> np.ndarray:
+        """Bits decided by the modulator from the received samples of every symbol."""
+        if isinstance(self.modulator, CarrierModulator):
+            return self.modulator.demodulate_baseband(received.reshape(-1).view(np.complex128), 1)
+        return self.modulator.demodulate(received.reshape(-1))
+
+    def _biases(self, clean: np.ndarray, bits: np.ndarray, sigma: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Means and standard deviations of the biased noise of every symbol.
+
+        Parameters:
+        clean (np.ndarray): Noiseless samples of every symbol.
+        bits (np.ndarray): Bits sent.
+        sigma (float): Standard deviation of the channel noise.
+
+        Returns:
+        tuple[np.ndarray, np.ndarray]: Arrays of shape (num_symbols, mixture size, samples per symbol).
+        """
+        if isinstance(self.modulator, CarrierModulator):
+            # Constellation index of every symbol, its bits most significant first
+            indices = bits.reshape(-1, self.bits_per_symbol) @ (1 << np.arange(self.bits_per_symbol - 1, -1, -1))
+            means = self._neighbor_shifts[indices]
+            return means, np.full_like(means, sigma)
+
+        if isinstance(self.modulator, NRZModulator):
+            # The antipodal level -s is the only neighbor: shift to the zero threshold
+            means = -clean
+            stds = np.full_like(clean, sigma)
+        elif isinstance(self.modulator, BipolarModulator):
+            # Energy threshold of 0.5 per sample on average
+            threshold = 0.5 * self.modulator.samples_per_bit / clean.shape[1]
+            marks = np.broadcast_to(np.any(clean != 0, axis=1, keepdims=True), clean.shape)
+            # Nearest point of the ball of low energy to a mark, and a variance
+            # whose energy reaches the threshold for a space
+            means = np.where(marks, clean * (sqrt(threshold) - 1), 0.0)
+            stds = np.where(marks, sigma, max(sigma, sqrt(threshold)))
+        else:
+            # Manchester: the most likely errors take the high half down to 1/2
+            # and raise the energy of the low half to the same level
+            means = -clean / 2
+            stds = np.where(clean != 0, sigma, max(sigma, 0.5))
+        return means[:, None, :], stds[:, None, :]
+
+    def _constellation_shifts(self) -> np.ndarray:
+        """
+        Noise means of every constellation point: halfway to each of its
+        nearest points, on the decision boundary between them.
+
+        Returns:
+        np.ndarray: Array of shape (num_points, nearest points, real samples per symbol).
+        """
+        k = self.bits_per_symbol
+        patterns = (np.arange(2**k)[:, None] >> np.arange(k - 1, -1, -1)) & 1
+        points = self._transmit(patterns.ravel())
+        distances = np.linalg.norm(points[:, None, :] - points[None, :, :], axis=-1)
+        np.fill_diagonal(distances, np.inf)
+        nearest = distances <= distances.min(axis=1, keepdims=True) * (1 + 1e-9)
+        count = int(nearest.sum(axis=1).max())
+
+        shifts = np.empty((len(points), count, points.shape[1]))
+        for index, point in enumerate(points):
+            neighbors = points[nearest[index]]
+            # Points with fewer nearest neighbors repeat them, which keeps the mixture valid
+            shifts[index] = (neighbors[np.arange(count) % len(neighbors)] - point) / 2
+        return shifts
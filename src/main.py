@@ -10,6 +10,7 @@ from gui.link_page import LinkPage
 from gui.physical_page import PhysicalPage
 
 from base_window import BaseWindow
+from pipeline import Pipeline
 
 class Window(BaseWindow, Gtk.ApplicationWindow):
     def __init__(self, app):
@@ -50,6 +51,7 @@ class Window(BaseWindow, Gtk.ApplicationWindow):
             "analog_modulation": self.set_analog_modulation,
             "analog_frequency": self.set_analog_frequency,
             "analog_sample_rate": self.set_analog_sample_rate,
+            "complex_baseband": self.set_complex_baseband,
         }
 
         config_page = ConfigPage(
@@ -93,152 +95,69 @@ class Window(BaseWindow, Gtk.ApplicationWindow):
         bits = ''.join(format(ord(char), '08b') for char in self.input_text[:self.max_frame_size])
 
         self.link_page.set_data_input(bits)
-        encoded_bits = self.send_frame(np.array([int(bit) for bit in bits]))
-        received_bits = self.communication.receive()
-        self.receive_frame(received_bits)
+        received_bits = self.send_frame(np.array([int(bit) for bit in bits]))
+        self.receive_frame(received_bits, data_size=len(bits))
 
     def send_frame(self, bits: np.ndarray):
-        """Processa o envio de dados - aplica EDC, framing e modulação"""
-        
-        # Handle error detection and correction
-        if self.error_corrector is not None:
-            # Use Hamming error correction
-            try:
-                bits_with_error_correction = self.error_corrector.add_error_detection(bits)
-                self.link_page.set_edc_input(''.join(map(lambda x: str(int(x)), bits_with_error_correction)))
-            except Exception as e:
-                bits_with_error_correction = bits
-                self.link_page.set_edc_input(e.args[0])
-        else:
-            bits_with_error_correction = bits
-            self.link_page.set_edc_input('Nenhum')
-        
-        if bits_with_error_correction.size % 8 != 0:
-            bits_with_error_correction = np.concatenate((bits_with_error_correction, np.zeros(8 - bits_with_error_correction.size % 8, dtype=int)))
+        """Processa o envio de dados - aplica EDC, framing e modulação e envia pelo canal;
+        retorna o sinal recebido"""
+        stages = Pipeline.from_window(self, hooks=self.pipeline_hooks).send(bits)
 
+        self._show_stage(stages, "encoding", self.link_page.set_edc_input)
         if self.coding is not None and self.error_detector is not None:
-            # Use traditional error detection
+            # O trailer é adicionado pelo enquadramento; aqui só é exibido
             try:
-                bits_with_edc = self.coding.add_edc(bits_with_error_correction)
-                self.link_page.set_edc_input(''.join(map(lambda x: str(int(x)), bits_with_edc)))
+                self.link_page.set_edc_input(self._bits_to_string(self.coding.add_edc(stages["padding"].output)))
             except Exception as e:
-                bits_with_edc = bits_with_error_correction
                 self.link_page.set_edc_input(e.args[0])
-        else:
-            bits_with_edc = bits_with_error_correction
-                    
-        # Handle framing
-        if self.coding is not None:
-            try:
-                framed_bits = self.coding.frame_data(bits_with_error_correction)
-                self.link_page.set_frame_input(''.join(map(lambda x: str(int(x)), framed_bits)))
-            except Exception as e:
-                framed_bits = bits_with_error_correction
-                self.link_page.set_frame_input(e.args[0])
-        else:
-            framed_bits = bits_with_error_correction
-            self.link_page.set_frame_input('Nenhum')
 
-        self.link_page.set_sent_bits_input(''.join(map(lambda x: str(int(x)), framed_bits)))
+        self._show_stage(stages, "framing", self.link_page.set_frame_input)
+        framed_bits = stages["framing"].output if "framing" in stages else stages["padding"].output
+        self.link_page.set_sent_bits_input(self._bits_to_string(framed_bits))
 
-        # Aplicar modulação baseada na configuração
-        if self.carrier_modulator is not None:
-            # Usar apenas modulação de portadora
-            encoded_bits = self.carrier_modulator.modulate(framed_bits)
+        encoded_bits = stages["modulation"].output
+        if self.carrier_modulator is not None and self.complex_baseband:
+            # O sinal passa-banda só é sintetizado para o gráfico
+            plotted_bits = self.carrier_modulator.baseband_to_passband(encoded_bits, self.baseband_oversampling)
         else:
-            # Usar apenas modulação digital de banda base
-            encoded_bits = self.modulator.modulate(framed_bits)
+            plotted_bits = encoded_bits
 
-        x = np.linspace(0, len(encoded_bits) / self.sample_rate, num=len(encoded_bits))
-        self.physical_page.update_encoder_graph(x, encoded_bits)
+        x = np.linspace(0, len(plotted_bits) / self.sample_rate, num=len(plotted_bits))
+        self.physical_page.update_encoder_graph(x, plotted_bits)
 
-        self.communication.send(encoded_bits)
-        return encoded_bits
+        return stages["channel"].output
 
-    def receive_frame(self, received_bits: np.ndarray):
-        """Processa o recebimento de dados - aplica demodulação, deframing e EDC"""
+    def receive_frame(self, received_bits: np.ndarray, data_size: int | None = None):
+        """Processa o recebimento de dados - aplica demodulação, deframing e EDC
+        (data_size: bits enviados, para descartar o preenchimento)"""
         
-        deframe_failed = False
-        edc_failed = False
-
-        x = np.linspace(0, len(received_bits) / self.sample_rate, num=len(received_bits))
-        self.physical_page.update_decoder_graph(x, received_bits)
-
-        # Aplicar demodulação baseada na configuração
-        if self.carrier_modulator is not None:
-            # Usar apenas demodulação de portadora
-            decoded_bits = self.carrier_modulator.demodulate(received_bits)
+        if self.carrier_modulator is not None and self.complex_baseband:
+            plotted_bits = self.carrier_modulator.baseband_to_passband(received_bits, self.baseband_oversampling)
         else:
-            # Usar apenas demodulação digital de banda base
-            decoded_bits = self.modulator.demodulate(received_bits)
+            plotted_bits = received_bits
+        x = np.linspace(0, len(plotted_bits) / self.sample_rate, num=len(plotted_bits))
+        self.physical_page.update_decoder_graph(x, plotted_bits)
 
-        decoded_bits = decoded_bits[: len(decoded_bits) // 8 * 8] # Remove 8-QAM padding
-        self.link_page.set_received_bits_output(''.join(map(lambda x: str(int(x)), decoded_bits)))
+        result = Pipeline.from_window(self, hooks=self.pipeline_hooks).receive(received_bits, data_size=data_size)
+        stages = result.stages
+        self.link_page.set_received_bits_output(self._bits_to_string(stages["demodulation"].output))
 
-        # Handle deframing
-        if self.coding is not None:
-            try:
-                deframed_bits = self.coding.deframe_data(decoded_bits)
-                self.link_page.set_frame_output(''.join(map(lambda x: str(int(x)), deframed_bits)))
-            except Exception as e:
-                deframed_bits = decoded_bits
-                self.link_page.set_frame_output(e.args[0])
-                deframe_failed = True
-        else:
-            deframed_bits = decoded_bits
-            self.link_page.set_frame_output('Nenhum')
-
-        if deframe_failed:
+        self._show_stage(stages, "deframing", self.link_page.set_frame_output)
+        if result.failed == "deframing":
             self.link_page.set_edc_output('Falha no desenquadramento')
             self.link_page.set_data_output('Falha no desenquadramento')
             self.aplication_frame.update_output("Falha no desenquadramento")
             return
 
-        # Handle error detection and correction
-        if self.error_corrector is not None:
-            # Use Hamming error correction
-            no_trailer_bits = deframed_bits[:-self.error_detector.trailer_size] if self.error_detector is not None else deframed_bits
-            try:
-                # Check for errors first
-                if self.error_corrector.check_errors(no_trailer_bits):
-                    # Correct errors
-                    corrected_bits = self.error_corrector.correct_errors(no_trailer_bits)
-                    no_error_bits = corrected_bits
-                else:
-                    # No errors, just remove error detection
-                    no_error_bits = no_trailer_bits
-                no_error_bits = np.concatenate((no_error_bits,  deframed_bits[-self.error_detector.trailer_size:])) if self.error_detector is not None else no_error_bits
-                self.link_page.set_edc_output(''.join(map(lambda x: str(int(x)), no_error_bits)))
-            except Exception as e:
-                no_error_bits = no_trailer_bits
-                self.link_page.set_edc_output(e.args[0])
-                edc_failed = True
-        else:
-            no_error_bits = deframed_bits
-            self.link_page.set_edc_output('Nenhum')
+        self._show_stage(stages, "correction", self.link_page.set_edc_output)
+        for name in ("edc_check", "decoding"):
+            if name in stages:
+                self._show_stage(stages, name, self.link_page.set_edc_output)
 
-        if self.coding is not None and self.error_detector is not None:
-            try:
-                if (error := self.coding.check_edc(no_error_bits)):
-                    raise ValueError(error)
-                final_bits = self.coding.remove_edc(no_error_bits)
-                self.link_page.set_edc_output(''.join(map(lambda x: str(int(x)), final_bits)))
-            except Exception as e:
-                final_bits = no_error_bits
-                self.link_page.set_edc_output(e.args[0])
-                edc_failed = True
-        else:
-            final_bits = no_error_bits
-
-        if self.error_corrector is not None:
-            no_trailer_bits = final_bits[:-self.error_detector.trailer_size] if self.error_detector is not None else final_bits
-            no_error_detection_bits = self.error_corrector.remove_error_detection(no_trailer_bits)
-            final_bits = np.concatenate((no_error_detection_bits, final_bits[-self.error_detector.trailer_size:])) if self.error_detector is not None else no_error_detection_bits
-            self.link_page.set_edc_output(''.join(map(lambda x: str(int(x)), final_bits)))
+        final_bits = result.output
+        self.link_page.set_data_output(self._bits_to_string(final_bits))
 
-        self.link_page.set_data_output(''.join(map(lambda x: str(int(x)), final_bits)))
-
-        if edc_failed:
+        if result.failed is not None:
             self.link_page.set_data_output('Falha no EDC')
             self.aplication_frame.update_output("Falha no EDC")
             return
@@ -265,11 +184,24 @@ class Window(BaseWindow, Gtk.ApplicationWindow):
         except Exception as e:
             self.aplication_frame.update_output(f"Erro na decodificação: {str(e)}")
 
+    @staticmethod
+    def _bits_to_string(bits: np.ndarray) -> str:
+        """Representa os bits como texto de 0s e 1s"""
+        return ''.join(map(lambda x: str(int(x)), bits))
+
+    def _show_stage(self, stages: dict, name: str, set_text):
+        """Exibe a saída de uma etapa do pipeline, o erro dela ou 'Nenhum' se não configurada"""
+        if name not in stages:
+            set_text('Nenhum')
+        elif stages[name].error is not None:
+            set_text(stages[name].error)
+        else:
+            set_text(self._bits_to_string(stages[name].output))
+
     def process_frame(self, bits:np.ndarray):
         """Método legado que combina envio e recebimento - mantido para compatibilidade"""
-        encoded_bits = self.send_frame(bits)
-        received_bits = self.communication.receive()
-        self.receive_frame(received_bits)
+        received_bits = self.send_frame(bits)
+        self.receive_frame(received_bits, data_size=len(bits))
 
 class Simulator(Gtk.Application):
     def __init__(self):
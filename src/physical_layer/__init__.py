@@ -2,6 +2,7 @@ from .digital_modulator import *
 from .bipolar_modulator import *
 from .manchester_modulator import *
 from .nrz_modulator import *
+from .carrier_cache import *
 from .carrier_modulator import *
 from .ask_carrier_modulator import *
 from .fsk_carrier_modulator import *
@@ -9,4 +10,4 @@ from .psk_carrier_modulator import *
 from .qam_carrier_modulator import *
 
 __other__ = ['DigitalModulator', 'BipolarModulator', 'ManchesterModulator', 'NRZModulator', 
-              'CarrierModulator', 'ASKCarrierModulator', 'FSKCarrierModulator', 'PSKCarrierModulator', 'QAMCarrierModulator']
\ No newline at end of file
+              'CarrierCache', 'CarrierModulator', 'ASKCarrierModulator', 'FSKCarrierModulator', 'PSKCarrierModulator', 'QAMCarrierModulator']
\ No newline at end of file
@@ -1,4 +1,6 @@
+from typing import Iterable, Iterator
 from .carrier_modulator import CarrierModulator
+from .digital_modulator import rechunk
 import numpy as np
 
 class ASKCarrierModulator(CarrierModulator):
@@ -8,34 +10,69 @@ class ASKCarrierModulator(CarrierModulator):
   def __init__(self, carrier_frequency: float, bit_rate: float, sample_rate: float):
     super().__init__(carrier_frequency, bit_rate, sample_rate)
 
-  def modulate(self, bits: np.ndarray) -> np.ndarray:
+  def modulate(self, bits: np.ndarray, offset: int = 0) -> np.ndarray:
     """
     Modulate a signal using the ASK modulation scheme.
     Usa o mapeamento de possíveis finais para converter os sinais em amplitudes.
     """
     expanded = np.repeat(bits, self.samples_per_bit)
-    time = np.linspace(0, bits.size / self.bit_rate, expanded.size, endpoint=False)
-    return expanded * np.sin(2 * np.pi * self.carrier_frequency * time)
+    return expanded * self.carrier(expanded.size, offset=offset)
 
-  def demodulate(self, signal: np.ndarray) -> np.ndarray:
+  def demodulate(self, signal: np.ndarray, offset: int = 0) -> np.ndarray:
     """
     Demodulate a signal using the ASK modulation scheme.
     Envelope detection com mapeamento reverso para os sinais originais.
     """
     # Calcula a energia do sinal em janelas do tamanho de um bit
-    energy = np.zeros(len(signal) // self.samples_per_bit)
-    
-    for i in range(len(energy)):
-        start_idx = i * self.samples_per_bit
-        end_idx = start_idx + self.samples_per_bit
-        
-        if end_idx <= len(signal):
-            # Calcula a energia da janela atual
-            window_energy = np.sum(signal[start_idx:end_idx] ** 2)
-            energy[i] = window_energy
+    energy = self.bit_energies(signal)
     
     # Normaliza a energia e mapeia para bits (0 ou 1)
     # Usa um limiar baseado na média da energia
     threshold = np.mean(energy)
     demodulated_bits = (energy > threshold).astype(int)
     return demodulated_bits
+
+  def baseband_map(self, bits: np.ndarray) -> np.ndarray:
+    """Complex envelope of each bit: the amplitude of the sine carrier, -j * bit."""
+    return -1j * np.asarray(bits, dtype=float)[:, None]
+
+  def baseband_decide(self, symbols: np.ndarray) -> np.ndarray:
+    """Energy detection of one matched-filter output per bit, with the mean-energy threshold."""
+    return self._detect_energy(np.abs(symbols[..., 0]) ** 2)
+
+  def demodulate_baseband(self, signal: np.ndarray, oversampling: int = 1) -> np.ndarray:
+    """
+    Energy detection over all the complex samples of each bit. The passband
+    detector integrates the noise of samples_per_bit real dimensions, so its
+    BER is reproduced exactly with oversampling = samples_per_bit // 2; fewer
+    samples model a receiver filtered to the signal bandwidth, with lower BER.
+    """
+    signal = np.asarray(signal)
+    num_bits = signal.shape[-1] // oversampling
+    windows = signal[..., :num_bits * oversampling].reshape(signal.shape[:-1] + (num_bits, oversampling))
+    return self._detect_energy((np.abs(windows) ** 2).sum(axis=-1))
+
+  def _detect_energy(self, energy: np.ndarray) -> np.ndarray:
+    """Map bit energies to bits with a threshold at their mean."""
+    threshold = np.mean(energy, axis=-1, keepdims=True)
+    return (energy > threshold).astype(int)
+
+  def demodulate_stream(self, sample_chunks: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+    """
+    Demodulate an ASK signal received in chunks. The threshold is the mean
+    energy of all the bits received so far, including the current chunk.
+    """
+    total_energy = 0.0
+    total_bits = 0
+    for signal in rechunk(sample_chunks, self.samples_per_bit, flush=False):
+      energy = self.bit_energies(signal)
+      total_energy += energy.sum()
+      total_bits += energy.size
+      yield (energy > total_energy / total_bits).astype(int)
+
+  def bit_energies(self, signal: np.ndarray) -> np.ndarray:
+    """Energy of the signal in each bit period; a trailing partial period is ignored."""
+    signal = np.asarray(signal)
+    num_bits = len(signal) // self.samples_per_bit
+    windows = signal[:num_bits * self.samples_per_bit].reshape(num_bits, self.samples_per_bit)
+    return np.einsum("ij,ij->i", windows, windows)
@@ -1,4 +1,5 @@
 import numpy as np
+from typing import Iterable, Iterator
 from .digital_modulator import DigitalModulator
 
 class BipolarModulator(DigitalModulator):
@@ -14,16 +15,33 @@ class BipolarModulator(DigitalModulator):
         Returns:
         np.ndarray: Bipolar modulated signal.
         """
-        bipolar_signal = np.array([])
-        inverted = False
-        for bit in bits:
-            if bit == 1:
-                bipolar_signal = np.append(bipolar_signal, 1 if not inverted else -1)
-                inverted = not inverted
-            else:
-                bipolar_signal = np.append(bipolar_signal, 0)
+        # Marks alternate polarity: the n-th '1' is +1 when n is odd, -1 when even
+        ones = np.asarray(bits) == 1
+        levels = np.where(ones, 1 - 2 * ((np.cumsum(ones) - 1) % 2), 0)
+
+        bipolar_signal = np.empty((levels.size, self.samples_per_bit), dtype=np.float32)
+        bipolar_signal[:] = levels[:, None]
+        return bipolar_signal.ravel()
 
-        return np.repeat(bipolar_signal, self.samples_per_bit).astype(np.float32)
+    def modulate_stream(self, bit_chunks: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+        """
+        Modulate a bit stream chunk by chunk. The polarity of the last mark
+        is carried across chunks, so marks keep alternating at the boundaries.
+        
+        Parameters:
+        bit_chunks (Iterable[np.ndarray]): Consecutive pieces of the bit stream.
+        
+        Returns:
+        Iterator[np.ndarray]: Bipolar signal of each chunk.
+        """
+        inverted = False
+        for bits in bit_chunks:
+            signal = self.modulate(bits)
+            if inverted:
+                np.subtract(0, signal, out=signal)
+            # An odd number of marks flips the polarity of the next chunk
+            inverted ^= bool(np.count_nonzero(np.asarray(bits) == 1) % 2)
+            yield signal
 
     def demodulate(self, signal: np.ndarray) -> np.ndarray:
         """
@@ -31,27 +49,15 @@ class BipolarModulator(DigitalModulator):
         Uses energy-based detection by calculating the energy of each bit period.
         
         Parameters:
-        signal (np.ndarray): Bipolar signal to demodulate.
+        signal (np.ndarray): Bipolar signal to demodulate, or a 2-D batch of signals.
         
         Returns:
         np.ndarray: Demodulated bits.
         """
-        num_bits = len(signal) // self.samples_per_bit
-        demodulated_bits = np.zeros(num_bits, dtype=int)
-        
-        for i in range(num_bits):
-            start_idx = i * self.samples_per_bit
-            end_idx = start_idx + self.samples_per_bit
-            bit_period = signal[start_idx:end_idx]
-            
-            # Calculate energy of the bit period
-            energy = np.sum(bit_period ** 2)
-            
-            # For bipolar encoding:
-            # - Bit '0' has zero amplitude (energy ≈ 0)
-            # - Bit '1' has non-zero amplitude (energy > 0)
-            # Use energy threshold to distinguish between 0 and 1
-            threshold = 0.5 * self.samples_per_bit  # Energy threshold
-            demodulated_bits[i] = 1 if energy > threshold else 0
-            
-        return demodulated_bits
\ No newline at end of file
+        # For bipolar encoding:
+        # - Bit '0' has zero amplitude (energy ≈ 0)
+        # - Bit '1' has non-zero amplitude (energy > 0)
+        # Use energy threshold to distinguish between 0 and 1
+        energy = self.integrate_and_dump(signal, square=True)
+        threshold = 0.5 * self.samples_per_bit  # Energy threshold
+        return (energy > threshold).astype(int)
\ No newline at end of file
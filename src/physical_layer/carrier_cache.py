@@ -0,0 +1,83 @@
+from collections import OrderedDict
+from threading import Lock
+import numpy as np
+
+
+class CarrierCache:
+  """Bounded LRU cache of read-only carrier waveforms.
+  Entries are sin(2*pi*frequency*t + phase) for t = arange(length) / sample_rate.
+  A request that is shorter than a cached carrier with the same frequency,
+  phase and sample rate is served as a view of its first samples.
+  """
+  def __init__(self, max_entries: int = 64, max_bytes: int = 256 * 2**20):
+    """
+    Initialize the cache.
+
+    Parameters:
+    max_entries (int): Maximum number of carriers kept.
+    max_bytes (int): Maximum total size of the carriers kept, in bytes.
+    """
+    self.max_entries = max_entries
+    self.max_bytes = max_bytes
+    self._entries = OrderedDict()
+    self._lock = Lock()
+    self.clear()
+
+  def get(self, frequency: float, phase: float, sample_rate: float, length: int) -> np.ndarray:
+    """
+    Return the carrier sin(2*pi*frequency*t + phase), computing it on a miss.
+
+    Parameters:
+    frequency (float): Carrier frequency in Hz.
+    phase (float): Phase offset in radians.
+    sample_rate (float): Sample rate in Hz.
+    length (int): Number of samples.
+
+    Returns:
+    np.ndarray: Read-only carrier of the requested length.
+    """
+    key = (float(frequency), float(phase), float(sample_rate))
+    with self._lock:
+      carrier = self._entries.get(key)
+      if carrier is not None and carrier.size >= length:
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return carrier[:length]
+      self.misses += 1
+
+    time = np.arange(length) / sample_rate
+    carrier = np.sin(2 * np.pi * frequency * time + phase)
+    carrier.flags.writeable = False
+
+    with self._lock:
+      if key in self._entries:
+        self.size_bytes -= self._entries.pop(key).nbytes
+      if carrier.nbytes <= self.max_bytes:
+        self._entries[key] = carrier
+        self.size_bytes += carrier.nbytes
+        while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+          self.size_bytes -= self._entries.popitem(last=False)[1].nbytes
+          self.evictions += 1
+    return carrier
+
+  def clear(self) -> None:
+    """Drop every carrier and reset the counters."""
+    with self._lock:
+      self._entries.clear()
+      self.size_bytes = 0
+      self.hits = 0
+      self.misses = 0
+      self.evictions = 0
+
+  def stats(self) -> dict:
+    """Return the cache counters, to help sizing it."""
+    with self._lock:
+      requests = self.hits + self.misses
+      return {
+        "hits": self.hits,
+        "misses": self.misses,
+        "evictions": self.evictions,
+        "hit_rate": self.hits / requests if requests else 0.0,
+        "entries": len(self._entries),
+        "bytes": self.size_bytes,
+      }
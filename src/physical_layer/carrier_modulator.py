@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
+from typing import Iterable, Iterator
 import numpy as np
+from .carrier_cache import CarrierCache
+from .digital_modulator import rechunk
 
 
 class CarrierModulator:
@@ -7,6 +10,11 @@ class CarrierModulator:
   This class defines the interface for carrier modulation schemes.
   It includes methods for modulation and demodulation of signals.
   """
+  # Carrier waveforms shared by every carrier modulator
+  carrier_cache = CarrierCache()
+  # Whether the carrier time base runs over the whole signal or restarts at each symbol
+  continuous_phase = True
+
   def __init__(self, carrier_frequency: float, bit_rate: float, sample_rate: float):
     """
     Initialize the carrier modulator.
@@ -19,14 +27,21 @@ class CarrierModulator:
     self.bit_rate = bit_rate
     self.sample_rate = sample_rate
     self.samples_per_bit = int(sample_rate / bit_rate)
+    # Schemes carrying several bits per symbol override these
+    self.bits_per_symbol = 1
+    self.samples_per_symbol = self.samples_per_bit
+    # One complex baseband dimension per carrier
+    self.carrier_frequencies = np.array([carrier_frequency])
 
   @abstractmethod
-  def modulate(self, bits: np.ndarray) -> np.ndarray:
+  def modulate(self, bits: np.ndarray, offset: int = 0) -> np.ndarray:
     """
     Modulate a signal using the carrier modulation scheme.
 
     Parameters:
     signal (np.ndarray): Signal to modulate.
+    offset (int): Index of the first output sample in the whole stream,
+                  which sets the carrier phase at the start.
 
     Returns:
     np.ndarray: Modulated signal.
@@ -34,17 +49,253 @@ class CarrierModulator:
     pass
 
   @abstractmethod
-  def demodulate(self, signal: np.ndarray) -> np.ndarray:
+  def demodulate(self, signal: np.ndarray, offset: int = 0) -> np.ndarray:
     """
     Demodulate a signal using the carrier modulation scheme.
 
     Parameters:
     signal (np.ndarray): Signal to demodulate.
+    offset (int): Index of the first sample of signal in the whole stream.
 
     Returns:
     np.ndarray: Demodulated signal.
     """
     pass
 
+  @abstractmethod
+  def baseband_map(self, bits: np.ndarray) -> np.ndarray:
+    """
+    Complex envelope x of every symbol, such that the passband symbol is
+    Re(x * exp(j*2*pi*f*t)) on each carrier frequency f.
+
+    Parameters:
+    bits (np.ndarray): Array of bits to modulate.
+
+    Returns:
+    np.ndarray: Complex array with shape (num_symbols, len(carrier_frequencies)).
+    """
+    pass
+
+  @abstractmethod
+  def baseband_decide(self, symbols: np.ndarray) -> np.ndarray:
+    """
+    Detect bits from the matched-filter outputs of every symbol, with the
+    same decision rule as demodulate.
+
+    Parameters:
+    symbols (np.ndarray): Complex array with shape (..., num_symbols, len(carrier_frequencies)).
+
+    Returns:
+    np.ndarray: Demodulated bits.
+    """
+    pass
+
+  def modulate_baseband(self, bits: np.ndarray, oversampling: int = 1) -> np.ndarray:
+    """
+    Complex-baseband equivalent of modulate, with oversampling complex
+    samples per symbol and carrier instead of samples_per_symbol real ones.
+
+    The samples are scaled so that adding complex noise with the standard
+    deviation of the passband noise to each of I and Q gives the detector
+    the same statistics as the passband signal: a coherent correlator over
+    N = samples_per_symbol samples sees the signal scaled by N/2 and noise
+    with variance N/2 per component, so the envelope is scaled by sqrt(N/2).
+
+    Parameters:
+    bits (np.ndarray): Array of bits to modulate.
+    oversampling (int): Complex samples per symbol and carrier.
+
+    Returns:
+    np.ndarray: Complex baseband signal.
+    """
+    scale = np.sqrt(self.samples_per_symbol / (2 * oversampling))
+    symbols = self.baseband_map(bits) * scale
+    return np.repeat(symbols, oversampling, axis=-1).ravel()
+
+  def demodulate_baseband(self, signal: np.ndarray, oversampling: int = 1) -> np.ndarray:
+    """
+    Demodulate a complex baseband signal from modulate_baseband.
+
+    Parameters:
+    signal (np.ndarray): Complex baseband signal, 1-D or a batch with shape (..., samples).
+    oversampling (int): Complex samples per symbol and carrier.
+
+    Returns:
+    np.ndarray: Demodulated bits.
+    """
+    return self.baseband_decide(self.baseband_projections(signal, oversampling))
+
+  def baseband_projections(self, signal: np.ndarray, oversampling: int = 1) -> np.ndarray:
+    """
+    Matched-filter output of every symbol and carrier: the sum of its
+    oversampling samples, normalised so the noise keeps its variance.
+
+    Returns:
+    np.ndarray: Complex array with shape (..., num_symbols, len(carrier_frequencies)).
+    """
+    signal = np.asarray(signal)
+    dimensions = len(self.carrier_frequencies)
+    block = dimensions * oversampling
+    num_symbols = signal.shape[-1] // block
+    windows = signal[..., :num_symbols * block]
+    windows = windows.reshape(signal.shape[:-1] + (num_symbols, dimensions, oversampling))
+    return windows.sum(axis=-1) / np.sqrt(oversampling)
+
+  def baseband_to_passband(self, signal: np.ndarray, oversampling: int = 1) -> np.ndarray:
+    """
+    Synthesize the passband waveform of a complex baseband signal, e.g. to
+    plot it. Noise in the baseband signal is rendered as in-band noise only.
+
+    Parameters:
+    signal (np.ndarray): 1-D complex baseband signal.
+    oversampling (int): Complex samples per symbol and carrier.
+
+    Returns:
+    np.ndarray: Real passband signal with samples_per_symbol samples per symbol.
+    """
+    envelope = self.baseband_projections(signal, oversampling) / np.sqrt(self.samples_per_symbol / 2)
+    if self.continuous_phase:
+      # Carrier phase of every tone at the first sample of each symbol
+      cycles_per_symbol = (self.carrier_frequencies * self.samples_per_symbol / self.sample_rate) % 1.0
+      start_phase = 2 * np.pi * ((np.arange(envelope.shape[0])[:, None] * cycles_per_symbol) % 1.0)
+      envelope = envelope * np.exp(1j * start_phase)
+
+    # Re(x * exp(j*w*t)) = Re(x) * cos(w*t) + Im(x) * (-sin(w*t))
+    bank = np.concatenate([
+      self.iq_carriers(frequency, self.sample_rate, self.samples_per_symbol)
+      for frequency in self.carrier_frequencies
+    ])
+    coordinates = np.stack((envelope.real, envelope.imag), axis=-1).reshape(envelope.shape[0], -1)
+    return (coordinates @ bank).ravel()
+
+  def modulate_stream(self, bit_chunks: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+    """
+    Modulate a bit stream chunk by chunk, so memory is bounded by the chunk
+    size instead of the message length. Bits of a symbol split between
+    chunks are kept until the symbol is complete, and each chunk starts at
+    the carrier phase where the previous one ended.
+
+    Parameters:
+    bit_chunks (Iterable[np.ndarray]): Consecutive pieces of the bit stream.
+
+    Returns:
+    Iterator[np.ndarray]: Modulated signal of each group of whole symbols.
+    """
+    offset = 0
+    for bits in rechunk(bit_chunks, self.bits_per_symbol):
+      signal = self.modulate(bits, offset)
+      offset += signal.shape[-1]
+      yield signal
+
+  def demodulate_stream(self, sample_chunks: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+    """
+    Demodulate a signal received in chunks of any size. Samples of a symbol
+    split between chunks are kept until the symbol is complete, and the
+    reference carriers continue the phase of the previous chunk.
+
+    Parameters:
+    sample_chunks (Iterable[np.ndarray]): Consecutive pieces of the signal.
+
+    Returns:
+    Iterator[np.ndarray]: Demodulated bits of every complete symbol.
+    """
+    offset = 0
+    for signal in rechunk(sample_chunks, self.samples_per_symbol, flush=False):
+      yield self.demodulate(signal, offset)
+      offset += signal.shape[-1]
+
+  def iq_demodulate(self, signal: np.ndarray, samples_per_symbol: int, continuous_phase: bool = True,
+                    offset: int = 0) -> np.ndarray:
+    """
+    Coherent I/Q receiver. Each symbol window is projected onto the cosine
+    and sine carriers with one matrix product, giving the complex baseband
+    value z = sum(signal * exp(-j*2*pi*fc*t)) of every symbol. A received
+    A*cos(2*pi*fc*t + phase) symbol yields z proportional to A*exp(j*phase).
+
+    Parameters:
+    signal (np.ndarray): Received signal, 1-D or a batch with shape (..., samples).
+    samples_per_symbol (int): Number of samples in each symbol window.
+    continuous_phase (bool): If True the carrier time base runs over the whole
+                             signal; if False it restarts at every symbol.
+    offset (int): Index of the first sample of signal in the whole stream,
+                  used by the continuous time base.
+
+    Returns:
+    np.ndarray: Complex value of each symbol, shape (..., num_symbols).
+    """
+    signal = np.asarray(signal)
+    num_symbols = signal.shape[-1] // samples_per_symbol
+    windows = signal[..., :num_symbols * samples_per_symbol]
+    windows = windows.reshape(signal.shape[:-1] + (num_symbols, samples_per_symbol))
+
+    carriers = self.iq_carriers(self.carrier_frequency, self.sample_rate, samples_per_symbol)
+    projections = windows @ carriers.T
+    symbols = projections[..., 0] + 1j * projections[..., 1]
+
+    if continuous_phase:
+      # Rotate each window by the carrier phase at its first sample
+      cycles_per_symbol = (self.carrier_frequency * samples_per_symbol / self.sample_rate) % 1.0
+      start_cycles = (self.carrier_frequency * offset / self.sample_rate) % 1.0
+      start_phase = 2 * np.pi * ((start_cycles + cycles_per_symbol * np.arange(num_symbols)) % 1.0)
+      symbols = symbols * np.exp(-1j * start_phase)
+    return symbols
+
+  @staticmethod
+  def decide(symbols: np.ndarray, constellation: np.ndarray) -> np.ndarray:
+    """
+    Map received complex symbols to the constellation point with the
+    highest correlation Re(conj(point) * symbol), which is the nearest
+    point for equal-energy constellations.
+
+    Parameters:
+    symbols (np.ndarray): Complex symbols from iq_demodulate.
+    constellation (np.ndarray): Complex constellation points.
+
+    Returns:
+    np.ndarray: Index of the chosen constellation point for each symbol.
+    """
+    correlation = (symbols[..., None] * np.conj(constellation)).real
+    return np.argmax(correlation, axis=-1)
+
+  @classmethod
+  def iq_carriers(cls, carrier_frequency: float, sample_rate: float, length: int) -> np.ndarray:
+    """
+    (2, length) array with cos(2*pi*fc*t) and -sin(2*pi*fc*t)
+    for t = arange(length) / sample_rate, built from the carrier cache.
+    """
+    return np.stack((
+      cls.carrier_cache.get(carrier_frequency, np.pi / 2, sample_rate, length),
+      cls.carrier_cache.get(carrier_frequency, np.pi, sample_rate, length),
+    ))
+
+  def carrier(self, length: int, frequency: float | None = None, phase: float = 0.0, offset: int = 0) -> np.ndarray:
+    """
+    Carrier sin(2*pi*f*t + phase) on the time base of the modulated signal
+    (samples_per_bit samples per bit), from the carrier cache.
+
+    Parameters:
+    length (int): Number of samples.
+    frequency (float | None): Carrier frequency. Defaults to carrier_frequency.
+    phase (float): Phase offset in radians.
+    offset (int): Index of the first sample; a non-zero offset rotates the
+                  cached carriers instead of caching one carrier per offset.
+
+    Returns:
+    np.ndarray: Carrier samples, read-only when offset is 0.
+    """
+    if frequency is None:
+      frequency = self.carrier_frequency
+    rate = self.bit_rate * self.samples_per_bit
+    carrier = self.carrier_cache.get(frequency, phase, rate, length)
+    if not offset:
+      return carrier
+
+    # sin(x + d) = sin(x) * cos(d) + cos(x) * sin(d)
+    delay = 2 * np.pi * ((frequency * offset / rate) % 1.0)
+    quadrature = self.carrier_cache.get(frequency, phase + np.pi / 2, rate, length)
+    shifted = carrier * np.cos(delay)
+    shifted += quadrature * np.sin(delay)
+    return shifted
+
   def get_time(self, signal: np.ndarray) -> np.ndarray:
     return np.arange(len(signal)) / self.sample_rate
\ No newline at end of file
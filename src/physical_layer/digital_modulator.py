@@ -1,5 +1,34 @@
 import numpy as np
 from abc import ABC, abstractmethod
+from typing import Iterable, Iterator
+
+
+def rechunk(chunks: Iterable[np.ndarray], block_size: int, flush: bool = True) -> Iterator[np.ndarray]:
+    """
+    Regroup a stream of 1-D arrays into pieces that hold a whole number of
+    blocks (bits of a symbol, samples of a bit period, ...). The partial
+    block at the end of a chunk is carried over to the next one.
+    
+    Parameters:
+    chunks (Iterable[np.ndarray]): Consecutive pieces of the stream.
+    block_size (int): Number of elements in a block.
+    flush (bool): Yield the leftover partial block when the stream ends.
+    
+    Returns:
+    Iterator[np.ndarray]: Non-empty pieces whose sizes are multiples of
+                          block_size, except possibly the flushed one.
+    """
+    tail = None
+    for chunk in chunks:
+        chunk = np.asarray(chunk)
+        buffer = np.concatenate((tail, chunk)) if tail is not None and tail.size else chunk
+        whole = buffer.size - buffer.size % block_size
+        tail = buffer[whole:].copy()
+        if whole:
+            yield buffer[:whole]
+    if flush and tail is not None and tail.size:
+        yield tail
+
 
 class DigitalModulator:
     """Abstract base class for digital modulators.
@@ -37,6 +66,63 @@ class DigitalModulator:
         """
         pass
 
+    def modulate_stream(self, bit_chunks: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+        """
+        Modulate a bit stream chunk by chunk, so memory is bounded by the
+        chunk size instead of the message length. Concatenating the output
+        gives the same signal as modulating the whole message.
+        
+        Parameters:
+        bit_chunks (Iterable[np.ndarray]): Consecutive pieces of the bit stream.
+        
+        Returns:
+        Iterator[np.ndarray]: Modulated signal of each chunk.
+        """
+        for bits in bit_chunks:
+            yield self.modulate(bits)
+
+    def demodulate_stream(self, sample_chunks: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+        """
+        Demodulate a signal received in chunks of any size. Samples of a
+        bit period split between chunks are kept until the period is complete;
+        a trailing partial period is ignored, as in demodulate.
+        
+        Parameters:
+        sample_chunks (Iterable[np.ndarray]): Consecutive pieces of the signal.
+        
+        Returns:
+        Iterator[np.ndarray]: Demodulated bits of every complete bit period.
+        """
+        for signal in rechunk(sample_chunks, self.samples_per_bit, flush=False):
+            yield self.demodulate(signal)
+
+    def integrate_and_dump(self, signal: np.ndarray, start: int = 0, stop: int | None = None, square: bool = False) -> np.ndarray:
+        """
+        Integrate the signal over each bit period (integrate-and-dump filter).
+        The signal is reshaped into (num_bits, samples_per_bit) windows and
+        reduced in a single vectorized pass; trailing samples that do not
+        fill a whole bit period are ignored.
+        
+        Parameters:
+        signal (np.ndarray): Signal to integrate, 1-D or a 2-D batch of
+                             signals with shape (batch, samples).
+        start (int): First sample of each bit period to integrate.
+        stop (int | None): End (exclusive) of the integration window inside
+                           each bit period. Defaults to the whole period.
+        square (bool): Integrate the signal energy (squared samples) instead
+                       of the amplitude.
+        
+        Returns:
+        np.ndarray: Integrated value per bit, shape (num_bits,) or (batch, num_bits).
+        """
+        signal = np.asarray(signal)
+        num_bits = signal.shape[-1] // self.samples_per_bit
+        windows = signal[..., :num_bits * self.samples_per_bit]
+        windows = windows.reshape(signal.shape[:-1] + (num_bits, self.samples_per_bit))[..., start:stop]
+        if square:
+            return np.einsum("...i,...i->...", windows, windows)
+        return windows.sum(axis=-1)
+
     def get_time(self, signal: np.ndarray) -> np.ndarray:
         """
         Get the time array for the signal.
@@ -2,63 +2,175 @@ from .carrier_modulator import CarrierModulator
 import numpy as np
 
 class FSKCarrierModulator(CarrierModulator):
-  def __init__(self, carrier_frequency: float, bit_rate: float, sample_rate: float, delta_frequency: float = 1e6):
+  """Carrier modulator for Frequency Shift Keying (FSK).
+  Binary by default; with more tones every symbol carries log2(tones) bits
+  (M-ary FSK) on frequencies carrier_frequency + k * delta_frequency.
+  """
+  DETECTORS = ("coherent", "energy", "goertzel")
+
+  def __init__(self, carrier_frequency: float, bit_rate: float, sample_rate: float, delta_frequency: float = 1e6,
+               tones: int = 2, detector: str = "coherent"):
+    """
+    Initialize the FSK modulator.
+
+    Parameters:
+    carrier_frequency (float): Frequency of the lowest tone.
+    bit_rate (float): Bit rate of the modulated signal.
+    sample_rate (float): Sample rate of the modulated signal.
+    delta_frequency (float): Spacing between neighbouring tones.
+    tones (int): Number of tones, a power of two.
+    detector (str): "coherent" correlates each symbol with the transmitted
+                    sine of every tone. "energy" is a non-coherent detector
+                    that compares tone energies and ignores the carrier phase.
+                    "goertzel" computes the same energies with a Goertzel
+                    filter per tone, which needs no reference waveforms and
+                    suits long captures.
+    """
     super().__init__(carrier_frequency, bit_rate, sample_rate)
-    self.carrier_frequencies = np.array([carrier_frequency, carrier_frequency + delta_frequency])
+    if tones < 2 or tones & (tones - 1):
+      raise ValueError("Number of tones must be a power of two.")
+    if detector not in self.DETECTORS:
+      raise ValueError(f"Detector must be one of {self.DETECTORS}.")
 
-  def modulate(self, bits: np.ndarray) -> np.ndarray:
+    self.carrier_frequencies = carrier_frequency + delta_frequency * np.arange(tones)
+    self.bits_per_symbol = tones.bit_length() - 1
+    self.samples_per_symbol = self.bits_per_symbol * self.samples_per_bit
+    self.detector = detector
+
+  def modulate(self, bits: np.ndarray, offset: int = 0) -> np.ndarray:
     """
     Modulate a signal using the FSK modulation scheme.
     Maps bits to different carrier frequencies.
     """
-    expanded = np.repeat(bits, self.samples_per_bit)
-    frequencies = np.where(expanded == 1, self.carrier_frequencies[1], self.carrier_frequencies[0])
-    
-    # Create time array for the signal
-    time = np.linspace(0, bits.size / self.bit_rate, expanded.size, endpoint=False)
-    
-    return np.sin(2 * np.pi * frequencies * time)
-
-  def demodulate(self, signal: np.ndarray) -> np.ndarray:
+    symbols = self._symbols(bits)
+
+    # Copy each symbol window from the cached carrier of its tone
+    signal = np.empty((symbols.size, self.samples_per_symbol))
+    for tone, frequency in enumerate(self.carrier_frequencies):
+      selected = symbols == tone
+      if selected.any():
+        carrier = self.carrier(signal.size, frequency, offset=offset).reshape(signal.shape)
+        signal[selected] = carrier[selected]
+    return signal.ravel()
+
+  def demodulate(self, signal: np.ndarray, offset: int = 0) -> np.ndarray:
     """
-    Demodulate an FSK signal by correlating with reference signals at both carrier frequencies.
-    
+    Demodulate an FSK signal by correlating every symbol window with all the
+    tones at once. The tone with the highest correlation (coherent detector)
+    or energy (non-coherent detectors) is taken as transmitted.
+
     Parameters:
-    signal (np.ndarray): Received FSK signal to demodulate.
-    
+    signal (np.ndarray): Received FSK signal to demodulate, or a 2-D batch of signals.
+    offset (int): Index of the first sample of signal in the whole stream.
+
     Returns:
     np.ndarray: Demodulated bits (0s and 1s).
     """
-    # Calculate the number of bits based on signal length and samples per bit
-    num_bits = len(signal) // self.samples_per_bit
-    
-    # Create time array for the signal
-    t = np.arange(len(signal)) / self.sample_rate
-    
-    # Create reference signals for both frequencies
-    ref_signal_0 = np.sin(2 * np.pi * self.carrier_frequencies[0] * t)
-    ref_signal_1 = np.sin(2 * np.pi * self.carrier_frequencies[1] * t)
-    
-    # Initialize output bits array
-    bits = np.zeros(num_bits, dtype=int)
-    
-    # Demodulate each bit by correlating with reference signals
-    for i in range(num_bits):
-        start_idx = i * self.samples_per_bit
-        end_idx = start_idx + self.samples_per_bit
-        
-        # Extract the signal segment for this bit
-        signal_segment = signal[start_idx:end_idx]
-        ref_0_segment = ref_signal_0[start_idx:end_idx]
-        ref_1_segment = ref_signal_1[start_idx:end_idx]
-        
-        # Calculate correlation with both reference signals
-        corr_0 = np.corrcoef(signal_segment, ref_0_segment)[0, 1]
-        corr_1 = np.corrcoef(signal_segment, ref_1_segment)[0, 1]
-        
-        # Determine which frequency was more likely transmitted
-        # Higher correlation indicates the transmitted frequency
-        bits[i] = 1 if corr_1 > corr_0 else 0
-    
-    return bits
+    if self.detector == "coherent":
+      # Correlation with sin(2π*f*t) over the continuous time base is -Im(z)
+      metric = -self.tone_projections(signal, continuous_phase=True, offset=offset).imag
+    else:
+      metric = self.tone_energies(signal)
+    return self._bits(np.argmax(metric, axis=-1))
+
+  def baseband_map(self, bits: np.ndarray) -> np.ndarray:
+    """Complex envelope of each symbol on every tone: -j on the sent tone, 0 elsewhere."""
+    symbols = self._symbols(bits)
+    envelope = np.zeros((symbols.size, len(self.carrier_frequencies)), dtype=complex)
+    envelope[np.arange(symbols.size), symbols] = -1j
+    return envelope
+
+  def baseband_decide(self, symbols: np.ndarray) -> np.ndarray:
+    """
+    Pick the tone with the highest matched-filter output, with the metric
+    of the configured detector (sine correlation or energy).
+    """
+    if self.detector == "coherent":
+      metric = -symbols.imag
+    else:
+      metric = np.abs(symbols) ** 2
+    return self._bits(np.argmax(metric, axis=-1))
+
+  def _symbols(self, bits: np.ndarray) -> np.ndarray:
+    """Zero-pad the bits to whole symbols and return the tone index of each symbol."""
+    # Ensure number of bits is a multiple of the bits per symbol
+    if len(bits) % self.bits_per_symbol != 0:
+      padding_length = self.bits_per_symbol - len(bits) % self.bits_per_symbol
+      bits = np.append(bits, np.zeros(padding_length))
+
+    # Tone index of each symbol, most significant bit first
+    weights = 1 << np.arange(self.bits_per_symbol)[::-1]
+    return (np.asarray(bits).reshape(-1, self.bits_per_symbol) == 1) @ weights
+
+  def _bits(self, symbols: np.ndarray) -> np.ndarray:
+    """Unpack tone indices into bits, most significant first."""
+    bits = (symbols[..., None] >> np.arange(self.bits_per_symbol)[::-1]) & 1
+    return bits.reshape(symbols.shape[:-1] + (-1,))
+
+  def tone_projections(self, signal: np.ndarray, continuous_phase: bool = False, offset: int = 0) -> np.ndarray:
+    """
+    Complex projection z = sum(signal * exp(-j*2*pi*f*t)) of every symbol
+    window on every tone, computed with one matrix product against a bank
+    of (cos, -sin) references.
+
+    Parameters:
+    signal (np.ndarray): Received signal, 1-D or a batch with shape (..., samples).
+    continuous_phase (bool): If True the time base runs over the whole signal;
+                             if False it restarts at every symbol.
+    offset (int): Index of the first sample of signal in the whole stream,
+                  used by the continuous time base.
+
+    Returns:
+    np.ndarray: Projections with shape (..., num_symbols, tones).
+    """
+    windows = self._windows(signal)
+    bank = np.concatenate([
+      self.iq_carriers(frequency, self.sample_rate, self.samples_per_symbol)
+      for frequency in self.carrier_frequencies
+    ])
+    projections = windows @ bank.T
+    symbols = projections[..., 0::2] + 1j * projections[..., 1::2]
+
+    if continuous_phase:
+      # Rotate each window by the phase of every tone at its first sample
+      cycles_per_symbol = (self.carrier_frequencies * self.samples_per_symbol / self.sample_rate) % 1.0
+      start_cycles = (self.carrier_frequencies * offset / self.sample_rate) % 1.0
+      start_phase = 2 * np.pi * ((start_cycles + np.arange(windows.shape[-2])[:, None] * cycles_per_symbol) % 1.0)
+      symbols = symbols * np.exp(-1j * start_phase)
+    return symbols
+
+  def tone_energies(self, signal: np.ndarray) -> np.ndarray:
+    """
+    Energy |z|^2 of every tone in every symbol window. It does not depend on
+    the carrier phase, so the time base restarts at each window.
+
+    Parameters:
+    signal (np.ndarray): Received signal, 1-D or a batch with shape (..., samples).
+
+    Returns:
+    np.ndarray: Energies with shape (..., num_symbols, tones).
+    """
+    if self.detector == "goertzel":
+      return self._goertzel(self._windows(signal))
+    return np.abs(self.tone_projections(signal)) ** 2
+
+  def _windows(self, signal: np.ndarray) -> np.ndarray:
+    """Reshape the signal into (..., num_symbols, samples_per_symbol) windows."""
+    signal = np.asarray(signal)
+    num_symbols = signal.shape[-1] // self.samples_per_symbol
+    windows = signal[..., :num_symbols * self.samples_per_symbol]
+    return windows.reshape(signal.shape[:-1] + (num_symbols, self.samples_per_symbol))
+
+  def _goertzel(self, windows: np.ndarray) -> np.ndarray:
+    """Goertzel filter of every tone, run over the samples of all windows at once."""
+    coefficients = 2 * np.cos(2 * np.pi * self.carrier_frequencies / self.sample_rate)
+    state_shape = windows.shape[:-1] + (len(self.carrier_frequencies),)
+    previous = np.zeros(state_shape)
+    before_previous = np.zeros(state_shape)
+
+    for n in range(windows.shape[-1]):
+      current = windows[..., n, None] + coefficients * previous - before_previous
+      before_previous = previous
+      previous = current
 
+    return previous ** 2 + before_previous ** 2 - coefficients * previous * before_previous
@@ -14,14 +14,12 @@ class ManchesterModulator(DigitalModulator):
         Returns:
         np.ndarray: Manchester modulated signal.
         """
-        manchester_signal = np.array([])
-        for bit in bits:
-            if bit == 0:
-                manchester_signal = np.append(manchester_signal, [0, 1])
-            else:
-                manchester_signal = np.append(manchester_signal, [1, 0])
-        
-        return np.repeat(manchester_signal, self.samples_per_bit//2).astype(np.float32)
+        # Bit '0' is low-high, any other bit is high-low
+        high_first = np.asarray(bits) != 0
+        manchester_signal = np.empty((high_first.size, 2, self.samples_per_bit // 2), dtype=np.float32)
+        manchester_signal[:, 0, :] = high_first[:, None]
+        manchester_signal[:, 1, :] = ~high_first[:, None]
+        return manchester_signal.ravel()
     
     def demodulate(self, signal: np.ndarray) -> np.ndarray:
         """
@@ -29,33 +27,18 @@ class ManchesterModulator(DigitalModulator):
         Uses energy-based detection by calculating the energy of each half-bit period.
         
         Parameters:
-        signal (np.ndarray): Manchester signal to demodulate.
+        signal (np.ndarray): Manchester signal to demodulate, or a 2-D batch of signals.
         
         Returns:
         np.ndarray: Demodulated bits.
         """
-        num_bits = len(signal) // self.samples_per_bit
-        demodulated_bits = np.zeros(num_bits, dtype=int)
+        # Split the bit period into two halves and calculate the energy of each
+        half_period = self.samples_per_bit // 2
+        energy_first = self.integrate_and_dump(signal, stop=half_period, square=True)
+        energy_second = self.integrate_and_dump(signal, start=half_period, square=True)
         
-        for i in range(num_bits):
-            start_idx = i * self.samples_per_bit
-            end_idx = start_idx + self.samples_per_bit
-            bit_period = signal[start_idx:end_idx]
-            
-            # Split the bit period into two halves
-            half_period = self.samples_per_bit // 2
-            first_half = bit_period[:half_period]
-            second_half = bit_period[half_period:]
-            
-            # Calculate energy of each half
-            energy_first = np.sum(first_half ** 2)
-            energy_second = np.sum(second_half ** 2)
-            
-            # For Manchester encoding:
-            # - Bit '0': low-high (0->1) pattern
-            # - Bit '1': high-low (1->0) pattern
-            # Compare energy of first half vs second half
-            demodulated_bits[i] = 1 if energy_first > energy_second else 0
-            
-        return demodulated_bits
-        
\ No newline at end of file
+        # For Manchester encoding:
+        # - Bit '0': low-high (0->1) pattern
+        # - Bit '1': high-low (1->0) pattern
+        # Compare energy of first half vs second half
+        return (energy_first > energy_second).astype(int)
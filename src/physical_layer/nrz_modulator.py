@@ -23,25 +23,11 @@ class NRZModulator(DigitalModulator):
         Uses energy-based detection by calculating the energy of each bit period.
         
         Parameters:
-        signal (np.ndarray): NRZ signal to demodulate.
+        signal (np.ndarray): NRZ signal to demodulate, or a 2-D batch of signals.
         
         Returns:
         np.ndarray: Demodulated bits.
         """
-        num_bits = len(signal) // self.samples_per_bit
-        demodulated_bits = np.zeros(num_bits, dtype=int)
-        
-        for i in range(num_bits):
-            start_idx = i * self.samples_per_bit
-            end_idx = start_idx + self.samples_per_bit
-            bit_period = signal[start_idx:end_idx]
-            
-            # Calculate energy of the bit period
-            energy = np.sum(bit_period ** 2)
-            
-            # For NRZ, positive energy indicates bit '1', negative energy indicates bit '0'
-            # Since we map 0->-1 and 1->1, we can use the sign of the average value
-            avg_value = np.mean(bit_period)
-            demodulated_bits[i] = 1 if avg_value > 0 else 0
-            
-        return demodulated_bits
\ No newline at end of file
+        # For NRZ, a positive average indicates bit '1', a negative one bit '0'
+        # Since we map 0->-1 and 1->1, we can use the sign of the integral
+        return (self.integrate_and_dump(signal) > 0).astype(int)
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from .carrier_modulator import CarrierModulator
 import numpy as np
 
@@ -20,96 +21,105 @@ class QAMCarrierModulator(CarrierModulator):
     '111': (1.0, 7*np.pi/4),  # 315°
   }
   
+  continuous_phase = False
+
   def __init__(self, carrier_frequency: float, bit_rate: float, sample_rate: float):
     super().__init__(carrier_frequency, bit_rate, sample_rate)
+    self.bits_per_symbol = 3
+    self.samples_per_symbol = 3 * self.samples_per_bit
     # Create reverse mapping for demodulation
     self.symbol_to_bits = {v: k for k, v in self.QAM_CONSTELLATION.items()}
+    # Complex constellation points, indexed by the symbol bits
+    self.constellation = np.zeros(len(self.QAM_CONSTELLATION), dtype=complex)
+    for symbol_key, (amplitude, phase) in self.QAM_CONSTELLATION.items():
+      self.constellation[int(symbol_key, 2)] = amplitude * np.exp(1j * phase)
 
-  def modulate(self, bits: np.ndarray) -> np.ndarray:
+  def modulate(self, bits: np.ndarray, offset: int = 0) -> np.ndarray:
     """
     Modulate bits using 8-QAM modulation.
+    The carrier restarts at every symbol, so the offset does not change the signal.
     
     Parameters:
     bits (np.ndarray): Array of bits (0s and 1s)
+    offset (int): Index of the first output sample in the whole stream.
     
     Returns:
     np.ndarray: Modulated signal
     """
+    symbols = self._symbols(bits)
+    
+    # Copy the precomputed waveform of each symbol into the output
+    waveforms = self.waveform_bank(self.carrier_frequency, self.sample_rate, self.samples_per_bit)
+    modulated_signal = np.empty((symbols.size, waveforms.shape[1]))
+    np.take(waveforms, symbols, axis=0, out=modulated_signal)
+    return modulated_signal.ravel()
+
+  def baseband_map(self, bits: np.ndarray) -> np.ndarray:
+    """Complex envelope of each symbol, its constellation point."""
+    return self.constellation[self._symbols(bits)][:, None]
+
+  def baseband_decide(self, symbols: np.ndarray) -> np.ndarray:
+    """Pick the constellation point closest to each matched-filter output."""
+    return self._bits(self.decide(symbols[..., 0], self.constellation))
+
+  def _symbols(self, bits: np.ndarray) -> np.ndarray:
+    """Zero-pad the bits to whole symbols and pack each 3-bit group into a table index."""
     # Ensure number of bits is multiple of 3 for 8-QAM
     if len(bits) % 3 != 0:
       # Pad with zeros if necessary
       padding_length = 3 - (len(bits) % 3)
       bits = np.append(bits, np.zeros(padding_length))
     
-    # Group bits into 3-bit symbols
-    num_symbols = len(bits) // 3
-    symbols = []
+    # Group bits into 3-bit symbols and pack them into table indices
+    return np.asarray(bits).reshape(-1, 3).astype(np.intp) @ np.array([4, 2, 1], dtype=np.intp)
+
+  def _bits(self, indices: np.ndarray) -> np.ndarray:
+    """Unpack symbol indices into bits, most significant first."""
+    demodulated_bits = (indices[..., None] >> np.array([2, 1, 0])) & 1
+    return demodulated_bits.reshape(indices.shape[:-1] + (-1,))
+
+  @classmethod
+  @lru_cache(maxsize=32)
+  def waveform_bank(cls, carrier_frequency: float, sample_rate: float, samples_per_bit: int) -> np.ndarray:
+    """
+    Assemble the carrier waveform of every 8-QAM symbol from the carrier cache,
+    once per (carrier_frequency, sample_rate, samples_per_bit).
+    
+    Parameters:
+    carrier_frequency (float): Frequency of the carrier signal.
+    sample_rate (float): Sample rate of the modulated signal.
+    samples_per_bit (int): Number of samples per bit.
     
-    for i in range(num_symbols):
-      # Extract 3 bits and convert to string
-      symbol_bits = bits[i*3:(i+1)*3]
-      symbol_key = ''.join(map(str, symbol_bits.astype(int)))
-      
-      # Get constellation point
-      amplitude, phase = self.QAM_CONSTELLATION[symbol_key]
-      
-      # Generate carrier signal for this symbol
-      symbol_duration = 3 * self.samples_per_bit  # 3 bits per symbol
-      t = np.arange(symbol_duration) / self.sample_rate
-      
-      # Create modulated signal: amplitude * cos(2π*fc*t + phase)
-      symbol_signal = amplitude * np.cos(2 * np.pi * self.carrier_frequency * t + phase)
-      symbols.append(symbol_signal)
+    Returns:
+    np.ndarray: Read-only (8, 3*samples_per_bit) array; row i is the waveform of the
+                symbol whose bits are the binary representation of i.
+    """
+    symbol_duration = 3 * samples_per_bit  # 3 bits per symbol
     
-    # Concatenate all symbol signals
-    modulated_signal = np.concatenate(symbols)
-    return modulated_signal
+    waveforms = np.empty((len(cls.QAM_CONSTELLATION), symbol_duration))
+    for symbol_key, (amplitude, phase) in cls.QAM_CONSTELLATION.items():
+      # Create modulated signal: amplitude * cos(2π*fc*t + phase) = amplitude * sin(2π*fc*t + phase + π/2)
+      carrier = cls.carrier_cache.get(carrier_frequency, phase + np.pi / 2, sample_rate, symbol_duration)
+      np.multiply(amplitude, carrier, out=waveforms[int(symbol_key, 2)])
+    waveforms.flags.writeable = False
+    return waveforms
 
-  def demodulate(self, signal: np.ndarray) -> np.ndarray:
+  def demodulate(self, signal: np.ndarray, offset: int = 0) -> np.ndarray:
     """
     Demodulate 8-QAM signal back to bits.
     
     Parameters:
     signal (np.ndarray): Modulated signal
+    offset (int): Index of the first sample of signal in the whole stream.
     
     Returns:
     np.ndarray: Demodulated bits
     """
-    symbol_duration = 3 * self.samples_per_bit
-    num_symbols = len(signal) // symbol_duration
-    
-    demodulated_bits = []
+    # Coherent I/Q projection of every symbol, the time base restarts at each symbol
+    symbols = self.iq_demodulate(signal, self.samples_per_symbol, continuous_phase=False)
     
-    for i in range(num_symbols):
-      # Extract symbol signal
-      start_idx = i * symbol_duration
-      end_idx = start_idx + symbol_duration
-      symbol_signal = signal[start_idx:end_idx]
-      
-      # Generate time array for this symbol
-      t = np.arange(symbol_duration) / self.sample_rate
-      
-      # Try to detect the phase by correlating with different phase references
-      max_correlation = -float('inf')
-      best_symbol = None
-      
-      for symbol_key, (ref_amplitude, ref_phase) in self.QAM_CONSTELLATION.items():
-        # Create reference signal with this phase
-        ref_signal = ref_amplitude * np.cos(2 * np.pi * self.carrier_frequency * t + ref_phase)
-        
-        # Correlate with received signal
-        correlation = np.sum(symbol_signal * ref_signal)
-        
-        if correlation > max_correlation:
-          max_correlation = correlation
-          best_symbol = symbol_key
-      
-      # Convert symbol back to bits
-      if best_symbol is not None:
-        symbol_bits = np.array([int(bit) for bit in best_symbol])
-        demodulated_bits.extend(symbol_bits)
-      else:
-        # Fallback: assume all zeros if no valid symbol found
-        demodulated_bits.extend([0, 0, 0])
+    # Pick the constellation point with the highest correlation
+    indices = self.decide(symbols, self.constellation)
     
-    return np.array(demodulated_bits)
+    # Convert symbols back to bits
+    return self._bits(indices)
@@ -0,0 +1,301 @@
+from typing import NamedTuple
+import numpy as np
+
+from data_link_layer import BitsFlagFramer
+
+
+class StageResult(NamedTuple):
+    """
+    Output of one stage of the pipeline. A stage that raised passes its
+    input on as output and keeps the error message.
+    """
+    output: np.ndarray
+    error: str | None = None
+
+
+class PipelineResult(NamedTuple):
+    """
+    Result of a run through the pipeline.
+
+    stages maps the name of each stage that ran to its result, in the order
+    of STAGES; stages that are not configured are absent. failed names the
+    stage that rejected the frame ("deframing", "correction" or
+    "edc_check"), if any. After a failed deframing the later stages do not
+    run; after the others they still run, keeping what they could not check.
+    """
+    stages: dict[str, StageResult]
+    output: np.ndarray
+    failed: str | None = None
+
+
+class PipelineHook:
+    """
+    Observer of the stages of a Pipeline. Each stage calls stage_started
+    with its input before running and stage_finished with its result after,
+    even if it raised.
+    """
+    def stage_started(self, name: str, data: np.ndarray) -> None:
+        """Called before a stage runs on data."""
+        pass
+
+    def stage_finished(self, name: str, result: StageResult) -> None:
+        """Called after a stage, with its output or error."""
+        pass
+
+
+class Pipeline:
+    """
+    Transmission chain of the simulator without the interface: error
+    correction, framing (with its error detection trailer) and modulation
+    on the way out, then the channel, then demodulation, deframing, error
+    correction, the error detection check and the removal of the
+    correction bits on the way in.
+
+    Every stage runs on arrays and is optional, as in the configuration
+    window. Errors raised by a stage are recorded in its result instead of
+    interrupting the run, like the interface shows them in place of the bits.
+    """
+    STAGES = ("encoding", "padding", "framing", "modulation", "channel",
+              "demodulation", "deframing", "correction", "edc_check", "decoding")
+
+    def __init__(self, modulator=None, carrier_modulator=None, framer=None, error_corrector=None,
+                 channel=None, complex_baseband: bool = False, baseband_oversampling: int = 1,
+                 hooks: list | None = None):
+        """
+        Initialize the pipeline.
+
+        Parameters:
+        modulator (DigitalModulator | None): Baseband modulator, used when there is no carrier modulator.
+        carrier_modulator (CarrierModulator | None): Carrier modulator.
+        framer (Framer | None): Framer, with the error detector that adds and checks the trailer.
+        error_corrector (HummingErrorCorrector | HammingBlockCorrector | None): Error corrector.
+        channel (CommunicationChannel | ChannelPipeline | None): Channel with send and receive;
+                                                                 None for a noiseless channel.
+        complex_baseband (bool): Send the complex envelope of the carrier modulation.
+        baseband_oversampling (int): Samples per symbol of the complex envelope.
+        hooks (list[PipelineHook] | None): Hooks called around every stage.
+        """
+        if modulator is None and carrier_modulator is None:
+            raise ValueError("Pipeline needs a modulator or a carrier modulator.")
+        self.modulator = modulator
+        self.carrier_modulator = carrier_modulator
+        self.framer = framer
+        self.error_corrector = error_corrector
+        self.channel = channel
+        self.complex_baseband = complex_baseband
+        self.baseband_oversampling = baseband_oversampling
+        self.hooks = list(hooks) if hooks else []
+
+    @classmethod
+    def from_window(cls, window, hooks: list | None = None) -> "Pipeline":
+        """
+        Build the pipeline of the current configuration of a window.
+
+        Parameters:
+        window (BaseWindow): Configuration, with its objects already set up.
+        hooks (list[PipelineHook] | None): Hooks called around every stage.
+
+        Returns:
+        Pipeline: Pipeline sharing the window's objects and channel.
+        """
+        return cls(modulator=window.modulator, carrier_modulator=window.carrier_modulator,
+                   framer=window.coding, error_corrector=window.error_corrector,
+                   channel=window.communication, complex_baseband=window.complex_baseband,
+                   baseband_oversampling=window.baseband_oversampling, hooks=hooks)
+
+    @property
+    def trailer_size(self) -> int:
+        """Size of the error detection trailer left by deframing, in bits."""
+        if self.framer is None or self.framer.error_detector is None:
+            return 0
+        return self.framer.error_detector.trailer_size
+
+    def run(self, bits: np.ndarray) -> PipelineResult:
+        """
+        Send bits through the whole chain.
+
+        Parameters:
+        bits (np.ndarray): Data bits.
+
+        Returns:
+        PipelineResult: Results of every stage and the received data bits.
+        """
+        stages = self.send(bits)
+        return self.receive(stages["channel"].output, stages, data_size=len(bits))
+
+    def send(self, bits: np.ndarray) -> dict[str, StageResult]:
+        """
+        Run the sending stages and send the signal through the channel.
+
+        Parameters:
+        bits (np.ndarray): Data bits.
+
+        Returns:
+        dict[str, StageResult]: Results of the sending stages and of the channel,
+        whose output is the received signal.
+        """
+        stages = self.transmit(bits)
+        stages["channel"] = self._stage("channel", self.transfer, stages["modulation"].output, catch=False)
+        return stages
+
+    def transmit(self, bits: np.ndarray) -> dict[str, StageResult]:
+        """
+        Run the sending stages, up to the modulation.
+
+        Parameters:
+        bits (np.ndarray): Data bits.
+
+        Returns:
+        dict[str, StageResult]: Results of the sending stages.
+        """
+        stages = {}
+        if self.error_corrector is not None:
+            stages["encoding"] = self._stage("encoding", self.error_corrector.add_error_detection, bits)
+            bits = stages["encoding"].output
+
+        # The framers work on whole bytes
+        stages["padding"] = self._stage("padding", self._pad, bits, catch=False)
+        bits = stages["padding"].output
+
+        if self.framer is not None:
+            stages["framing"] = self._stage("framing", self.framer.frame_data, bits)
+            bits = stages["framing"].output
+
+        stages["modulation"] = self._stage("modulation", self._modulate, bits, catch=False)
+        return stages
+
+    def transfer(self, signal: np.ndarray) -> np.ndarray:
+        """
+        Send a signal through the channel.
+
+        Parameters:
+        signal (np.ndarray): Modulated signal.
+
+        Returns:
+        np.ndarray: Received signal (read-only, valid until the next transfer).
+        """
+        if self.channel is None:
+            return signal
+        self.channel.send(signal)
+        return self.channel.receive(copy=False)
+
+    def receive(self, signal: np.ndarray, stages: dict[str, StageResult] | None = None,
+                data_size: int | None = None) -> PipelineResult:
+        """
+        Run the receiving stages on a received signal.
+
+        Parameters:
+        signal (np.ndarray): Received signal.
+        stages (dict[str, StageResult] | None): Results of the earlier stages, to extend.
+        data_size (int | None): Number of data bits sent, to drop the padding added
+                                to whole bytes and codewords; kept if None.
+
+        Returns:
+        PipelineResult: Results of every stage and the received data bits.
+        """
+        stages = {} if stages is None else stages
+        stages["demodulation"] = self._stage("demodulation", self._demodulate, signal, catch=False)
+        bits = stages["demodulation"].output
+
+        if self.framer is not None:
+            stages["deframing"] = self._stage("deframing", self.framer.deframe_data, bits)
+            if stages["deframing"].error is not None:
+                return PipelineResult(stages, bits, "deframing")
+            bits = stages["deframing"].output
+
+        failed = None
+        trailer_size = self.trailer_size
+        if self.error_corrector is not None:
+            stages["correction"] = self._trailer_stage("correction", self._correct, bits, trailer_size)
+            bits = stages["correction"].output
+            if stages["correction"].error is not None:
+                failed = "correction"
+
+        if trailer_size:
+            stages["edc_check"] = self._stage("edc_check", self._check_edc, bits)
+            bits = stages["edc_check"].output
+            if stages["edc_check"].error is not None:
+                failed = "edc_check"
+            else:
+                trailer_size = 0
+
+        if self.error_corrector is not None:
+            stages["decoding"] = self._trailer_stage(
+                "decoding", lambda data: self.error_corrector.remove_error_detection(data)[:data_size],
+                bits, trailer_size)
+            bits = stages["decoding"].output
+        elif data_size is not None and not trailer_size:
+            bits = bits[:data_size]
+
+        return PipelineResult(stages, bits, failed)
+
+    @staticmethod
+    def _pad(bits: np.ndarray) -> np.ndarray:
+        """Pad the bits with zeros to whole bytes."""
+        if bits.size % 8 == 0:
+            return bits
+        return np.concatenate((bits, np.zeros(8 - bits.size % 8, dtype=bits.dtype)))
+
+    def _modulate(self, bits: np.ndarray) -> np.ndarray:
+        """Modulate the bits with the configured modulator."""
+        if self.carrier_modulator is not None and self.complex_baseband:
+            return self.carrier_modulator.modulate_baseband(bits, self.baseband_oversampling)
+        if self.carrier_modulator is not None:
+            return self.carrier_modulator.modulate(bits)
+        return self.modulator.modulate(bits)
+
+    def _demodulate(self, signal: np.ndarray) -> np.ndarray:
+        """Demodulate the signal with the configured modulator."""
+        if self.carrier_modulator is not None and self.complex_baseband:
+            bits = self.carrier_modulator.demodulate_baseband(signal, self.baseband_oversampling)
+        elif self.carrier_modulator is not None:
+            bits = self.carrier_modulator.demodulate(signal)
+        else:
+            bits = self.modulator.demodulate(signal)
+        if isinstance(self.framer, BitsFlagFramer):
+            # Stuffed frames have any length; their deframing ignores the
+            # bits after the closing flag
+            return bits
+        # Remove the 8-QAM padding
+        return bits[:len(bits) // 8 * 8]
+
+    def _correct(self, bits: np.ndarray) -> np.ndarray:
+        """Correct the bits if the corrector finds errors."""
+        if self.error_corrector.check_errors(bits):
+            return self.error_corrector.correct_errors(bits)
+        return bits
+
+    def _check_edc(self, bits: np.ndarray) -> np.ndarray:
+        """Check the error detection trailer and remove it."""
+        if (error := self.framer.check_edc(bits)):
+            raise ValueError(error)
+        return self.framer.remove_edc(bits)
+
+    def _trailer_stage(self, name: str, function, bits: np.ndarray, trailer_size: int) -> StageResult:
+        """Run a stage on the bits before the error detection trailer, which is kept."""
+        if not trailer_size:
+            return self._stage(name, function, bits)
+        return self._stage(name, lambda data: np.concatenate((function(data[:-trailer_size]),
+                                                               data[-trailer_size:])), bits)
+
+    def _stage(self, name: str, function, data: np.ndarray, catch: bool = True) -> StageResult:
+        """
+        Run a stage between the hook calls. If catch is set, an error passes
+        the input on with the error message; otherwise it is raised.
+        """
+        for hook in self.hooks:
+            hook.stage_started(name, data)
+        try:
+            result = StageResult(function(data))
+        except Exception as e:
+            result = StageResult(data, str(e.args[0]) if e.args else type(e).__name__)
+            if not catch:
+                self._finish_stage(name, result)
+                raise
+        self._finish_stage(name, result)
+        return result
+
+    def _finish_stage(self, name: str, result: StageResult) -> None:
+        """Call the hooks after a stage, in reverse order."""
+        for hook in reversed(self.hooks):
+            hook.stage_finished(name, result)
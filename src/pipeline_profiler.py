@@ -0,0 +1,133 @@
+import json
+import time
+import tracemalloc
+from typing import IO
+import numpy as np
+
+from pipeline import Pipeline, PipelineHook, StageResult
+
+
+class StageProfiler(PipelineHook):
+    """
+    Pipeline hook that records, for every stage run, its wall time, the
+    number of items (bits or samples) it received and produced and,
+    optionally, the peak memory it allocated as seen by tracemalloc.
+
+    tracemalloc slows the traced stages down, so times measured with
+    trace_memory are only comparable with other traced runs. Records are
+    plain dicts, exported as JSON lines and summarized per stage.
+    """
+    def __init__(self, trace_memory: bool = False, label: str | None = None):
+        """
+        Initialize the profiler.
+
+        Parameters:
+        trace_memory (bool): Measure the peak memory of each stage with tracemalloc.
+        label (str | None): Label stored in the records, e.g. the configuration profiled.
+        """
+        self.trace_memory = trace_memory
+        self.label = label
+        self.records = []
+        self._running = {}
+        self._started_tracing = False
+
+    def stage_started(self, name: str, data: np.ndarray) -> None:
+        memory = None
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+            memory = tracemalloc.get_traced_memory()[0]
+        self._running[name] = (len(data), memory, time.perf_counter())
+
+    def stage_finished(self, name: str, result: StageResult) -> None:
+        end = time.perf_counter()
+        input_size, memory, start = self._running.pop(name)
+        peak = tracemalloc.get_traced_memory()[1] - memory if memory is not None else None
+        self.records.append({
+            "label": self.label,
+            "stage": name,
+            "seconds": end - start,
+            "input_size": input_size,
+            "output_size": len(result.output),
+            "peak_bytes": peak,
+            "error": result.error,
+        })
+
+    def stop(self) -> None:
+        """Stop tracemalloc if the profiler started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def __enter__(self) -> "StageProfiler":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def clear(self) -> None:
+        """Drop the records."""
+        self.records = []
+
+    def write_jsonl(self, file: str | IO[str]) -> None:
+        """
+        Write the records as JSON lines, one record per line.
+
+        Parameters:
+        file (str | IO[str]): Path of the file to append to, or an open text file.
+        """
+        if isinstance(file, str):
+            with open(file, "a") as opened:
+                self.write_jsonl(opened)
+            return
+        for record in self.records:
+            file.write(json.dumps(record) + "\n")
+
+    def summary(self) -> list[dict]:
+        """
+        Aggregate the records per label and stage, in pipeline order.
+
+        Returns:
+        list[dict]: For each stage: number of calls, total, mean and maximum
+        time in seconds, items processed per second and the largest peak
+        memory in bytes (None if not traced).
+        """
+        groups = {}
+        for record in self.records:
+            groups.setdefault((record["label"], record["stage"]), []).append(record)
+
+        # Labels in order of appearance, stages in pipeline order
+        labels = {label: index for index, label in enumerate(dict.fromkeys(label for label, _ in groups))}
+        order = {name: index for index, name in enumerate(Pipeline.STAGES)}
+        summary = []
+        for (label, stage), records in sorted(groups.items(), key=lambda item: (
+                labels[item[0][0]], order.get(item[0][1], len(order)), item[0][1])):
+            seconds = np.array([record["seconds"] for record in records])
+            peaks = [record["peak_bytes"] for record in records if record["peak_bytes"] is not None]
+            items = sum(record["input_size"] for record in records)
+            summary.append({
+                "label": label,
+                "stage": stage,
+                "calls": len(records),
+                "total_seconds": float(seconds.sum()),
+                "mean_seconds": float(seconds.mean()),
+                "max_seconds": float(seconds.max()),
+                "items_per_second": items / seconds.sum() if seconds.sum() > 0 else None,
+                "peak_bytes": max(peaks) if peaks else None,
+                "errors": sum(record["error"] is not None for record in records),
+            })
+        return summary
+
+    def summary_table(self) -> str:
+        """Format the summary as a text table."""
+        lines = [f"{'label':>16} {'stage':>13} {'calls':>6} {'total (ms)':>11} {'mean (ms)':>10} "
+                 f"{'max (ms)':>9} {'Mitems/s':>9} {'peak (kB)':>10} {'errors':>7}"]
+        for row in self.summary():
+            rate = f"{row['items_per_second'] / 1e6:.2f}" if row["items_per_second"] is not None else "-"
+            peak = f"{row['peak_bytes'] / 1024:.1f}" if row["peak_bytes"] is not None else "-"
+            lines.append(f"{str(row['label'] or '-'):>16} {row['stage']:>13} {row['calls']:>6} "
+                         f"{row['total_seconds'] * 1e3:>11.2f} {row['mean_seconds'] * 1e3:>10.3f} "
+                         f"{row['max_seconds'] * 1e3:>9.3f} {rate:>9} {peak:>10} {row['errors']:>7}")
+        return "\n".join(lines)
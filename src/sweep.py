@@ -0,0 +1,331 @@
+import argparse
+import hashlib
+import itertools
+import json
+import sqlite3
+import sys
+from typing import Callable, Iterable, NamedTuple
+import numpy as np
+
+from base_window import BaseWindow
+from error_rate import ErrorRatePoint, ErrorRateSimulator
+from physical_layer import FSKCarrierModulator
+from pipeline import Pipeline
+
+
+class SweepPoint(NamedTuple):
+    """
+    One point of a sweep: indices of the BaseWindow option lists, the
+    rates and the SNR. analog_modulation is None for baseband modulation.
+    """
+    coding: int
+    error_detection: int
+    error_correction: int
+    modulation: int
+    analog_modulation: int | None
+    bit_rate: float
+    sample_rate: float
+    snr: float
+
+
+def sweep_grid(snrs: Iterable[float], bit_rates: Iterable[float] = (1000,), sample_rates: Iterable[float] = (10000,),
+               codings: Iterable[int] | None = None, error_detections: Iterable[int] | None = None,
+               error_corrections: Iterable[int] | None = None, modulations: Iterable[int] | None = None,
+               analog_modulations: Iterable[int | None] | None = None) -> list[SweepPoint]:
+    """
+    Cross product of the options, with the SNR varying fastest so that the
+    points of one configuration are simulated together.
+
+    Parameters:
+    snrs (Iterable[float]): Channel SNR factors.
+    bit_rates (Iterable[float]): Bit rates.
+    sample_rates (Iterable[float]): Sample rates of the baseband modulators.
+    codings, error_detections, error_corrections, modulations (Iterable[int] | None):
+        Indices of the BaseWindow options; all of them by default.
+    analog_modulations (Iterable[int | None] | None): Indices of the carrier modulations, None
+                                                      for baseband; baseband and all by default.
+
+    Returns:
+    list[SweepPoint]: Points of the sweep.
+    """
+    window = BaseWindow()
+    axes = [
+        range(len(window.coding_options)) if codings is None else codings,
+        range(len(window.error_detection_options)) if error_detections is None else error_detections,
+        range(len(window.error_correction_options)) if error_corrections is None else error_corrections,
+        range(len(window.modulation_options)) if modulations is None else modulations,
+        ([None] + list(range(len(window.analog_modulation_options))) if analog_modulations is None
+         else analog_modulations),
+        bit_rates, sample_rates, snrs,
+    ]
+    return [SweepPoint(*values) for values in itertools.product(*axes)]
+
+
+class ResultStore:
+    """
+    SQLite file of sweep results, keyed by the hash of the configuration.
+    Every result is committed as soon as it is stored, so a sweep that is
+    killed keeps every point it finished.
+    """
+    def __init__(self, path: str):
+        """
+        Open the store, creating it if needed.
+
+        Parameters:
+        path (str): Path of the SQLite file.
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, config TEXT NOT NULL, snr REAL, "
+            "bits INTEGER, bit_errors INTEGER, frames INTEGER, frame_errors INTEGER, ber REAL, ber_low REAL, "
+            "ber_high REAL, fer REAL, fer_low REAL, fer_high REAL, converged INTEGER)")
+        self.connection.commit()
+
+    def __contains__(self, key: str) -> bool:
+        return self.connection.execute("SELECT 1 FROM results WHERE key = ?", (key,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def get(self, key: str) -> ErrorRatePoint | None:
+        """Result stored under key, or None."""
+        row = self.connection.execute(
+            "SELECT snr, bits, bit_errors, frames, frame_errors, ber, ber_low, ber_high, fer, fer_low, fer_high, "
+            "converged FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        snr, bits, bit_errors, frames, frame_errors, ber, ber_low, ber_high, fer, fer_low, fer_high, converged = row
+        return ErrorRatePoint(snr, bits, bit_errors, frames, frame_errors, ber, (ber_low, ber_high),
+                              fer, (fer_low, fer_high), bool(converged))
+
+    def put(self, key: str, config: dict, point: ErrorRatePoint) -> None:
+        """Store and commit the result of a configuration."""
+        self.connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, json.dumps(config, sort_keys=True), point.snr, point.bits, point.bit_errors, point.frames,
+             point.frame_errors, point.ber, *point.ber_interval, point.fer, *point.fer_interval,
+             int(point.converged)))
+        self.connection.commit()
+
+    def configs(self) -> list[dict]:
+        """Configurations of every stored result."""
+        return [json.loads(config) for config, in self.connection.execute("SELECT config FROM results")]
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class SweepRunner:
+    """
+    Measures the error rates of sweep points with the ErrorRateSimulator,
+    skipping those already in the store.
+
+    A point is identified by the hash of its configuration, described by
+    the option names, together with the simulation settings, so changing
+    the frame size or the precision does not reuse old results. Options
+    that have no effect are left out of the description (the baseband
+    modulation under a carrier, the error detection without a framer, the
+    sample rate of the carriers other than FSK, which use the analog one,
+    and the analog sample rate of FSK), and such points are simulated once. Each point draws its frames from
+    a seed derived from its hash: its result does not depend on the other
+    points of the run, nor on the number of workers.
+    """
+    def __init__(self, store: ResultStore, frame_bits: int = 1024, frames_per_batch: int = 32,
+                 precision: float = 0.1, confidence: float = 0.95, criterion: str = "ber",
+                 max_bits: int = 10**8, workers: int | None = None, seed: int = 0):
+        """
+        Initialize the runner.
+
+        Parameters:
+        store (ResultStore): Store of the results.
+        frame_bits, frames_per_batch, precision, confidence, criterion, max_bits, workers:
+            Settings of the ErrorRateSimulator.
+        seed (int): Seed of the sweep, combined with the hash of each point.
+        """
+        self.store = store
+        self.frame_bits = frame_bits
+        self.frames_per_batch = frames_per_batch
+        self.precision = precision
+        self.confidence = confidence
+        self.criterion = criterion
+        self.max_bits = max_bits
+        self.workers = workers
+        self.seed = seed
+        self.window = BaseWindow()
+
+    @property
+    def settings(self) -> dict:
+        """Simulation settings that change the results (the worker count does not)."""
+        return {"frame_bits": self.frame_bits, "frames_per_batch": self.frames_per_batch,
+                "precision": self.precision, "confidence": self.confidence, "criterion": self.criterion,
+                "max_bits": self.max_bits, "seed": self.seed}
+
+    def describe(self, point: SweepPoint) -> dict:
+        """Configuration of a point, by option names, with the simulation settings."""
+        window = self.window
+        config = {
+            "framer": window.coding_options_names[point.coding],
+            "error_detection": None,
+            "error_correction": window.error_correction_options_names[point.error_correction],
+            "modulation": None,
+            "carrier_modulation": None,
+            "bit_rate": float(point.bit_rate),
+            "sample_rate": None,
+            "snr": float(point.snr),
+            **self.settings,
+        }
+        if window.coding_options[point.coding] is not None:
+            config["error_detection"] = window.error_detection_options_names[point.error_detection]
+        if point.analog_modulation is None:
+            config["modulation"] = window.modulation_options_names[point.modulation]
+            config["sample_rate"] = float(point.sample_rate)
+        else:
+            config["carrier_modulation"] = window.analog_modulation_options_names[point.analog_modulation]
+            config["analog_frequency"] = float(window.analog_frequency)
+            # FSK is built on the baseband sample rate, the other carriers on the analog one
+            if window.analog_modulation_options[point.analog_modulation] is FSKCarrierModulator:
+                config["sample_rate"] = float(point.sample_rate)
+            else:
+                config["analog_sample_rate"] = float(window.analog_sample_rate)
+        return config
+
+    @staticmethod
+    def key(config: dict) -> str:
+        """Hash of a configuration."""
+        return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+    def pipeline(self, point: SweepPoint) -> Pipeline:
+        """Set the window to the configuration of a point and build its pipeline."""
+        window = self.window
+        window.set_coding(point.coding)
+        window.set_error_detection(point.error_detection)
+        window.set_error_correction(point.error_correction)
+        window.set_modulation(point.modulation)
+        window.set_bit_rate(str(point.bit_rate))
+        window.set_sample_rate(str(point.sample_rate))
+        window.set_use_carrier_modulation(point.analog_modulation is not None)
+        if point.analog_modulation is not None:
+            window.set_analog_modulation(point.analog_modulation)
+        return Pipeline.from_window(window)
+
+    def pending(self, points: Iterable[SweepPoint]) -> dict[str, list[tuple[SweepPoint, str, dict]]]:
+        """
+        Points missing from the store, grouped by configuration without the SNR.
+
+        Returns:
+        dict[str, list[tuple[SweepPoint, str, dict]]]: Point, key and configuration of each
+        missing point, once per key.
+        """
+        groups = {}
+        seen = set()
+        for point in points:
+            config = self.describe(point)
+            key = self.key(config)
+            if key in seen or key in self.store:
+                continue
+            seen.add(key)
+            group = json.dumps({**config, "snr": None}, sort_keys=True)
+            groups.setdefault(group, []).append((point, key, config))
+        return groups
+
+    def run(self, points: Iterable[SweepPoint],
+            progress: Callable[[SweepPoint, ErrorRatePoint], None] | None = None) -> list[ErrorRatePoint]:
+        """
+        Simulate the points missing from the store, storing each as soon as it finishes.
+
+        Parameters:
+        points (Iterable[SweepPoint]): Points of the sweep.
+        progress (Callable[[SweepPoint, ErrorRatePoint], None] | None): Called with each point
+                                                                        simulated and its result.
+
+        Returns:
+        list[ErrorRatePoint]: Result of every point, in the given order.
+        """
+        points = list(points)
+        for group in self.pending(points).values():
+            simulator = ErrorRateSimulator(
+                self.pipeline(group[0][0]), frame_bits=self.frame_bits, frames_per_batch=self.frames_per_batch,
+                precision=self.precision, confidence=self.confidence, criterion=self.criterion,
+                max_bits=self.max_bits, workers=self.workers)
+            by_snr = {point.snr: (point, key, config) for point, key, config in group}
+
+            def finished(result: ErrorRatePoint) -> None:
+                point, key, config = by_snr[result.snr]
+                self.store.put(key, config, result)
+                if progress is not None:
+                    progress(point, result)
+
+            seeds = [np.random.SeedSequence([self.seed, int(key, 16)]) for _, key, _ in group]
+            simulator.run([point.snr for point, _, _ in group], progress=finished, seeds=seeds)
+
+        return [self.store.get(self.key(self.describe(point))) for point in points]
+
+
+def _indices(values: list[str] | None) -> list[int | None] | None:
+    """Option indices of the command line; 'none' is no carrier modulation."""
+    if values is None:
+        return None
+    return [None if value.lower() == "none" else int(value) for value in values]
+
+
+def main(argv: list[str] | None = None) -> int:
+    window = BaseWindow()
+    options = "\n".join(f"  {name}: " + ", ".join(f"{index}={option}" for index, option in enumerate(names))
+                        for name, names in [("framers", window.coding_options_names),
+                                            ("detectors", window.error_detection_options_names),
+                                            ("correctors", window.error_correction_options_names),
+                                            ("modulations", window.modulation_options_names),
+                                            ("carriers", window.analog_modulation_options_names)])
+    parser = argparse.ArgumentParser(
+        prog="python sweep.py", formatter_class=argparse.RawDescriptionHelpFormatter,
+        description="Sweep the error rates over the options of the window. Results are kept in a SQLite "
+                    "file; points already there are skipped, so an interrupted sweep resumes where it "
+                    "stopped and new SNRs only simulate the new points.",
+        epilog=f"option indices:\n{options}")
+    parser.add_argument("--db", default="sweep.sqlite", help="SQLite file of the results")
+    parser.add_argument("--snr", type=float, nargs="+", required=True, help="channel SNR factors")
+    parser.add_argument("--bit-rate", type=float, nargs="+", default=[window.bit_rate], help="bit rates")
+    parser.add_argument("--sample-rate", type=float, nargs="+", default=[window.sample_rate],
+                        help="sample rates of the baseband modulators")
+    parser.add_argument("--framers", nargs="+", type=int, help="framer indices (default all)")
+    parser.add_argument("--detectors", nargs="+", type=int, help="error detector indices (default all)")
+    parser.add_argument("--correctors", nargs="+", type=int, help="error corrector indices (default all)")
+    parser.add_argument("--modulations", nargs="+", type=int, help="baseband modulation indices (default all)")
+    parser.add_argument("--carriers", nargs="+",
+                        help="carrier modulation indices, 'none' for baseband (default none and all)")
+    parser.add_argument("--frame-bits", type=int, default=1024, help="payload bits per frame")
+    parser.add_argument("--precision", type=float, default=0.1, help="relative precision of the error rate")
+    parser.add_argument("--max-bits", type=int, default=10**8, help="maximum payload bits per point")
+    parser.add_argument("--workers", type=int, help="worker processes (default the CPU count)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the sweep")
+    args = parser.parse_args(argv)
+
+    points = sweep_grid(args.snr, args.bit_rate, args.sample_rate, args.framers, args.detectors,
+                        args.correctors, args.modulations, _indices(args.carriers))
+    with ResultStore(args.db) as store:
+        runner = SweepRunner(store, frame_bits=args.frame_bits, precision=args.precision,
+                             max_bits=args.max_bits, workers=args.workers, seed=args.seed)
+        pending = sum(len(group) for group in runner.pending(points).values())
+        print(f"{len(points)} points, {pending} to simulate, {len(store)} results in {args.db}")
+
+        def show(point: SweepPoint, result: ErrorRatePoint) -> None:
+            config = runner.describe(point)
+            modulation = config["carrier_modulation"] or config["modulation"]
+            sample_rate = config["sample_rate"] or config["analog_sample_rate"]
+            print(f"{config['framer']:>22} {str(config['error_detection']):>8} {config['error_correction']:>20} "
+                  f"{modulation:>10} {point.bit_rate:>8g} {sample_rate:>8g} {point.snr:>6g} "
+                  f"{result.ber:>10.3e} {result.fer:>7.3f} {'' if result.converged else '(max bits)'}", flush=True)
+
+        runner.run(points, progress=show)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())